@@ -0,0 +1,70 @@
+"""
+Benchmark decoding throughput of Traffic Reports into NumPy arrays,
+compared to one message at a time.
+
+Run with `python benchmarks/bench_batch.py`. Requires the `numpy` extra.
+"""
+
+import timeit
+
+from gdl90py.batch import decode_traffic_batch
+from gdl90py.enums import (
+    Accuracy,
+    AddressType,
+    EmergencyPriorityCode,
+    EmitterCategory,
+    Integrity,
+    TrackType,
+)
+from gdl90py.messages.traffic_report import TrafficReportMessage
+
+COUNT = 100_000
+
+FRAMES = [
+    TrafficReportMessage(
+        traffic_alert=False,
+        address_type=AddressType.ads_b_icao,
+        address=0xA00000 + i % 0x1000,
+        latitude=44.90708,
+        longitude=-122.99488,
+        pressure_altitude=5000,
+        track_type=TrackType.true_track_angle,
+        report_extrapolated=False,
+        airborne=True,
+        integrity=Integrity.less_than_25_m_hpl_and_37_5_m_vpl,
+        accuracy=Accuracy.less_than_30_m_hfom_and_45_m_vfom,
+        horizontal_velocity=123,
+        vertical_velocity=64,
+        track=45,
+        emitter_category=EmitterCategory.light,
+        callsign="N825V",
+        emergency_priority_code=EmergencyPriorityCode.no_emergency,
+    ).serialize(outgoing_lsb=False)
+    for i in range(0x1000)
+] * (COUNT // 0x1000)
+
+
+def report(name: str, seconds: float, count: int) -> None:
+    print(
+        f"{name:>24}: {seconds / count * 1e6:8.2f} us/msg {count / seconds:12,.0f} msg/s"
+    )
+
+
+def main() -> None:
+    seconds = min(
+        timeit.repeat(
+            lambda: [TrafficReportMessage.deserialize(frame) for frame in FRAMES],
+            number=1,
+            repeat=3,
+        )
+    )
+    report("deserialize", seconds, len(FRAMES))
+
+    seconds = min(
+        timeit.repeat(lambda: decode_traffic_batch(FRAMES), number=1, repeat=3)
+    )
+    report("decode_traffic_batch", seconds, len(FRAMES))
+
+
+if __name__ == "__main__":
+    main()
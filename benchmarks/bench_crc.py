@@ -0,0 +1,64 @@
+"""
+Benchmark the CRC implementations on 1 KB of Uplink message data.
+
+Run with `python benchmarks/bench_crc.py`.
+"""
+
+import timeit
+
+from gdl90py.messages.uplink_data import UplinkDataMessage
+from gdl90py.utils.gdl90 import (
+    MASK_16_BIT,
+    Crc16,
+    crc16,
+    crc16_table,
+    crc_table,
+)
+
+NUMBER = 500
+CHUNK_SIZE = 64
+
+UPLINK = UplinkDataMessage(
+    time_of_reception=50000000, uplink_payload=bytes(range(216)) * 2
+)
+# message ID followed by the message data, repeated to 1 KB
+DATA = (bytes(UPLINK.MESSAGE_IDS) + UPLINK.pack()) * 3
+DATA = DATA[:1024]
+
+
+def cached_table_crc(data: bytes) -> int:
+    """
+    The previous implementation, which looks up the cached table for every byte.
+    """
+    crc = 0
+    for c in data:
+        m = crc << 8 & MASK_16_BIT
+        crc = crc_table()[(crc >> 8)] ^ m ^ c
+
+    return crc
+
+
+def incremental_crc(data: bytes) -> int:
+    crc = Crc16()
+    view = memoryview(data)
+    for i in range(0, len(view), CHUNK_SIZE):
+        crc.update(view[i : i + CHUNK_SIZE])
+    return crc.value
+
+
+def main() -> None:
+    expected = cached_table_crc(DATA)
+    print(f"{len(DATA)} bytes, {NUMBER} iterations")
+    for name, func in (
+        ("cached crc_table()", cached_table_crc),
+        ("CRC_TABLE", crc16_table),
+        ("binascii.crc_hqx", crc16),
+        (f"Crc16 ({CHUNK_SIZE} B chunks)", incremental_crc),
+    ):
+        assert func(DATA) == expected
+        seconds = min(timeit.repeat(lambda: func(DATA), number=NUMBER, repeat=5))
+        print(f"{name:>24}: {seconds / NUMBER * 1e6:10.2f} us/KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark decoding throughput of Traffic Reports.
+
+Run with `python benchmarks/bench_deserialize.py`.
+"""
+
+import timeit
+
+from gdl90py.enums import (
+    Accuracy,
+    AddressType,
+    EmergencyPriorityCode,
+    EmitterCategory,
+    Integrity,
+    TrackType,
+)
+from gdl90py.messages.traffic_report import TrafficReportMessage
+from gdl90py.parser import parse_messages
+
+NUMBER = 5000
+
+FRAME = TrafficReportMessage(
+    traffic_alert=False,
+    address_type=AddressType.ads_b_icao,
+    address=0xABCDEF,
+    latitude=44.90708,
+    longitude=-122.99488,
+    pressure_altitude=5000,
+    track_type=TrackType.true_track_angle,
+    report_extrapolated=False,
+    airborne=True,
+    integrity=Integrity.less_than_25_m_hpl_and_37_5_m_vpl,
+    accuracy=Accuracy.less_than_30_m_hfom_and_45_m_vfom,
+    horizontal_velocity=123,
+    vertical_velocity=64,
+    track=45,
+    emitter_category=EmitterCategory.light,
+    callsign="N825V",
+    emergency_priority_code=EmergencyPriorityCode.no_emergency,
+).serialize(outgoing_lsb=False)
+
+STREAM = FRAME * 1000
+
+
+def report(name: str, seconds: float, count: int) -> None:
+    print(
+        f"{name:>24}: {seconds / count * 1e6:8.2f} us/msg {count / seconds:12,.0f} msg/s"
+    )
+
+
+def main() -> None:
+    seconds = min(
+        timeit.repeat(
+            lambda: TrafficReportMessage.deserialize(FRAME), number=NUMBER, repeat=5
+        )
+    )
+    report("deserialize", seconds, NUMBER)
+
+    seconds = min(timeit.repeat(lambda: parse_messages(STREAM), number=5, repeat=5))
+    report("parse_messages", seconds, 5 * 1000)
+
+
+if __name__ == "__main__":
+    main()
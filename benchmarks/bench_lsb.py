@@ -0,0 +1,49 @@
+"""
+Microbenchmark for flipping the bit order of an Uplink frame (432-byte payload),
+which happens on every `serialize()` and every LSB-first frame received.
+
+Run with `python benchmarks/bench_lsb.py`.
+"""
+
+import timeit
+
+from bitstring import BitArray
+
+from gdl90py.messages.uplink_data import UplinkDataMessage
+from gdl90py.utils.bitarray import lsb_bytes
+
+NUMBER = 2000
+
+FRAME = UplinkDataMessage(
+    time_of_reception=50000000, uplink_payload=bytes(range(216)) * 2
+).serialize(outgoing_lsb=False)
+
+
+def bitarray_lsb_bytes(bytes_: bytes) -> bytes:
+    """
+    The previous implementation, which reverses each byte as its own BitArray.
+    """
+    new = BitArray()
+    for byte in BitArray(bytes_).cut(8):
+        new.append(byte[::-1])
+    return new.bytes
+
+
+def main() -> None:
+    assert bitarray_lsb_bytes(FRAME) == lsb_bytes(FRAME)
+
+    print(f"{len(FRAME)} byte frame, {NUMBER} iterations")
+    results = {}
+    for name, func in (
+        ("BitArray", bitarray_lsb_bytes),
+        ("bytes.translate", lsb_bytes),
+    ):
+        seconds = min(timeit.repeat(lambda: func(FRAME), number=NUMBER, repeat=5))
+        results[name] = seconds
+        print(f"{name:>16}: {seconds / NUMBER * 1e6:10.2f} us/frame")
+
+    print(f"{'speedup':>16}: {results['BitArray'] / results['bytes.translate']:10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Benchmark decoding a large file of frames with one and multiple processes.
+
+Run with `python benchmarks/bench_parallel.py [workers...]`.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from gdl90py.messages.height_above_terrain import HeightAboveTerrainMessage
+from gdl90py.parallel import parse_file_parallel
+
+COUNT = 1_000_000
+
+
+def main() -> None:
+    workers = [int(arg) for arg in sys.argv[1:]] or sorted({1, 2, os.cpu_count() or 1})
+
+    with tempfile.NamedTemporaryFile(suffix=".bin") as f:
+        f.write(
+            b"".join(
+                HeightAboveTerrainMessage(height_above_terrain=i % 1000).serialize(
+                    outgoing_lsb=False
+                )
+                for i in range(COUNT)
+            )
+        )
+        f.flush()
+
+        for count in workers:
+            start = time.perf_counter()
+            decoded = sum(1 for _ in parse_file_parallel(f.name, count))
+            seconds = time.perf_counter() - start
+            assert decoded == COUNT
+            print(
+                f"{count:>3} workers: {seconds:6.2f} s {COUNT / seconds:12,.0f} msg/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark receiving and decoding UDP datagrams over loopback, with a new
+`bytes` per datagram compared to the preallocated buffers of
+`DatagramReceiver`.
+
+Run with `python benchmarks/bench_receive.py`.
+"""
+
+import socket
+import time
+
+from gdl90py.enums import (
+    Accuracy,
+    AddressType,
+    EmergencyPriorityCode,
+    EmitterCategory,
+    Integrity,
+    TrackType,
+)
+from gdl90py.messages.traffic_report import TrafficReportMessage
+from gdl90py.parser import parse_messages
+from gdl90py.udp import DatagramReceiver
+
+BATCH = 1000
+REPEAT = 50
+
+DATAGRAM = TrafficReportMessage(
+    traffic_alert=False,
+    address_type=AddressType.ads_b_icao,
+    address=0xA00000,
+    latitude=44.90708,
+    longitude=-122.99488,
+    pressure_altitude=5000,
+    track_type=TrackType.true_track_angle,
+    report_extrapolated=False,
+    airborne=True,
+    integrity=Integrity.less_than_25_m_hpl_and_37_5_m_vpl,
+    accuracy=Accuracy.less_than_30_m_hfom_and_45_m_vfom,
+    horizontal_velocity=123,
+    vertical_velocity=64,
+    track=45,
+    emitter_category=EmitterCategory.light,
+    callsign="N825V",
+    emergency_priority_code=EmergencyPriorityCode.no_emergency,
+).serialize(outgoing_lsb=False)
+
+
+def receive_bytes(sock: socket.socket) -> int:
+    count = 0
+    for _ in range(BATCH):
+        count += len(parse_messages(sock.recv(65536)))
+    return count
+
+
+def main() -> None:
+    receiver_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    receiver_sock.bind(("127.0.0.1", 0))
+    address = receiver_sock.getsockname()
+    receiver = DatagramReceiver(receiver_sock, buffers=64)
+
+    def receive_pooled(sock: socket.socket) -> int:
+        count = 0
+        while count < BATCH:
+            count += len(receiver.poll())
+        return count
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+        for name, receive in (
+            ("recv + parse_messages", receive_bytes),
+            ("DatagramReceiver", receive_pooled),
+        ):
+            best = float("inf")
+            for _ in range(REPEAT):
+                # fill the socket buffer, then time draining it
+                for _ in range(BATCH):
+                    sender.sendto(DATAGRAM, address)
+                start = time.perf_counter()
+                assert receive(receiver_sock) == BATCH
+                best = min(best, time.perf_counter() - start)
+
+            print(f"{name:>24}: {best / BATCH * 1e6:8.2f} us/datagram")
+
+    receiver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark encoding a frame of Traffic Reports, as done when simulating
+traffic for many targets at once.
+
+Run with `python benchmarks/bench_serialize.py`.
+"""
+
+import timeit
+
+from gdl90py.enums import (
+    Accuracy,
+    AddressType,
+    EmergencyPriorityCode,
+    EmitterCategory,
+    Integrity,
+    TrackType,
+)
+from gdl90py.messages.traffic_report import TrafficReportMessage
+
+TARGETS = 500
+
+MESSAGES = [
+    TrafficReportMessage(
+        traffic_alert=False,
+        address_type=AddressType.ads_b_icao,
+        address=0xABC000 + i,
+        latitude=44.90708 + i / 1000,
+        longitude=-122.99488 - i / 1000,
+        pressure_altitude=5000 + i * 25,
+        track_type=TrackType.true_track_angle,
+        report_extrapolated=False,
+        airborne=True,
+        integrity=Integrity.less_than_25_m_hpl_and_37_5_m_vpl,
+        accuracy=Accuracy.less_than_30_m_hfom_and_45_m_vfom,
+        horizontal_velocity=120 + i % 100,
+        vertical_velocity=64 * (i % 10),
+        track=i % 360,
+        emitter_category=EmitterCategory.light,
+        callsign=f"N{i}",
+        emergency_priority_code=EmergencyPriorityCode.no_emergency,
+    )
+    for i in range(TARGETS)
+]
+
+
+def serialize_all() -> list[bytes]:
+    return [message.serialize() for message in MESSAGES]
+
+
+def main() -> None:
+    seconds = min(timeit.repeat(serialize_all, number=10, repeat=5)) / 10
+    print(
+        f"{TARGETS} targets: {seconds * 1e3:8.2f} ms/frame"
+        f" {seconds / TARGETS * 1e6:8.2f} us/msg"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark decoding a buffer of frames with a growing number of threads.
+Threads only decode in parallel on free-threaded builds of Python, so run
+this with both, for example `python3.13 benchmarks/bench_threaded.py` and
+`python3.13t benchmarks/bench_threaded.py`.
+
+Optionally pass the numbers of threads to try.
+"""
+
+import os
+import sys
+import time
+
+from gdl90py.messages.height_above_terrain import HeightAboveTerrainMessage
+from gdl90py.parallel import gil_enabled, parse_buffer_threaded
+
+COUNT = 500_000
+
+BUFFER = b"".join(
+    HeightAboveTerrainMessage(height_above_terrain=i % 1000).serialize(
+        outgoing_lsb=False
+    )
+    for i in range(COUNT)
+)
+
+
+def main() -> None:
+    cpus = os.cpu_count() or 1
+    workers = [int(arg) for arg in sys.argv[1:]] or sorted(
+        {n for n in (1, 2, 4, 8, cpus) if n <= cpus}
+    )
+
+    print(f"Python {sys.version.split()[0]}, GIL enabled: {gil_enabled()}, {cpus} CPUs")
+    baseline = None
+    for count in workers:
+        start = time.perf_counter()
+        decoded = sum(1 for _ in parse_buffer_threaded(BUFFER, count))
+        seconds = time.perf_counter() - start
+        assert decoded == COUNT
+
+        baseline = baseline or seconds
+        print(
+            f"{count:>3} threads: {seconds:6.2f} s {COUNT / seconds:12,.0f} msg/s"
+            f" {baseline / seconds:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,525 @@
+"""
+Receive and broadcast messages with asyncio.
+"""
+
+import asyncio
+import collections
+import functools
+import heapq
+import typing
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Literal
+
+from gdl90py.messages._base_message import BaseMessage
+from gdl90py.parser import FrameDecoder
+from gdl90py.utils.gdl90 import DEFAULT_PORT
+
+MAX_DATAGRAM_SIZE = 1472
+"""
+Largest UDP payload that fits in a single Ethernet frame without fragmenting.
+"""
+
+_CLOSED = object()
+
+
+class UDPReceiver(asyncio.DatagramProtocol):
+    """
+    Datagram protocol that decodes each datagram into messages and queues them.
+    Iterate over it with `async for` to receive the messages; iteration stops
+    once the receiver is closed and the queue has been drained.
+
+    At most `maxsize` messages are queued. When the queue is full, `overflow`
+    decides what happens:
+    - "drop_oldest" discards the oldest queued message to make room.
+    - "block" stops reading from the socket until messages are consumed,
+      leaving any further datagrams to the operating system's buffer.
+
+    Datagrams are never allowed to raise. Frames that can not be decoded
+    are counted in `invalid`, and messages discarded because the queue was
+    full are counted in `dropped`.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        overflow: Literal["drop_oldest", "block"] = "drop_oldest",
+        incoming_msb: bool = True,
+        ignore_unknown: bool = False,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if overflow not in ("drop_oldest", "block"):
+            raise ValueError(f"Unknown overflow policy {overflow!r}")
+
+        self.maxsize = maxsize
+        self.overflow = overflow
+
+        self.transport: asyncio.DatagramTransport | None = None
+        # the same transport, for pausing reading, which asyncio's datagram
+        # transports support without DatagramTransport declaring it
+        self._reader: asyncio.ReadTransport | None = None
+        self.dropped = 0
+        self.invalid = 0
+
+        self._decoder = FrameDecoder(incoming_msb, ignore_unknown)
+        # unbounded, so closing can always be signalled.
+        # maxsize is enforced when queuing messages
+        self._queue: asyncio.Queue[BaseMessage | object] = asyncio.Queue()
+        self._closed = False
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = typing.cast(asyncio.DatagramTransport, transport)
+        self._reader = typing.cast(asyncio.ReadTransport, transport)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._closed = True
+        self._queue.put_nowait(_CLOSED)
+
+    def datagram_received(self, data: bytes, addr: typing.Any) -> None:
+        messages, invalid = self._decoder.feed_skip_invalid(data)
+        self.invalid += invalid
+        for message in messages:
+            self._put(message)
+
+        # a datagram only contains whole frames, never carry one over
+        self._decoder.reset()
+
+        if (
+            self.overflow == "block"
+            and self._queue.qsize() >= self.maxsize
+            and self._reader is not None
+        ):
+            self._reader.pause_reading()
+
+    def _put(self, message: BaseMessage) -> None:
+        if self.overflow == "drop_oldest" and self._queue.qsize() >= self.maxsize:
+            self._queue.get_nowait()
+            self.dropped += 1
+
+        self._queue.put_nowait(message)
+
+    def close(self) -> None:
+        """
+        Close the socket. Messages already queued can still be received.
+        """
+        if self.transport is not None:
+            self.transport.close()
+
+    def __aiter__(self) -> "UDPReceiver":
+        return self
+
+    async def __anext__(self) -> BaseMessage:
+        message = await self._queue.get()
+        if message is _CLOSED:
+            # leave it for anyone else waiting
+            self._queue.put_nowait(_CLOSED)
+            raise StopAsyncIteration
+
+        if (
+            self._reader is not None
+            and not self._closed
+            and not self._reader.is_reading()
+            and self._queue.qsize() < self.maxsize
+        ):
+            self._reader.resume_reading()
+
+        return typing.cast(BaseMessage, message)
+
+    async def __aenter__(self) -> "UDPReceiver":
+        return self
+
+    async def __aexit__(self, *args: typing.Any) -> None:
+        self.close()
+
+
+async def open_udp_receiver(
+    host: str = "0.0.0.0",
+    port: int = DEFAULT_PORT,
+    maxsize: int = 1024,
+    overflow: Literal["drop_oldest", "block"] = "drop_oldest",
+    incoming_msb: bool = True,
+    ignore_unknown: bool = False,
+    reuse_port: bool | None = None,
+) -> UDPReceiver:
+    """
+    Bind a `UDPReceiver` to the given address on the running event loop.
+    Example:
+
+    ```python
+    async with await open_udp_receiver() as receiver:
+        async for message in receiver:
+            print(message)
+    ```
+    """
+    loop = asyncio.get_running_loop()
+    _, receiver = await loop.create_datagram_endpoint(
+        lambda: UDPReceiver(maxsize, overflow, incoming_msb, ignore_unknown),
+        local_addr=(host, port),
+        reuse_port=reuse_port,
+    )
+    return receiver
+
+
+class StreamReceiver:
+    """
+    Decode messages from an asyncio stream, such as a TCP connection, where
+    frames may be split across reads. Iterate over it with `async for` to
+    receive the messages, the same as a `UDPReceiver`.
+
+    `connect` is called to open the stream, and returns a `StreamReader` and
+    `StreamWriter` pair like `asyncio.open_connection`. If the stream ends or
+    fails, it is opened again after `reconnect_delay` seconds, doubling
+    after each failed attempt up to `max_reconnect_delay`. A partial frame
+    left over from the old stream is discarded. Without `reconnect`,
+    iteration stops when the stream ends, and an error opening the stream
+    is raised.
+
+    Only `read_size` bytes are read at a time, and only once the previous
+    messages have been consumed, so a slow consumer makes the sender wait
+    rather than data piling up here. Frames that can not be decoded are
+    counted in `invalid`.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[
+            [], Awaitable[tuple[asyncio.StreamReader, asyncio.StreamWriter]]
+        ],
+        reconnect: bool = True,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        read_size: int = 65536,
+        incoming_msb: bool = True,
+        ignore_unknown: bool = False,
+    ) -> None:
+        self.connect = connect
+        self.reconnect = reconnect
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.read_size = read_size
+
+        self.invalid = 0
+        self.reconnects = 0
+        """
+        Number of times the stream has been opened again.
+        """
+        self.error: Exception | None = None
+        """
+        The last error reading from or opening the stream, if any.
+        """
+
+        self._decoder = FrameDecoder(incoming_msb, ignore_unknown)
+        self._messages: collections.deque[BaseMessage] = collections.deque()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._connected_before = False
+        self._closed = False
+        self._closing = asyncio.Event()
+
+    async def _open(self) -> bool:
+        """
+        Open the stream, retrying if reconnecting is enabled.
+        Returns False if the receiver was closed first.
+        """
+        delay = self.reconnect_delay
+        if self._connected_before and await self._wait_closed(delay):
+            return False
+
+        while not self._closed:
+            try:
+                self._reader, self._writer = await self.connect()
+            except OSError as e:
+                self.error = e
+                if not self.reconnect:
+                    raise
+            else:
+                if self._connected_before:
+                    self.reconnects += 1
+                self._connected_before = True
+                return True
+
+            if await self._wait_closed(delay):
+                return False
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+        return False
+
+    async def _wait_closed(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._closing.wait(), timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+        self._decoder.reset()
+
+    def close(self) -> None:
+        """
+        Close the stream. Messages already decoded can still be received.
+        """
+        self._closed = True
+        self._closing.set()
+        self._disconnect()
+
+    def __aiter__(self) -> "StreamReceiver":
+        return self
+
+    async def __anext__(self) -> BaseMessage:
+        while not self._messages:
+            if self._closed:
+                raise StopAsyncIteration
+
+            if self._reader is None:
+                if self._connected_before and not self.reconnect:
+                    raise StopAsyncIteration
+                if not await self._open():
+                    raise StopAsyncIteration
+
+            assert self._reader is not None
+            try:
+                data = await self._reader.read(self.read_size)
+            except OSError as e:
+                self.error = e
+                data = b""
+
+            if not data:
+                self._disconnect()
+                continue
+
+            messages, invalid = self._decoder.feed_skip_invalid(data)
+            self.invalid += invalid
+            self._messages.extend(messages)
+
+        return self._messages.popleft()
+
+    async def __aenter__(self) -> "StreamReceiver":
+        return self
+
+    async def __aexit__(self, *args: typing.Any) -> None:
+        self.close()
+
+
+def open_tcp_receiver(
+    host: str,
+    port: int = DEFAULT_PORT,
+    reconnect: bool = True,
+    reconnect_delay: float = 1.0,
+    max_reconnect_delay: float = 30.0,
+    incoming_msb: bool = True,
+    ignore_unknown: bool = False,
+) -> StreamReceiver:
+    """
+    Return a `StreamReceiver` that connects to a TCP server when iteration
+    starts, and reconnects whenever the connection is lost. Example:
+
+    ```python
+    async with open_tcp_receiver("192.168.10.1", 2000) as receiver:
+        async for message in receiver:
+            print(message)
+    ```
+    """
+    return StreamReceiver(
+        functools.partial(asyncio.open_connection, host, port),
+        reconnect,
+        reconnect_delay,
+        max_reconnect_delay,
+        incoming_msb=incoming_msb,
+        ignore_unknown=ignore_unknown,
+    )
+
+
+@dataclass
+class TimingStats:
+    """
+    Running summary of a series of durations, in seconds.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class BroadcastStats:
+    """
+    Statistics for one scheduled message class.
+
+    - `jitter` is how late each send started compared to when it was due.
+    - `latency` is how long after it was due the last datagram was sent,
+      including getting the messages from the provider and serializing them.
+    - `missed` counts sends skipped entirely because the previous one
+      ran more than a whole period late.
+    """
+
+    rate: float
+    sends: int = 0
+    missed: int = 0
+    frames: int = 0
+    datagrams: int = 0
+    jitter: TimingStats = field(default_factory=TimingStats)
+    latency: TimingStats = field(default_factory=TimingStats)
+
+
+def pack_datagrams(
+    frames: Iterable[bytes | memoryview], max_size: int = MAX_DATAGRAM_SIZE
+) -> list[bytes]:
+    """
+    Join serialized frames into as few datagrams as possible, without any
+    datagram exceeding `max_size` bytes. A frame larger than `max_size`
+    is sent in a datagram of its own.
+    """
+    datagrams = []
+    pending: list[bytes | memoryview] = []
+    size = 0
+
+    for frame in frames:
+        if pending and size + len(frame) > max_size:
+            datagrams.append(b"".join(pending))
+            pending.clear()
+            size = 0
+
+        pending.append(frame)
+        size += len(frame)
+
+    if pending:
+        datagrams.append(b"".join(pending))
+
+    return datagrams
+
+
+class Broadcaster:
+    """
+    Periodically send messages over UDP, each message class at its own rate.
+
+    `rates` maps message classes to how many times per second they are sent.
+    Whenever a class is due, `provider` is called with it and returns the
+    current messages of that class, such as every Traffic Report being
+    tracked. They are serialized once, packed into as few datagrams as
+    possible, and sent to every target. Example:
+
+    ```python
+    broadcaster = Broadcaster(
+        provider,
+        {HeartbeatMessage: 1, OwnshipReportMessage: 5, TrafficReportMessage: 1},
+        targets=[("192.168.1.255", DEFAULT_PORT)],
+    )
+    await broadcaster.run()
+    ```
+
+    Sends are scheduled on a fixed grid from when `run` starts, so a late send
+    does not delay the following ones. How well the rates are met is tracked
+    in `stats`.
+    """
+
+    def __init__(
+        self,
+        provider: Callable[[type[BaseMessage]], Iterable[BaseMessage]],
+        rates: Mapping[type[BaseMessage], float],
+        targets: Iterable[tuple[str, int]] = (("255.255.255.255", DEFAULT_PORT),),
+        outgoing_lsb: bool = True,
+        max_datagram_size: int = MAX_DATAGRAM_SIZE,
+    ) -> None:
+        if not rates:
+            raise ValueError("rates must not be empty")
+        for message_class, rate in rates.items():
+            if rate <= 0:
+                raise ValueError(f"Rate for {message_class.__name__} must be positive")
+
+        self.provider = provider
+        self.targets = list(targets)
+        self.outgoing_lsb = outgoing_lsb
+        self.max_datagram_size = max_datagram_size
+
+        self.stats = {
+            message_class: BroadcastStats(rate) for message_class, rate in rates.items()
+        }
+        self.transport: asyncio.DatagramTransport | None = None
+
+    async def run(self) -> None:
+        """
+        Send messages until cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        if self.transport is None:
+            self.transport, _ = await loop.create_datagram_endpoint(
+                asyncio.DatagramProtocol,
+                local_addr=("0.0.0.0", 0),
+                allow_broadcast=True,
+            )
+
+        start = loop.time()
+        # (due time, tie breaker, send count, message class, period)
+        schedule = [
+            (start, index, 0, message_class, 1 / stats.rate)
+            for index, (message_class, stats) in enumerate(self.stats.items())
+        ]
+        heapq.heapify(schedule)
+
+        try:
+            while True:
+                due, index, number, message_class, period = schedule[0]
+
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                self._send(message_class, due)
+
+                now = loop.time()
+                number += 1
+                next_due = start + number * period
+                if next_due < now - period:
+                    # hopelessly behind, skip ahead rather than bursting
+                    skipped = int((now - next_due) / period)
+                    self.stats[message_class].missed += skipped
+                    number += skipped
+                    next_due = start + number * period
+
+                heapq.heapreplace(
+                    schedule, (next_due, index, number, message_class, period)
+                )
+        finally:
+            self.close()
+
+    def _send(self, message_class: type[BaseMessage], due: float) -> None:
+        assert self.transport is not None
+        loop = asyncio.get_running_loop()
+        stats = self.stats[message_class]
+        stats.jitter.add(loop.time() - due)
+
+        frames = [
+            message.serialize(self.outgoing_lsb)
+            for message in self.provider(message_class)
+        ]
+        datagrams = pack_datagrams(frames, self.max_datagram_size)
+
+        for datagram in datagrams:
+            for target in self.targets:
+                self.transport.sendto(datagram, target)
+
+        stats.sends += 1
+        stats.frames += len(frames)
+        stats.datagrams += len(datagrams)
+        stats.latency.add(loop.time() - due)
+
+    def close(self) -> None:
+        """
+        Close the socket.
+        """
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
@@ -0,0 +1,194 @@
+"""
+Decode many messages at once into NumPy arrays, one array per attribute,
+instead of a dataclass per message.
+
+Requires NumPy, which is included with the `numpy` extra.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+import gdl90py.utils.gdl90
+from gdl90py.messages._base_traffic_report import BaseTrafficReport
+from gdl90py.messages.traffic_report import TrafficReportMessage
+from gdl90py.parser import INVALID_FRAME_EXCEPTIONS
+from gdl90py.utils.bitarray import BIT_REVERSAL_TABLE
+from gdl90py.utils.layout import Field, Layout
+
+_BIT_REVERSAL_TABLE = np.frombuffer(BIT_REVERSAL_TABLE, dtype=np.uint8)
+_CRC_TABLE = np.array(gdl90py.utils.gdl90.CRC_TABLE, dtype=np.uint16)
+
+
+def decode_traffic_batch(
+    frames: Sequence[bytes | bytearray | memoryview],
+    incoming_msb: bool = True,
+    message_class: type[BaseTrafficReport] = TrafficReportMessage,
+    ignore_invalid: bool = False,
+) -> dict[str, np.ndarray]:
+    """
+    Decode complete Traffic Report frames (with flag bytes and CRC) into
+    a dictionary of arrays, keyed by attribute name. Set `message_class` to
+    `OwnshipReportMessage` to decode Ownship Reports instead.
+
+    Unlike the message classes:
+    - Enums are returned as their integer values.
+    - Values that would be None are NaN, in float arrays.
+    - Callsigns are returned as a string array.
+
+    Frames that can not be decoded raise the same exception as
+    `message_class.deserialize`. Set `ignore_invalid` to drop them instead.
+    """
+    layout = message_class._layout
+    data = np.zeros((len(frames), layout.size), dtype=np.uint8)
+    valid = _decode_fixed_width_frames(
+        frames, incoming_msb, message_class.MESSAGE_IDS, data
+    )
+
+    # anything else, such as frames with escaped bytes, goes the long way
+    for index in np.flatnonzero(~valid).tolist():
+        try:
+            message_data = message_class._clean_data(frames[index], incoming_msb)
+            if len(message_data) != layout.size:
+                layout.check_bits(len(message_data) * 8)
+        except INVALID_FRAME_EXCEPTIONS:
+            if ignore_invalid:
+                continue
+            raise
+
+        data[index] = np.frombuffer(message_data, dtype=np.uint8)
+        valid[index] = True
+
+    if not valid.all():
+        data = data[valid]
+
+    return decode_columns(layout, data)
+
+
+def decode_columns(layout: Layout, data: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Decode each field of the message data (without flag bytes, message ID(s)
+    and CRC) of `layout`, with one row per message, into a dictionary of
+    arrays, keyed by attribute name. The arrays have the same types as
+    `decode_traffic_batch`.
+    """
+    return {
+        field.name: _decode_column(field, data)
+        for field in layout.fields
+        if field.name is not None
+    }
+
+
+def _decode_fixed_width_frames(
+    frames: Sequence[bytes | bytearray | memoryview],
+    incoming_msb: bool,
+    message_ids: tuple[int, ...],
+    data: np.ndarray,
+) -> np.ndarray:
+    """
+    Decode all frames without escaped bytes at once, as they all have the
+    same width. Their message data is written into `data`.
+    Returns which frames were decoded.
+    """
+    count = len(frames)
+    # flag byte, message ID(s), message data, CRC, flag byte
+    frame_size = 1 + len(message_ids) + data.shape[1] + 2 + 1
+
+    lengths = np.fromiter(map(len, frames), dtype=np.intp, count=count)
+    buffer = np.frombuffer(b"".join(frames), dtype=np.uint8)
+
+    fixed_width = lengths == frame_size
+    if fixed_width.all():
+        rows = buffer.reshape(count, frame_size)
+    else:
+        starts = np.cumsum(lengths) - lengths
+        rows = buffer[starts[fixed_width, None] + np.arange(frame_size)]
+
+    # flip bit order
+    if not incoming_msb:
+        rows = _BIT_REVERSAL_TABLE[rows]
+
+    message_id_data = rows[:, 1:-3]
+    received_crc = rows[:, -3].astype(np.uint16) | (rows[:, -2].astype(np.uint16) << 8)
+
+    decoded = (
+        (rows[:, 0] == gdl90py.utils.gdl90.FLAG_BYTE)
+        & (rows[:, -1] == gdl90py.utils.gdl90.FLAG_BYTE)
+        & ~(rows[:, 1:-1] == gdl90py.utils.gdl90.CONTROL_ESCAPE_BYTE).any(axis=1)
+        & (message_id_data[:, : len(message_ids)] == message_ids).all(axis=1)
+        & (_crc(message_id_data) == received_crc)
+    )
+
+    valid = np.zeros(count, dtype=bool)
+    indexes = np.flatnonzero(fixed_width)[decoded]
+    data[indexes] = message_id_data[decoded, len(message_ids) :]
+    valid[indexes] = True
+    return valid
+
+
+def _crc(data: np.ndarray) -> np.ndarray:
+    """
+    Compute the CRC of each row, all rows at once.
+    """
+    crc = np.zeros(len(data), dtype=np.uint16)
+    for column in data.T:
+        crc = _CRC_TABLE[crc >> 8] ^ (crc << 8) ^ column
+
+    return crc
+
+
+def _decode_column(field: Field, data: np.ndarray) -> np.ndarray:
+    """
+    Decode a single field of the message data, with one row per message.
+    """
+    first = field.offset // 8
+    last = (field.offset + field.bits - 1) // 8
+
+    if field.kind is str:
+        text = np.ascontiguousarray(data[:, first : last + 1])
+        text = text.view(f"S{last + 1 - first}")[:, 0]
+        return np.char.rstrip(np.char.decode(text, field.encoding))
+
+    columns = range(first, last + 1)
+    if field.byteorder == "little":
+        # little-endian fields are always whole bytes
+        columns = reversed(columns)
+
+    raw = np.zeros(len(data), dtype=np.uint64)
+    for column in columns:
+        raw = (raw << 8) | data[:, column]
+    raw = (raw >> ((last + 1) * 8 - field.offset - field.bits)) & (
+        (1 << field.bits) - 1
+    )
+
+    if field.kind is bool:
+        return raw != 0
+
+    if field.enum is not None or (
+        field.kind is int
+        and not field.signed
+        and field.resolution is None
+        and not field.value_offset
+        and field.invalid is None
+    ):
+        return raw.astype(np.min_scalar_type((1 << field.bits) - 1))
+
+    value = raw.astype(np.int64)
+    if field.signed:
+        sign_bit = 1 << (field.bits - 1)
+        value = (value ^ sign_bit) - sign_bit
+
+    if field.resolution is not None:
+        value = value * field.resolution
+        if field.kind is int:
+            value = np.trunc(value)
+
+    value = value - field.value_offset
+
+    if field.invalid is not None:
+        value = value.astype(np.float64)
+        value[raw == field.invalid] = np.nan
+    elif field.kind is int:
+        value = value.astype(np.int64)
+
+    return value
@@ -10,6 +10,10 @@ class DataTooLong(Exception):
     pass
 
 
+class DataTooShort(Exception):
+    pass
+
+
 class InvalidCRC(Exception):
     pass
 
@@ -18,6 +22,10 @@ class MissingFlagBytes(Exception):
     pass
 
 
+class MalformedEscape(Exception):
+    pass
+
+
 class InvalidCallsign(Exception):
     pass
 
@@ -32,3 +40,11 @@ class UplinkDataWrongSize(Exception):
 
 class BadIntegerSize(Exception):
     pass
+
+
+class InvalidCapture(Exception):
+    pass
+
+
+class InvalidRecording(Exception):
+    pass
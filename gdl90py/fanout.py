@@ -0,0 +1,160 @@
+"""
+Send the same messages to many clients, serializing them only once.
+"""
+
+import socket
+import threading
+import typing
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from gdl90py.aio import MAX_DATAGRAM_SIZE, pack_datagrams
+from gdl90py.messages._base_message import BaseMessage
+
+
+@dataclass
+class ClientStats:
+    """
+    Statistics for one client of a `FanOutSender`.
+
+    - `dropped` counts datagrams not sent because the client's socket
+      buffer was full.
+    - `errors` counts datagrams that failed to send for any other reason,
+      such as the client being unreachable. The most recent one is kept
+      in `last_error`.
+    """
+
+    datagrams: int = 0
+    dropped: int = 0
+    errors: int = 0
+    last_error: OSError | None = None
+
+
+class _Client:
+    def __init__(self, address: tuple[str, int]) -> None:
+        family, type_, proto, _, sockaddr = socket.getaddrinfo(
+            *address, type=socket.SOCK_DGRAM
+        )[0]
+        self.sock = socket.socket(family, type_, proto)
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            self.sock.setblocking(False)
+            # connected, so errors for this client are reported on its own socket
+            self.sock.connect(sockaddr)
+        except OSError:
+            self.sock.close()
+            raise
+
+        self.stats = ClientStats()
+
+
+class FanOutSender:
+    """
+    Send messages to every registered client over UDP. Each call to `send`
+    serializes the messages once, packs them into as few datagrams as
+    possible, and sends the same datagrams to every client. Example:
+
+    ```python
+    sender = FanOutSender()
+    sender.add_client(("192.168.1.20", DEFAULT_PORT))
+    sender.add_client(("192.168.1.21", DEFAULT_PORT))
+
+    while True:
+        sender.send([heartbeat, ownship, *traffic])
+        time.sleep(1)
+    ```
+
+    Every client has its own non-blocking socket, so sending never waits,
+    and a client that is slow or unreachable only affects itself. Datagrams
+    that can not be sent to a client are skipped for that client, and counted
+    in its `ClientStats`. Clients can be added and removed from other
+    threads while sending.
+    """
+
+    def __init__(
+        self,
+        clients: Iterable[tuple[str, int]] = (),
+        outgoing_lsb: bool = True,
+        max_datagram_size: int = MAX_DATAGRAM_SIZE,
+    ) -> None:
+        self.outgoing_lsb = outgoing_lsb
+        self.max_datagram_size = max_datagram_size
+
+        # replaced rather than modified, so sending can iterate over it
+        # while clients are added or removed. Only replacing it is locked
+        self._clients: dict[tuple[str, int], _Client] = {}
+        self._lock = threading.Lock()
+        for address in clients:
+            self.add_client(address)
+
+    def add_client(self, address: tuple[str, int]) -> None:
+        """
+        Start sending to a `(host, port)` address. Adding a client twice
+        has no effect.
+        """
+        with self._lock:
+            if address not in self._clients:
+                self._clients = {**self._clients, address: _Client(address)}
+
+    def remove_client(self, address: tuple[str, int]) -> None:
+        """
+        Stop sending to an address.
+        """
+        with self._lock:
+            clients = dict(self._clients)
+            client = clients.pop(address, None)
+            self._clients = clients
+        if client is not None:
+            client.sock.close()
+
+    @property
+    def clients(self) -> list[tuple[str, int]]:
+        return list(self._clients)
+
+    def stats(self, address: tuple[str, int]) -> ClientStats:
+        return self._clients[address].stats
+
+    def send(self, messages: Iterable[BaseMessage]) -> int:
+        """
+        Serialize the messages once and send them to every client.
+        Returns the number of datagrams sent to each client.
+        """
+        frames = [message.serialize(self.outgoing_lsb) for message in messages]
+        return self.send_frames(frames)
+
+    def send_frames(self, frames: Iterable[bytes | memoryview]) -> int:
+        """
+        Same as `send`, but with frames that have already been serialized.
+        """
+        datagrams = pack_datagrams(frames, self.max_datagram_size)
+
+        for client in self._clients.values():
+            stats = client.stats
+            for datagram in datagrams:
+                try:
+                    client.sock.send(datagram)
+                except BlockingIOError:
+                    stats.dropped += 1
+                except OSError as e:
+                    stats.errors += 1
+                    stats.last_error = e
+                else:
+                    stats.datagrams += 1
+
+        return len(datagrams)
+
+    def close(self) -> None:
+        """
+        Close the sockets of every client.
+        """
+        with self._lock:
+            clients = self._clients
+            self._clients = {}
+        for client in clients.values():
+            client.sock.close()
+
+    def __enter__(self) -> "FanOutSender":
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
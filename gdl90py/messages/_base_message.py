@@ -1,11 +1,11 @@
-from abc import ABC, abstractmethod
-from enum import IntEnum
-from typing import Literal, Self, Type, TypeVar
+from abc import ABC
+from typing import ClassVar, Self
 
 from bitstring import BitArray
 
 import gdl90py.utils.gdl90
-from gdl90py.exceptions import BadIntegerSize, InvalidMessageID, UnexpectedNegative
+from gdl90py.exceptions import InvalidMessageID
+from gdl90py.utils.layout import Field, Layout
 
 """
 From the Specification:
@@ -22,204 +22,77 @@ our lives easier, we build the data as MSB (Python-native) and flip it
 at the end.
 """
 
-T = TypeVar("T", bound=IntEnum)
-
 
 class BaseMessage(ABC):
-    MESSAGE_IDS = (float("nan"),)
+    MESSAGE_IDS: ClassVar[tuple[int, ...]] = ()
+    """
+    Message ID, followed by the sub ID for ForeFlight messages.
+    """
+
+    LAYOUT: tuple[Field, ...] = ()
+    """
+    Bit layout of the message data. Compiled into a `Layout` when
+    the class is created.
+    """
+    _layout: Layout
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.LAYOUT:
+            cls._layout = Layout(cls.LAYOUT, cls)
 
-    @abstractmethod
     def serialize(self, outgoing_lsb: bool = True) -> bytes:
         """
         `outgoing_lsb` should be set to True if the bytes
         produced should be created with the Least Signficiant Bit first.
         """
-        pass  # pragma: no cover
-
-    @classmethod
-    def _clean_data(
-        cls, data: bytes | bytearray | BitArray, incoming_msb: bool = False
-    ) -> BitArray:
-        """
-        Clean incoming data to remove flag bytes, CRC, message ID(s), and unescape
-        """
-        if isinstance(data, (bytes, bytearray, memoryview)):
-            message_ids, data = gdl90py.utils.gdl90.deconstruct(data, incoming_msb)
-            if message_ids != cls.MESSAGE_IDS:
-                raise InvalidMessageID(f"Invalid message ID(s) {message_ids}")
-
-        return data
-
-    @abstractmethod
-    @classmethod
-    def deserialize(
-        cls, data: bytes | bytearray | BitArray, incoming_msb: bool = False
-    ) -> Self:
-        pass  # pragma: no cover
-
-    def _serialize_uint(
-        self, value: int, bits: int, constrain: bool = True
-    ) -> BitArray:
-        """
-        Serialize an unsigned integer.
-        """
-        if value < 0:
-            raise UnexpectedNegative(
-                "Cannot serialize negative value for unsigned integer."
-            )
-
-        if constrain:
-            value = min(value, (2**bits) - 1)
-        elif value > (2**bits) - 1:
-            raise BadIntegerSize(
-                f"{value} exceeds the maximum value for an unsigned {bits}-bit integer"
-            )
-
-        return BitArray(uint=value, length=bits)
-
-    @classmethod
-    def _deserialize_uint(cls, bitarray: BitArray) -> int:
-        """
-        Deserialize an unsigned integer
-        """
-        return bitarray.uint
-
-    def _serialize_int(self, value: int, bits: int, constrain: bool = True) -> BitArray:
-        """
-        Serialize a signed integer.
-        """
-        if constrain:
-            value = min(value, (2 ** (bits - 1)) - 1)
-            value = max(value, 0 - (2 ** (bits - 1)))
-        elif value > (2 ** (bits - 1)) - 1:
-            raise BadIntegerSize(
-                f"{value} exceeds the maximum value for a signed {bits}-bit integer"
-            )
-        elif value < 0 - (2 ** (bits - 1)):
-            raise BadIntegerSize(
-                f"{value} exceeds the minimum value for a signed {bits}-bit integer"
-            )
-
-        return BitArray(int=value, length=bits)
-
-    @classmethod
-    def _deserialize_int(cls, bitarray: BitArray) -> int:
-        """
-        Deserialize an signed integer
-        """
-        return bitarray.int
-
-    def _serialize_resolution_uint(
-        self, value: int, resolution: float, bits: int
-    ) -> BitArray:
-        """
-        Serialize an unsigned integer with a resolution.
-        """
-        return self._serialize_uint(int(value / resolution), bits)
-
-    @classmethod
-    def _deserialize_resolution_uint(cls, bitarray: BitArray, resolution: float) -> int:
-        """
-        Deserialize an unsigned integer with a resolution.
-        """
-        return int(cls._deserialize_uint(bitarray) * resolution)
-
-    def _serialize_resolution_int(
-        self, value: float, resolution: float, bits: int
-    ) -> BitArray:
-        """
-        Serialize a signed integer with a resolution.
-        """
-        return self._serialize_int(int(value / resolution), bits)
-
-    @classmethod
-    def _deserialize_resolution_int(cls, bitarray: BitArray, resolution: float) -> int:
-        """
-        Deserialize a signed integer with a resolution.
-        """
-        return int(cls._deserialize_resolution_float(bitarray, resolution))
+        return gdl90py.utils.gdl90.build_bytes(
+            self.MESSAGE_IDS,
+            self.pack(),
+            outgoing_lsb,
+        )
 
-    def _serialize_resolution_float(
-        self, value: float, resolution: float, bits: int
-    ) -> BitArray:
+    def pack(self) -> bytes:
         """
-        Serialize a signed float with a resolution.
+        Encode only the message data (without flag bytes, message ID(s) and CRC).
         """
-        return self._serialize_resolution_int(value, resolution, bits)
+        return self._layout.pack(self)
 
     @classmethod
-    def _deserialize_resolution_float(
-        cls, bitarray: BitArray, resolution: float
-    ) -> float:
-        """
-        Deserialize a signed float with a resolution.
-        """
-        return cls._deserialize_int(bitarray) * resolution
-
-    def _serialize_resolution_offset_uint(
-        self, value: int, offset: int, resolution: float, bits: int
-    ) -> BitArray:
-        """
-        Serialize an unsigned integer with an offset and resolution.
-        """
-        return self._serialize_resolution_uint(value + offset, resolution, bits)
-
-    @classmethod
-    def _deserialize_resolution_offset_uint(
-        cls, bitarray: BitArray, offset: int, resolution: float
-    ) -> int:
-        """
-        Deserialize an unsigned integer with an offset and resolution.
-        """
-        return cls._deserialize_resolution_uint(bitarray, resolution) - offset
-
-    def _serialize_bool(self, value: bool) -> BitArray:
-        """
-        Serialize a boolean.
-        """
-        return self._serialize_uint(int(value), 1)
-
-    @classmethod
-    def _deserialize_bool(cls, bitarray: BitArray) -> bool:
-        """
-        Deserialize a boolean.
-        """
-        return bitarray.bool
-
-    def _serialize_str(
-        self, value: str, bits: int, encoding: Literal["ascii", "utf-8"]
-    ) -> BitArray:
+    def _clean_data(
+        cls, data: bytes | bytearray | memoryview | BitArray, incoming_msb: bool = False
+    ) -> bytes | bytearray | memoryview:
         """
-        Serialize a string.
+        Clean incoming data to remove flag bytes, CRC, message ID(s), and unescape
         """
-        # each character is 1 byte
-        num_bytes = int(bits / 8)
+        if isinstance(data, BitArray):
+            if len(data) % 8 != 0:
+                cls._layout.check_bits(len(data))
+            return data.tobytes()
 
-        # pad to enough characters
-        value = value.ljust(num_bytes)
-        # strip extra characters
-        value = value[:num_bytes]
+        message_ids, message_data = gdl90py.utils.gdl90.deconstruct_bytes(
+            data, incoming_msb
+        )
+        if message_ids != cls.MESSAGE_IDS:
+            raise InvalidMessageID(f"Invalid message ID(s) {message_ids}")
 
-        return BitArray(bytes=value.encode(encoding), length=bits)
+        return message_data
 
     @classmethod
-    def _deserialize_str(
-        cls, bitarray: BitArray, encoding: Literal["ascii", "utf-8"]
-    ) -> str:
-        """
-        Deserialize a string.
-        """
-        return bitarray.bytes.decode(encoding)
-
-    def _serialize_enum(self, value: IntEnum, length: int) -> BitArray:
+    def deserialize(
+        cls, data: bytes | bytearray | memoryview | BitArray, incoming_msb: bool = True
+    ) -> Self:
         """
-        Serialize a Enum.
+        `data` is either a complete message as bytes, or only the message data
+        (without flag bytes, message ID(s) and CRC) as a BitArray.
+        `incoming_msb` should be set to True if the bytes provided have the Most
+        Signficiant Bit first.
         """
-        return self._serialize_uint(value.value, length)
+        return cls.unpack(cls._clean_data(data, incoming_msb))
 
     @classmethod
-    def _deserialize_enum(cls, bitarray: BitArray, enum: Type[T]) -> T:
+    def unpack(cls, data: bytes | bytearray | memoryview) -> Self:
         """
-        Deserialize a Enum.
+        Decode only the message data (without flag bytes, message ID(s) and CRC).
         """
-        return enum(cls._deserialize_uint(bitarray))
+        return cls(**cls._layout.unpack(data))
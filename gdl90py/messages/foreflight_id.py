@@ -2,12 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from bitstring import BitArray
-
 import gdl90py.utils.gdl90
-from gdl90py.exceptions import DataTooLong
 from gdl90py.messages._base_message import BaseMessage
-from gdl90py.utils.bitarray import pop_bits
+from gdl90py.utils.layout import Field, pack_str
 
 
 @dataclass(frozen=True)
@@ -36,103 +33,33 @@ class ForeFlightIDMessage(BaseMessage):
     """
 
     # constants
-    VERSION_BITS = 8
-    DEVICE_SERIAL_NUMBER_BITS = 64
     DEVICE_SERIAL_NUMBER_INVALID_VALUE = 0xFFFFFFFFFFFFFFFF
-    DEVICE_NAME_BITS = 64
-    DEVICE_LONG_NAME_BITS = 128
-    RESERVED_BITS_1 = 7
-    RESERVED_BITS_2 = 24
-
-    def _serialize_version(self) -> BitArray:
-        return self._serialize_uint(self.version, self.VERSION_BITS)
-
-    @classmethod
-    def _deserialize_version(cls, version_bitarray: BitArray) -> int:
-        return cls._deserialize_uint(version_bitarray)
-
-    def _serialize_device_serial_number(self) -> BitArray:
-        device_serial_number = self.device_serial_number
-        if device_serial_number is None:
-            device_serial_number = self.DEVICE_SERIAL_NUMBER_INVALID_VALUE
-        return self._serialize_uint(
-            device_serial_number, self.DEVICE_SERIAL_NUMBER_BITS, constrain=False
-        )
-
-    @classmethod
-    def _deserialize_device_serial_number(
-        cls, device_serial_number_bitarray: BitArray
-    ) -> int | None:
-        if device_serial_number_bitarray.uint == cls.DEVICE_SERIAL_NUMBER_INVALID_VALUE:
-            return None
-
-        return cls._deserialize_uint(device_serial_number_bitarray)
-
-    def _serialize_device_name(self) -> BitArray:
-        return self._serialize_str(self.device_name, self.DEVICE_NAME_BITS, "utf-8")
-
-    @classmethod
-    def _deserialize_device_name(cls, device_name_bitarray: BitArray) -> str:
-        # remove trailing whitespace
-        return cls._deserialize_str(device_name_bitarray, "utf-8").rstrip()
-
-    def _serialize_device_long_name(self) -> BitArray:
-        device_long_name = self.device_long_name
+    DEVICE_LONG_NAME_LENGTH = 16
+
+    LAYOUT = (
+        Field("version", 0, 8),
+        Field(
+            "device_serial_number",
+            8,
+            64,
+            invalid=DEVICE_SERIAL_NUMBER_INVALID_VALUE,
+            constrain=False,
+        ),
+        Field("device_name", 72, 64, kind=str, encoding="utf-8"),
+        Field(
+            "device_long_name",
+            136,
+            DEVICE_LONG_NAME_LENGTH * 8,
+            kind=str,
+            encoding="utf-8",
+        ),
+        Field(None, 264, 7),
+        Field("is_msl", 271, 1, kind=bool),
+        Field(None, 272, 24),
+    )
+
+    def _encode_device_long_name(self, device_long_name: str | None) -> int:
         if device_long_name is None:
             device_long_name = self.device_name
 
-        return self._serialize_str(
-            device_long_name, self.DEVICE_LONG_NAME_BITS, "utf-8"
-        )
-
-    @classmethod
-    def _deserialize_device_long_name(cls, device_long_name_bitarray: BitArray) -> str:
-        return cls._deserialize_str(device_long_name_bitarray, "utf-8").rstrip()
-
-    def _serialize_is_msl(self) -> BitArray:
-        return self._serialize_bool(self.is_msl)
-
-    @classmethod
-    def _deserialize_is_msl(cls, is_msl_bitarray: BitArray) -> bool:
-        return cls._deserialize_bool(is_msl_bitarray)
-
-    def serialize(self, outgoing_lsb: bool = True) -> bytes:
-        all_data = (
-            self._serialize_version()
-            + self._serialize_device_serial_number()
-            + self._serialize_device_name()
-            + self._serialize_device_long_name()
-            + BitArray(uint=0, length=self.RESERVED_BITS_1)  # reserved
-            + self._serialize_is_msl()
-            + BitArray(uint=0, length=self.RESERVED_BITS_2)  # reserved
-        )
-        return gdl90py.utils.gdl90.build(self.MESSAGE_IDS, all_data, outgoing_lsb)
-
-    @classmethod
-    def deserialize(
-        cls, data: BitArray | bytes | bytearray, incoming_msb: bool = True
-    ) -> ForeFlightIDMessage:
-        data = cls._clean_data(data, incoming_msb)
-
-        version = cls._deserialize_version(pop_bits(data, cls.VERSION_BITS))
-        device_serial_number = cls._deserialize_device_serial_number(
-            pop_bits(data, cls.DEVICE_SERIAL_NUMBER_BITS)
-        )
-        device_name = cls._deserialize_device_name(pop_bits(data, cls.DEVICE_NAME_BITS))
-        device_long_name = cls._deserialize_device_long_name(
-            pop_bits(data, cls.DEVICE_LONG_NAME_BITS)
-        )
-        pop_bits(data, cls.RESERVED_BITS_1)  # reserved
-        is_msl = cls._deserialize_is_msl(pop_bits(data, 1))
-        pop_bits(data, cls.RESERVED_BITS_2)  # reserved
-
-        if len(data) != 0:
-            raise DataTooLong(f"Data is {len(data)} bits long")
-
-        return ForeFlightIDMessage(
-            device_serial_number=device_serial_number,
-            device_name=device_name,
-            device_long_name=device_long_name,
-            is_msl=is_msl,
-            version=version,
-        )
+        return pack_str(device_long_name, self.DEVICE_LONG_NAME_LENGTH, "utf-8")
@@ -3,12 +3,8 @@ from __future__ import annotations
 import datetime
 from dataclasses import dataclass
 
-from bitstring import BitArray
-
-import gdl90py.utils.gdl90
-from gdl90py.exceptions import DataTooLong
 from gdl90py.messages._base_message import BaseMessage
-from gdl90py.utils.bitarray import pop_bits
+from gdl90py.utils.layout import Field
 
 SECONDS_PER_MINUTE = 60
 MINUTES_PER_HOUR = 60
@@ -84,210 +80,47 @@ class HeartbeatMessage(BaseMessage):
     ForeFlight ignores this.
     """
 
-    TIMESTAMP_BITS_1 = 1
-    TIMESTAMP_BITS_2 = 8
-    TIMESTAMP_BITS_3 = 8
-    TIMESTAMP_BITS = TIMESTAMP_BITS_1 + TIMESTAMP_BITS_2 + TIMESTAMP_BITS_3
-    UPLINK_MESSAGES_COUNT_BITS = 5
-    BASIC_LONG_MESSAGES_COUNT_BITS = 10
-
-    RESERVED_1_BITS = 1
-    RESERVED_2_BITS = 4
-    RESERVED_3_BITS = 1
-
-    def _serialize_gps_position_valid(self) -> BitArray:
-        return self._serialize_bool(self.gps_position_valid)
-
-    @classmethod
-    def _deserialize_gps_position_valid(
-        cls, gps_position_valid_bitarray: BitArray
-    ) -> bool:
-        return cls._deserialize_bool(gps_position_valid_bitarray)
-
-    def _serialize_maintenance_required(self) -> BitArray:
-        return self._serialize_bool(self.maintenance_required)
-
-    @classmethod
-    def _deserialize_maintenance_required(
-        cls, maintenance_required_bitarray: BitArray
-    ) -> bool:
-        return cls._deserialize_bool(maintenance_required_bitarray)
-
-    def _serialize_ident_talkback(self) -> BitArray:
-        return self._serialize_bool(self.ident_talkback)
-
-    @classmethod
-    def _deserialize_ident_talkback(cls, ident_talkback_bitarray: BitArray) -> bool:
-        return cls._deserialize_bool(ident_talkback_bitarray)
-
-    def _serialize_self_assigned_address_talkback(self) -> BitArray:
-        return self._serialize_bool(self.self_assigned_address_talkback)
-
-    @classmethod
-    def _deserialize_self_assigned_address_talkback(
-        cls, self_assigned_address_talkback_bitarray: BitArray
-    ) -> bool:
-        return cls._deserialize_bool(self_assigned_address_talkback_bitarray)
-
-    def _serialize_gps_battery_low(self) -> BitArray:
-        return self._serialize_bool(self.gps_battery_low)
-
-    @classmethod
-    def _deserialize_gps_battery_low(cls, gps_battery_low_bitarray: BitArray) -> bool:
-        return cls._deserialize_bool(gps_battery_low_bitarray)
-
-    def _serialize_RATCS_talkback(self) -> BitArray:
-        return self._serialize_bool(self.RATCS_talkback)
-
-    @classmethod
-    def _deserialize_RATCS_talkback(cls, RATCS_talkback_bitarray: BitArray) -> bool:
-        return cls._deserialize_bool(RATCS_talkback_bitarray)
-
-    def _serialize_UAT_initialized(self) -> BitArray:
-        return self._serialize_bool(self.UAT_initialized)
-
-    @classmethod
-    def _deserialize_UAT_initialized(cls, UAT_initialized_bitarray: BitArray) -> bool:
-        return cls._deserialize_bool(UAT_initialized_bitarray)
-
-    def _serialize_CSA_requested(self) -> BitArray:
-        return self._serialize_bool(self.CSA_requested)
-
-    @classmethod
-    def _deserialize_CSA_requested(cls, CSA_requested_bitarray: BitArray) -> bool:
-        return cls._deserialize_bool(CSA_requested_bitarray)
-
-    def _serialize_CSA_unavailable(self) -> BitArray:
-        return self._serialize_bool(self.CSA_unavailable)
-
-    @classmethod
-    def _deserialize_CSA_unavailable(cls, CSA_unavailable_bitarray: BitArray) -> bool:
-        return cls._deserialize_bool(CSA_unavailable_bitarray)
-
-    def _serialize_UTC_timing_valid(self) -> BitArray:
-        return self._serialize_bool(self.UTC_timing_valid)
-
-    @classmethod
-    def _deserialize_UTC_timing_valid(cls, UTC_timing_valid_bitarray: BitArray) -> bool:
-        return cls._deserialize_bool(UTC_timing_valid_bitarray)
-
-    def _serialize_timestamp(self) -> BitArray:
-        total_seconds = (
-            (self.timestamp.hour * SECONDS_PER_HOUR)
-            + (self.timestamp.minute * SECONDS_PER_MINUTE)
-            + self.timestamp.second
-        )
-        return self._serialize_uint(total_seconds, self.TIMESTAMP_BITS)
+    LAYOUT = (
+        Field("gps_position_valid", 0, 1, kind=bool),
+        Field("maintenance_required", 1, 1, kind=bool),
+        Field("ident_talkback", 2, 1, kind=bool),
+        Field("self_assigned_address_talkback", 3, 1, kind=bool),
+        Field("gps_battery_low", 4, 1, kind=bool),
+        Field("RATCS_talkback", 5, 1, kind=bool),
+        Field(None, 6, 1),
+        Field("UAT_initialized", 7, 1, kind=bool),
+        # the most significant bit of the timestamp is followed by some status
+        # bits, and then the rest of the timestamp with the least significant
+        # byte first. See `_decode_timestamp` and `_encode_timestamp`
+        Field("timestamp", 8, 24),
+        Field("CSA_requested", 9, 1, kind=bool),
+        Field("CSA_unavailable", 10, 1, kind=bool),
+        Field(None, 11, 4),
+        Field("UTC_timing_valid", 15, 1, kind=bool),
+        Field("uplink_messages_count", 32, 5),
+        Field(None, 37, 1),
+        Field("basic_long_messages_count", 38, 10),
+    )
 
     @classmethod
-    def _deserialize_timestamp(cls, timestamp_bitarray: BitArray) -> datetime.time:
-        total_seconds = cls._deserialize_uint(timestamp_bitarray)
+    def _decode_timestamp(cls, raw: int) -> datetime.time:
+        total_seconds = ((raw >> 23) << 16) | ((raw & 0xFF) << 8) | ((raw >> 8) & 0xFF)
         hours, remainder_seconds = divmod(total_seconds, SECONDS_PER_HOUR)
         minutes, seconds = divmod(remainder_seconds, SECONDS_PER_MINUTE)
         return datetime.time(
             hour=hours, minute=minutes, second=seconds, tzinfo=datetime.UTC
         )
 
-    def _serialize_uplink_messages_count(self) -> BitArray:
-        return self._serialize_uint(
-            self.uplink_messages_count, self.UPLINK_MESSAGES_COUNT_BITS
-        )
-
-    @classmethod
-    def _deserialize_uplink_messages_count(
-        cls, uplink_messages_count_bitarray: BitArray
-    ) -> int:
-        return cls._deserialize_uint(uplink_messages_count_bitarray)
-
-    def _serialize_basic_long_messages_count(self) -> BitArray:
-        return self._serialize_uint(
-            self.basic_long_messages_count, self.BASIC_LONG_MESSAGES_COUNT_BITS
-        )
-
-    @classmethod
-    def _deserialize_basic_long_messages_count(
-        cls, basic_long_messages_count_bitarray: BitArray
-    ) -> int:
-        return cls._deserialize_uint(basic_long_messages_count_bitarray)
-
-    def serialize(self, outgoing_lsb: bool = True) -> bytes:
-        timestamp_bitarray = self._serialize_timestamp()
-        all_data = (
-            self._serialize_gps_position_valid()
-            + self._serialize_maintenance_required()
-            + self._serialize_ident_talkback()
-            + self._serialize_self_assigned_address_talkback()
-            + self._serialize_gps_battery_low()
-            + self._serialize_RATCS_talkback()
-            + BitArray(uint=0, length=self.RESERVED_1_BITS)  # reserved
-            + self._serialize_UAT_initialized()
-            + timestamp_bitarray[: self.TIMESTAMP_BITS_1]
-            + self._serialize_CSA_requested()
-            + self._serialize_CSA_unavailable()
-            + BitArray(uint=0, length=self.RESERVED_2_BITS)  # reserved
-            + self._serialize_UTC_timing_valid()
-            + timestamp_bitarray[self.TIMESTAMP_BITS_1 + self.TIMESTAMP_BITS_2 :]
-            + timestamp_bitarray[
-                self.TIMESTAMP_BITS_1 : self.TIMESTAMP_BITS_1 + self.TIMESTAMP_BITS_2
-            ]
-            + self._serialize_uplink_messages_count()
-            + BitArray(uint=0, length=self.RESERVED_3_BITS)  # reserved
-            + self._serialize_basic_long_messages_count()
-        )
-        return gdl90py.utils.gdl90.build(self.MESSAGE_IDS, all_data, outgoing_lsb)
-
-    @classmethod
-    def deserialize(
-        cls, data: BitArray | bytes | bytearray, incoming_msb: bool = True
-    ) -> HeartbeatMessage:
-        data = cls._clean_data(data, incoming_msb)
-
-        gps_position_valid = cls._deserialize_gps_position_valid(pop_bits(data, 1))
-        maintenance_required = cls._deserialize_maintenance_required(pop_bits(data, 1))
-        ident_talkback = cls._deserialize_ident_talkback(pop_bits(data, 1))
-        self_assigned_address_talkback = (
-            cls._deserialize_self_assigned_address_talkback(pop_bits(data, 1))
-        )
-        gps_battery_low = cls._deserialize_gps_battery_low(pop_bits(data, 1))
-        RATCS_talkback = cls._deserialize_RATCS_talkback(pop_bits(data, 1))
-        pop_bits(data, cls.RESERVED_1_BITS)  # reserved
-        UAT_initialized = cls._deserialize_UAT_initialized(pop_bits(data, 1))
-
-        timestamp_bits_1 = pop_bits(data, cls.TIMESTAMP_BITS_1)
-
-        CSA_requested = cls._deserialize_CSA_requested(pop_bits(data, 1))
-        CSA_unavailable = cls._deserialize_CSA_unavailable(pop_bits(data, 1))
-        pop_bits(data, cls.RESERVED_2_BITS)  # reserved
-        UTC_timing_valid = cls._deserialize_UTC_timing_valid(pop_bits(data, 1))
-
-        timestamp_bits_2 = pop_bits(data, cls.TIMESTAMP_BITS_2)
-        timestamp_bits_3 = pop_bits(data, cls.TIMESTAMP_BITS_3)
-        timestamp = cls._deserialize_timestamp(
-            timestamp_bits_1 + timestamp_bits_3 + timestamp_bits_2
-        )
-        uplink_messages_count = cls._deserialize_uplink_messages_count(
-            pop_bits(data, cls.UPLINK_MESSAGES_COUNT_BITS)
-        )
-        pop_bits(data, cls.RESERVED_3_BITS)  # reserved
-        basic_long_messages_count = cls._deserialize_basic_long_messages_count(
-            pop_bits(data, cls.BASIC_LONG_MESSAGES_COUNT_BITS)
+    def _encode_timestamp(self, timestamp: datetime.time) -> int:
+        total_seconds = (
+            (timestamp.hour * SECONDS_PER_HOUR)
+            + (timestamp.minute * SECONDS_PER_MINUTE)
+            + timestamp.second
         )
-
-        if len(data) != 0:
-            raise DataTooLong(f"Data is {len(data)} bits long")
-
-        return HeartbeatMessage(
-            gps_position_valid=gps_position_valid,
-            maintenance_required=maintenance_required,
-            ident_talkback=ident_talkback,
-            self_assigned_address_talkback=self_assigned_address_talkback,
-            gps_battery_low=gps_battery_low,
-            RATCS_talkback=RATCS_talkback,
-            UAT_initialized=UAT_initialized,
-            CSA_requested=CSA_requested,
-            CSA_unavailable=CSA_unavailable,
-            UTC_timing_valid=UTC_timing_valid,
-            timestamp=timestamp,
-            uplink_messages_count=uplink_messages_count,
-            basic_long_messages_count=basic_long_messages_count,
+        # 17-bit value
+        total_seconds = min(total_seconds, 0x1FFFF)
+        return (
+            ((total_seconds >> 16) << 23)
+            | ((total_seconds & 0xFF) << 8)
+            | ((total_seconds >> 8) & 0xFF)
         )
@@ -0,0 +1,243 @@
+"""
+Decode large files of messages across multiple processes or threads.
+
+Decoding does not change any shared state: `parse_message`, `iter_frames`
+and the message classes only read module-level tables and compiled
+patterns, and messages are immutable. They can be called from any number
+of threads at once, including on free-threaded builds of Python. Objects
+that keep decoding state between calls, such as `FrameDecoder`, must still
+only be used by one thread at a time.
+"""
+
+import collections
+import mmap
+import os
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import gdl90py.utils.gdl90
+from gdl90py.messages._base_message import BaseMessage
+from gdl90py.parser import UNDECODABLE_FRAME_EXCEPTIONS, iter_frames, parse_message
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+MIN_CHUNK_SIZE = 64 * 1024
+
+# a closing flag byte immediately followed by an opening one
+_FRAME_BOUNDARY = bytes((gdl90py.utils.gdl90.FLAG_BYTE, gdl90py.utils.gdl90.FLAG_BYTE))
+
+
+def split_chunks(
+    buffer: bytes | bytearray | mmap.mmap, chunk_size: int
+) -> list[tuple[int, int]]:
+    """
+    Split a buffer of frames into `(start, end)` chunks of roughly `chunk_size`
+    bytes. Chunks are split between back-to-back flag bytes. Flag bytes never
+    appear inside a frame, so no frame can span two chunks, and each chunk
+    decodes to exactly the frames a single pass over the buffer would.
+    """
+    chunks = []
+    start = 0
+    size = len(buffer)
+
+    while start < size:
+        boundary = buffer.find(_FRAME_BOUNDARY, start + chunk_size)
+        end = size if boundary < 0 else boundary + 1
+        chunks.append((start, end))
+        start = end
+
+    return chunks
+
+
+def _decode_chunk(
+    path: str | os.PathLike,
+    start: int,
+    end: int,
+    incoming_msb: bool,
+    ignore_unknown: bool,
+    ignore_invalid: bool,
+) -> list[BaseMessage]:
+    """
+    Decode one chunk of a file, in a worker process.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        return _decode_buffer(
+            m, start, end, incoming_msb, ignore_unknown, ignore_invalid
+        )
+
+
+def _decode_buffer(
+    buffer: bytes | bytearray | mmap.mmap,
+    start: int,
+    end: int,
+    incoming_msb: bool,
+    ignore_unknown: bool,
+    ignore_invalid: bool,
+) -> list[BaseMessage]:
+    messages = []
+    invalid = UNDECODABLE_FRAME_EXCEPTIONS if ignore_invalid else ()
+
+    # slicing an mmap copies, so no exported buffers outlive it, even
+    # from the traceback of an exception
+    for offset, length in iter_frames(buffer, start, end):
+        try:
+            message = parse_message(
+                buffer[offset : offset + length], incoming_msb, ignore_unknown
+            )
+        except invalid:
+            continue
+
+        if message is not None:
+            messages.append(message)
+
+    return messages
+
+
+def parse_file_parallel(
+    path: str | os.PathLike,
+    workers: int | None = None,
+    incoming_msb: bool = True,
+    ignore_unknown: bool = False,
+    ignore_invalid: bool = False,
+    chunk_size: int | None = None,
+) -> Iterator[BaseMessage]:
+    """
+    Decode a file of frames, such as a raw capture of a serial port, using
+    `workers` processes (by default, one per CPU). The file is split into
+    chunks at frame boundaries, which each process memory-maps and decodes
+    independently. Messages are yielded in the order they appear in the file,
+    as each chunk is finished.
+
+    `incoming_msb` and `ignore_unknown` are the same as for `parse_messages`.
+    Set `ignore_invalid` to skip frames that can not be decoded instead of
+    raising an exception.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+
+        if chunk_size is None:
+            # enough chunks to keep every worker busy
+            chunk_size = max(
+                MIN_CHUNK_SIZE, min(DEFAULT_CHUNK_SIZE, size // (workers * 4))
+            )
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            chunks = split_chunks(m, chunk_size)
+
+            if workers == 1 or len(chunks) == 1:
+                for start, end in chunks:
+                    yield from _decode_buffer(
+                        m, start, end, incoming_msb, ignore_unknown, ignore_invalid
+                    )
+                return
+
+    with ProcessPoolExecutor(workers) as executor:
+        yield from _map_in_order(
+            executor,
+            _decode_chunk,
+            (
+                (path, start, end, incoming_msb, ignore_unknown, ignore_invalid)
+                for start, end in chunks
+            ),
+            workers * 2,
+        )
+
+
+def gil_enabled() -> bool:
+    """
+    Whether the global interpreter lock is enabled. Always True before
+    Python 3.13, and on builds that are not free-threaded.
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or is_gil_enabled()
+
+
+def parse_buffer_threaded(
+    buffer: bytes | bytearray | mmap.mmap,
+    workers: int | None = None,
+    incoming_msb: bool = True,
+    ignore_unknown: bool = False,
+    ignore_invalid: bool = False,
+    chunk_size: int | None = None,
+    executor: ThreadPoolExecutor | None = None,
+) -> Iterator[BaseMessage]:
+    """
+    Same as `parse_file_parallel`, but decodes a buffer already in memory
+    (or an `mmap.mmap` of a file) using `workers` threads, without copying
+    it or pickling the results.
+
+    Threads only decode in parallel on free-threaded builds of Python, so by
+    default one thread is used per CPU on those, and everything is decoded
+    in the calling thread otherwise. An existing `executor` can be passed
+    to reuse its threads, in which case `workers` only sets how many chunks
+    are decoded at once. The buffer must not be modified until decoding
+    has finished.
+    """
+    if workers is None:
+        if executor is None and gil_enabled():
+            workers = 1
+        else:
+            workers = os.cpu_count() or 1
+
+    if chunk_size is None:
+        chunk_size = max(
+            MIN_CHUNK_SIZE, min(DEFAULT_CHUNK_SIZE, len(buffer) // (workers * 4))
+        )
+
+    chunks = split_chunks(buffer, chunk_size)
+
+    if (workers == 1 and executor is None) or len(chunks) <= 1:
+        for start, end in chunks:
+            yield from _decode_buffer(
+                buffer, start, end, incoming_msb, ignore_unknown, ignore_invalid
+            )
+        return
+
+    arguments = (
+        (buffer, start, end, incoming_msb, ignore_unknown, ignore_invalid)
+        for start, end in chunks
+    )
+
+    if executor is not None:
+        yield from _map_in_order(executor, _decode_buffer, arguments, workers * 2)
+        return
+
+    with ThreadPoolExecutor(workers, thread_name_prefix="gdl90py-decode") as executor:
+        yield from _map_in_order(executor, _decode_buffer, arguments, workers * 2)
+
+
+def _map_in_order(
+    executor: Executor,
+    function: Callable[..., list[BaseMessage]],
+    arguments: Iterable[tuple],
+    window: int,
+) -> Iterator[BaseMessage]:
+    """
+    Call `function` with each set of arguments in the executor, and yield
+    the messages from each call in order. Only `window` calls are in flight
+    at once, so results do not pile up faster than they are consumed.
+    """
+    pending: collections.deque[Future[list[BaseMessage]]] = collections.deque()
+    arguments = iter(arguments)
+
+    def submit() -> None:
+        for args in arguments:
+            pending.append(executor.submit(function, *args))
+            break
+
+    for _ in range(window):
+        submit()
+
+    try:
+        while pending:
+            messages = pending.popleft().result()
+            submit()
+            yield from messages
+    finally:
+        for future in pending:
+            future.cancel()
@@ -1,6 +1,17 @@
 import gdl90py.utils.gdl90
+import mmap
+import re
 import typing
-from gdl90py.exceptions import UnkownMessageID
+from collections.abc import Iterator
+from gdl90py.exceptions import (
+    DataTooLong,
+    DataTooShort,
+    InvalidCRC,
+    InvalidMessageID,
+    MalformedEscape,
+    MissingFlagBytes,
+    UnkownMessageID,
+)
 from gdl90py.messages._base_message import BaseMessage
 from gdl90py.messages.basic_uat_report import BasicUATReportMessage
 from gdl90py.messages.foreflight_ahrs import ForeFlightAHRSMessage
@@ -13,6 +24,9 @@ from gdl90py.messages.ownship_geometric_altitude import OwnshipGeometricAltitude
 from gdl90py.messages.ownship_report import OwnshipReportMessage
 from gdl90py.messages.traffic_report import TrafficReportMessage
 from gdl90py.messages.uplink_data import UplinkDataMessage
+from gdl90py.utils.bitarray import BIT_REVERSAL_TABLE
+
+MessageIDs = tuple[int, ...]
 
 KNOWN_MESSAGE_TYPES: dict[tuple[int, ...], typing.Type[BaseMessage]] = {
     msg.MESSAGE_IDS: msg
@@ -31,14 +45,53 @@ KNOWN_MESSAGE_TYPES: dict[tuple[int, ...], typing.Type[BaseMessage]] = {
     ]
 }
 
+INVALID_FRAME_EXCEPTIONS = (
+    DataTooLong,
+    DataTooShort,
+    InvalidCRC,
+    InvalidMessageID,
+    MalformedEscape,
+    MissingFlagBytes,
+)
+"""
+Exceptions raised for frames that can not be decoded.
+"""
+
+UNDECODABLE_FRAME_EXCEPTIONS = (*INVALID_FRAME_EXCEPTIONS, UnkownMessageID, ValueError)
+"""
+Exceptions `parse_message` raises for frames that can not be decoded, also
+including unknown message IDs, and ValueError for fields with unknown enum
+values.
+"""
+
+_FLAG_BYTE_PATTERN = re.escape(bytes((gdl90py.utils.gdl90.FLAG_BYTE,)))
+_FRAME_PATTERN = re.compile(
+    b"%b[^%b]+%b" % (_FLAG_BYTE_PATTERN, _FLAG_BYTE_PATTERN, _FLAG_BYTE_PATTERN)
+)
+"""
+A flag byte, then at least one byte that is not a flag byte, then a flag byte.
+"""
+# first bytes of a frame that are not simply the message ID
+_SPECIAL_MESSAGE_ID_BYTES = frozenset(
+    (
+        gdl90py.utils.gdl90.FLAG_BYTE,
+        gdl90py.utils.gdl90.CONTROL_ESCAPE_BYTE,
+        gdl90py.utils.gdl90.FOREFLIGHT_MESSAGE_ID,
+    )
+)
+
 
 def parse_message(
-    data: bytes, incoming_msb: bool = True, ignore_unknown: bool = False
+    data: bytes | bytearray | memoryview,
+    incoming_msb: bool = True,
+    ignore_unknown: bool = False,
 ) -> BaseMessage | None:
     """
     Given a single message, parse and return a data class.
     """
-    message_ids, message_data = gdl90py.utils.gdl90.deconstruct(data, incoming_msb)
+    message_ids, message_data = gdl90py.utils.gdl90.deconstruct_bytes(
+        data, incoming_msb
+    )
     if message_ids not in KNOWN_MESSAGE_TYPES:
         # skip if asked to ignore
         if ignore_unknown:
@@ -46,7 +99,7 @@ def parse_message(
 
         raise UnkownMessageID(f"Unknown message ID(s) {message_ids}.")
 
-    return KNOWN_MESSAGE_TYPES[message_ids].deserialize(message_data)
+    return KNOWN_MESSAGE_TYPES[message_ids].unpack(message_data)
 
 
 def parse_messages(
@@ -56,20 +109,237 @@ def parse_messages(
     Given multiple possible messages, parse and return a list of data classes.
     `incoming_msb` should be set to True if the bytes provided have the Most
     Signficiant Bit first.
+
+    An incomplete frame at the end is ignored. For streams, where frames can
+    be split across reads, use a `FrameDecoder` instead.
+    """
+    return list(FrameDecoder(incoming_msb, ignore_unknown).feed(data))
+
+
+def iter_frames(
+    buffer: bytes | bytearray | memoryview | mmap.mmap,
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[tuple[int, int]]:
+    """
+    Find the frames in a buffer without copying or decoding anything, and
+    yield the `(offset, length)` of each one, including its flag bytes.
+    Any of the frames can then be decoded with `parse_message`.
+
+    The buffer can be anything supporting the buffer protocol, such as an
+    `mmap.mmap` of a large capture file. Bytes between frames are skipped.
+    As frames are not decoded, no checks are done on their contents.
     """
-    flag_byte_count = data.count(gdl90py.utils.gdl90.FLAG_BYTE)
-    message_count = int(flag_byte_count / 2)
+    if end is None:
+        end = len(buffer)
+
+    for match in _FRAME_PATTERN.finditer(buffer, start, end):
+        offset = match.start()
+        yield offset, match.end() - offset
+
+
+def iter_frame_views(
+    buffer: bytes | bytearray | memoryview | mmap.mmap,
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[memoryview]:
+    """
+    Same as `iter_frames`, but yields a `memoryview` of each frame instead.
+
+    The views keep the buffer exported, so a `bytearray` can not be resized
+    or an `mmap.mmap` closed until they have been released.
+    """
+    view = memoryview(buffer)
+    for offset, length in iter_frames(buffer, start, end):
+        yield view[offset : offset + length]
+
+
+def frame_message_ids(
+    frame: bytes | bytearray | memoryview, incoming_msb: bool = True
+) -> MessageIDs:
+    """
+    Return the message ID(s) of a raw frame, without decoding the rest of it
+    or checking its CRC.
+    """
+    message_id = frame[1]
+    if not incoming_msb:
+        message_id = BIT_REVERSAL_TABLE[message_id]
+    if message_id not in _SPECIAL_MESSAGE_ID_BYTES:
+        return (message_id,)
+
+    # enough for an escaped message ID and sub ID
+    head = bytes(frame[1:5])
+    if not incoming_msb:
+        head = head.translate(BIT_REVERSAL_TABLE)
+
+    message_ids: list[int] = []
+    escaped = False
+    for byte in head:
+        if byte == gdl90py.utils.gdl90.FLAG_BYTE or len(message_ids) == 2:
+            break
+        if byte == gdl90py.utils.gdl90.CONTROL_ESCAPE_BYTE:
+            escaped = True
+            continue
+        if escaped:
+            byte ^= gdl90py.utils.gdl90.ESCAPE_XOR_BYTE
+            escaped = False
+        message_ids.append(byte)
+
+    if not message_ids:
+        raise InvalidMessageID("Frame has no message ID")
+
+    if message_ids[0] == gdl90py.utils.gdl90.FOREFLIGHT_MESSAGE_ID:
+        return tuple(message_ids)
+    return (message_ids[0],)
+
+
+def pack_message_ids(message_ids: MessageIDs) -> tuple[int, int]:
+    """
+    Return the message ID and sub ID (0 if there is none), for storing
+    message ID(s) in fixed-width records.
+    """
+    return message_ids[0], message_ids[1] if len(message_ids) > 1 else 0
+
+
+def unpack_message_ids(message_id: int, sub_id: int) -> MessageIDs:
+    """
+    Reverse of `pack_message_ids`.
+    """
+    if message_id == gdl90py.utils.gdl90.FOREFLIGHT_MESSAGE_ID:
+        return (message_id, sub_id)
+    return (message_id,)
+
+
+class FrameDecoder:
+    """
+    Incrementally decode messages from a stream of bytes, such as
+    UDP datagrams or serial reads. Messages may be split across any number
+    of chunks; a partial trailing frame is kept until the rest of it arrives.
+
+    Any bytes before the first flag byte are discarded, which allows decoding
+    to start in the middle of a stream. If a malformed message raises an
+    exception, the decoder has already moved past it, so decoding resumes
+    with the next call to `feed`.
+    """
+
+    MAX_FRAME_SIZE = 4096
+    """
+    Maximum number of bytes (including flag bytes) a partial frame may grow to
+    before it is assumed to be garbage and dropped.
+    """
+
+    def __init__(self, incoming_msb: bool = True, ignore_unknown: bool = False) -> None:
+        self.incoming_msb = incoming_msb
+        self.ignore_unknown = ignore_unknown
+
+        self._buffer = bytearray()
+        # index of the flag byte that opened the current frame, or -1 if
+        # we are still looking for one
+        self._start = -1
+        # index to resume searching for a flag byte from
+        self._scan = 0
+
+    def feed(self, chunk: bytes | bytearray | memoryview) -> Iterator[BaseMessage]:
+        """
+        Add a chunk of bytes to the stream and return an iterator
+        of the messages that are now complete.
+        """
+        self._buffer += chunk
+        return self._drain()
+
+    def feed_skip_invalid(
+        self, chunk: bytes | bytearray | memoryview
+    ) -> tuple[list[BaseMessage], int]:
+        """
+        Same as `feed`, but decodes everything that is now complete, skipping
+        frames that can not be decoded instead of raising an exception.
+        Returns the messages and the number of frames skipped.
+        """
+        messages = []
+        invalid = 0
+        iterator = self.feed(chunk)
+
+        while True:
+            try:
+                messages.extend(iterator)
+                return messages, invalid
+            except UNDECODABLE_FRAME_EXCEPTIONS:
+                # already moved past the bad frame
+                invalid += 1
+                iterator = self._drain()
+
+    def reset(self) -> None:
+        """
+        Discard any buffered partial frame.
+        """
+        self._buffer.clear()
+        self._start = -1
+        self._scan = 0
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of bytes buffered waiting for the rest of a frame.
+        """
+        return len(self._buffer)
+
+    def _drain(self) -> Iterator[BaseMessage]:
+        buffer = self._buffer
+
+        try:
+            while True:
+                if self._start < 0:
+                    start = buffer.find(gdl90py.utils.gdl90.FLAG_BYTE, self._scan)
+                    if start < 0:
+                        # nothing but garbage
+                        self._scan = len(buffer)
+                        return
+                    self._start = start
+                    self._scan = start + 1
+
+                end = buffer.find(gdl90py.utils.gdl90.FLAG_BYTE, self._scan)
+                if end < 0:
+                    self._scan = len(buffer)
+                    if self._scan - self._start > self.MAX_FRAME_SIZE:
+                        # no closing flag byte in sight, start over
+                        self._start = -1
+                    return
+
+                start = self._start
+                if end == start + 1:
+                    # back-to-back flag bytes. This happens when joining a stream
+                    # partway through, so the second one opens the next frame
+                    self._start = end
+                    self._scan = end + 1
+                    continue
+
+                # move past the frame before parsing, so a malformed
+                # message does not get stuck in the buffer
+                self._start = -1
+                self._scan = end + 1
 
-    output: list[BaseMessage] = []
+                try:
+                    msg = parse_message(
+                        buffer[start : end + 1], self.incoming_msb, self.ignore_unknown
+                    )
+                except (InvalidCRC, MalformedEscape):
+                    # likely not a real frame, so the closing flag byte
+                    # may actually be the start of the next one
+                    self._start = end
+                    raise
 
-    for _ in range(message_count):
-        # find the next flag byte. offset by one to skip the first one
-        message_end_index = data.index(gdl90py.utils.gdl90.FLAG_BYTE, 1)
-        # parse the message
-        msg = parse_message(data[: message_end_index + 1], incoming_msb, ignore_unknown)
-        if msg is not None:
-            output.append(msg)
-        # slice the parsed data off
-        data = data[message_end_index + 1 :]
+                if msg is not None:
+                    yield msg
+        finally:
+            self._compact()
 
-    return output
+    def _compact(self) -> None:
+        """
+        Drop bytes that have already been consumed from the front of the buffer.
+        """
+        consumed = self._scan if self._start < 0 else self._start
+        if consumed:
+            del self._buffer[:consumed]
+            self._scan -= consumed
+            if self._start >= 0:
+                self._start -= consumed
@@ -0,0 +1,411 @@
+"""
+Read messages from pcap and pcapng packet captures, such as those made by
+tcpdump or Wireshark, without loading the whole capture into memory.
+"""
+
+import io
+import mmap
+import os
+import struct
+import typing
+from collections.abc import Callable, Iterator
+
+from gdl90py.exceptions import InvalidCapture
+from gdl90py.messages._base_message import BaseMessage
+from gdl90py.parser import (
+    UNDECODABLE_FRAME_EXCEPTIONS,
+    iter_frame_views,
+    parse_message,
+)
+from gdl90py.utils.gdl90 import DEFAULT_PORT
+
+Reader = Callable[[int], bytes | memoryview]
+"""
+Function returning up to the given number of bytes from the capture.
+"""
+
+PCAP_MAGIC_MICROSECONDS = 0xA1B2C3D4
+PCAP_MAGIC_NANOSECONDS = 0xA1B23C4D
+PCAPNG_SECTION_HEADER_BLOCK = 0x0A0D0D0A
+PCAPNG_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+PCAPNG_INTERFACE_DESCRIPTION_BLOCK = 0x00000001
+PCAPNG_ENHANCED_PACKET_BLOCK = 0x00000006
+
+PCAPNG_OPTION_END = 0
+PCAPNG_OPTION_IF_TSRESOL = 9
+PCAPNG_OPTION_IF_TSOFFSET = 14
+
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LOOP = 108
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_IPV4 = 228
+LINKTYPE_IPV6 = 229
+LINKTYPE_LINUX_SLL2 = 276
+
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_IPV6 = 0x86DD
+ETHERTYPE_VLAN = (0x8100, 0x88A8, 0x9100)
+
+IP_PROTOCOL_UDP = 17
+# IPv6 extension headers that can be skipped over to find the UDP header
+IPV6_EXTENSION_HEADERS = (0, 43, 60)
+
+
+def iter_udp_payloads(
+    read: Reader, port: int | None = DEFAULT_PORT
+) -> Iterator[tuple[float, memoryview]]:
+    """
+    Walk the packet records of a pcap or pcapng capture, and yield the capture
+    timestamp (in seconds since the epoch) and payload of each UDP datagram
+    sent from or to `port`. Set `port` to None to get every UDP datagram.
+
+    Fragmented and truncated datagrams are skipped, as are packets from pcapng
+    Simple Packet Blocks, which have no timestamp.
+    """
+    magic = read(4)
+    if len(magic) < 4:
+        return
+
+    if bytes(magic) == PCAPNG_SECTION_HEADER_BLOCK.to_bytes(4, "big"):
+        packets = _iter_pcapng_packets(read, magic)
+    else:
+        packets = _iter_pcap_packets(read, magic)
+
+    for timestamp, link_type, data in packets:
+        payload = _udp_payload(link_type, memoryview(data), port)
+        if payload is not None:
+            yield timestamp, payload
+
+
+def _iter_pcap_packets(
+    read: Reader, magic: bytes | memoryview
+) -> Iterator[tuple[float, int, bytes | memoryview]]:
+    for byteorder in ("<", ">"):
+        (value,) = struct.unpack(byteorder + "I", magic)
+        if value in (PCAP_MAGIC_MICROSECONDS, PCAP_MAGIC_NANOSECONDS):
+            break
+    else:
+        raise InvalidCapture("Not a pcap or pcapng capture")
+
+    resolution = 1e-6 if value == PCAP_MAGIC_MICROSECONDS else 1e-9
+
+    header = read(20)
+    if len(header) < 20:
+        raise InvalidCapture("Truncated pcap header")
+    # version, time zone, timestamp accuracy, snapshot length, link type
+    link_type = struct.unpack(byteorder + "HHiIII", header)[5] & 0xFFFF
+
+    record_header = struct.Struct(byteorder + "IIII")
+    while True:
+        header = read(record_header.size)
+        if len(header) < record_header.size:
+            # a capture cut off mid-record ends there
+            return
+
+        seconds, fraction, captured_length, _ = record_header.unpack(header)
+        data = read(captured_length)
+        if len(data) < captured_length:
+            return
+
+        yield seconds + fraction * resolution, link_type, data
+
+
+def _iter_pcapng_packets(
+    read: Reader, block_type: bytes | memoryview | None
+) -> Iterator[tuple[float, int, bytes | memoryview]]:
+    byteorder = "<"
+    # (link type, timestamp resolution, timestamp offset) of each interface
+    # in the current section
+    interfaces: list[tuple[int, float, int]] = []
+
+    while True:
+        if block_type is None:
+            block_type = read(4)
+            if len(block_type) < 4:
+                return
+
+        length_data = read(4)
+        if len(length_data) < 4:
+            return
+
+        if bytes(block_type) == PCAPNG_SECTION_HEADER_BLOCK.to_bytes(4, "big"):
+            # the byte order can change with each section
+            magic = read(4)
+            if len(magic) < 4:
+                return
+            for byteorder in ("<", ">"):
+                if struct.unpack(byteorder + "I", magic)[0] == PCAPNG_BYTE_ORDER_MAGIC:
+                    break
+            else:
+                raise InvalidCapture("Invalid pcapng byte order magic")
+
+            (length,) = struct.unpack(byteorder + "I", length_data)
+            if length < 12 or length % 4:
+                raise InvalidCapture(f"Invalid pcapng block length {length}")
+            body = read(length - 12)
+            if len(body) < length - 12:
+                return
+
+            interfaces.clear()
+            block_type = None
+            continue
+
+        (value,) = struct.unpack(byteorder + "I", block_type)
+        (length,) = struct.unpack(byteorder + "I", length_data)
+        if length < 12 or length % 4:
+            raise InvalidCapture(f"Invalid pcapng block length {length}")
+
+        # rest of the block, including the trailing length
+        body = read(length - 8)
+        if len(body) < length - 8:
+            return
+        block_type = None
+
+        if value == PCAPNG_INTERFACE_DESCRIPTION_BLOCK:
+            interfaces.append(_read_interface(byteorder, body))
+
+        elif value == PCAPNG_ENHANCED_PACKET_BLOCK and len(body) >= 20:
+            interface, high, low, captured_length = struct.unpack_from(
+                byteorder + "IIII", body
+            )
+            if interface >= len(interfaces):
+                raise InvalidCapture(f"Packet from undescribed interface {interface}")
+
+            link_type, resolution, offset = interfaces[interface]
+            timestamp = ((high << 32) | low) * resolution + offset
+            yield timestamp, link_type, body[20 : 20 + captured_length]
+
+
+def _read_interface(byteorder: str, body: bytes | memoryview) -> tuple[int, float, int]:
+    """
+    Return the link type, timestamp resolution and timestamp offset
+    of an Interface Description Block.
+    """
+    link_type = struct.unpack_from(byteorder + "H", body)[0]
+    resolution = 1e-6
+    offset = 0
+
+    # options follow the link type, reserved and snapshot length fields,
+    # and stop before the trailing block length
+    position = 8
+    while position + 4 <= len(body) - 4:
+        code, length = struct.unpack_from(byteorder + "HH", body, position)
+        value = body[position + 4 : position + 4 + length]
+        if code == PCAPNG_OPTION_END:
+            break
+        elif code == PCAPNG_OPTION_IF_TSRESOL and length >= 1:
+            # most significant bit set means a power of 2, else a power of 10
+            exponent = value[0] & 0x7F
+            resolution = 2**-exponent if value[0] & 0x80 else 10**-exponent
+        elif code == PCAPNG_OPTION_IF_TSOFFSET and length >= 8:
+            offset = struct.unpack_from(byteorder + "q", value)[0]
+
+        # options are padded to 4 bytes
+        position += 4 + (length + 3) // 4 * 4
+
+    return link_type, resolution, offset
+
+
+def _udp_payload(
+    link_type: int, data: memoryview, port: int | None
+) -> memoryview | None:
+    """
+    Return the payload of a UDP datagram from or to `port`,
+    or None if the packet is anything else.
+    """
+    packet = _ip_packet(link_type, data)
+    if packet is None or len(packet) < 1:
+        return None
+
+    version = packet[0] >> 4
+    if version == 4:
+        if len(packet) < 20:
+            return None
+        header_length = (packet[0] & 0x0F) * 4
+        flags_fragment = int.from_bytes(packet[6:8], "big")
+        # more fragments flag, or a fragment offset
+        if (
+            header_length < 20
+            or packet[9] != IP_PROTOCOL_UDP
+            or flags_fragment & 0x3FFF
+        ):
+            return None
+        udp = packet[header_length:]
+
+    elif version == 6:
+        if len(packet) < 40:
+            return None
+        next_header = packet[6]
+        position = 40
+        while next_header in IPV6_EXTENSION_HEADERS and position + 2 <= len(packet):
+            next_header = packet[position]
+            position += (packet[position + 1] + 1) * 8
+        if next_header != IP_PROTOCOL_UDP:
+            return None
+        udp = packet[position:]
+
+    else:
+        return None
+
+    if len(udp) < 8:
+        return None
+
+    source_port, destination_port, length = struct.unpack_from(">HHH", udp)
+    if port is not None and port not in (source_port, destination_port):
+        return None
+
+    # skip truncated datagrams
+    if length < 8 or length > len(udp):
+        return None
+
+    return udp[8:length]
+
+
+def _ip_packet(link_type: int, data: memoryview) -> memoryview | None:
+    """
+    Strip the link layer header, returning the IP packet
+    or None if the packet is not IP.
+    """
+    if link_type == LINKTYPE_ETHERNET:
+        position = 12
+        ethertype = int.from_bytes(data[position : position + 2], "big")
+        while ethertype in ETHERTYPE_VLAN:
+            position += 4
+            ethertype = int.from_bytes(data[position : position + 2], "big")
+        position += 2
+
+    elif link_type in (LINKTYPE_NULL, LINKTYPE_LOOP):
+        # address family, in the capturing machine's byte order for NULL.
+        # Either way, the IP version is in the packet itself
+        return data[4:]
+
+    elif link_type in (LINKTYPE_RAW, LINKTYPE_IPV4, LINKTYPE_IPV6):
+        return data
+
+    elif link_type == LINKTYPE_LINUX_SLL:
+        ethertype = int.from_bytes(data[14:16], "big")
+        position = 16
+
+    elif link_type == LINKTYPE_LINUX_SLL2:
+        ethertype = int.from_bytes(data[0:2], "big")
+        position = 20
+
+    else:
+        return None
+
+    if ethertype not in (ETHERTYPE_IPV4, ETHERTYPE_IPV6):
+        return None
+
+    return data[position:]
+
+
+class PcapReader:
+    """
+    Read GDL90 messages from a pcap or pcapng capture of UDP traffic.
+    Iterate over it to get the capture timestamp (in seconds since the epoch)
+    and each message, in the order they were captured. Example:
+
+    ```python
+    with PcapReader("capture.pcapng") as reader:
+        for timestamp, message in reader:
+            print(timestamp, message)
+    ```
+
+    Files are memory-mapped when possible, so only the pages being read are
+    in memory. Otherwise, such as for a pipe, the capture is read one record
+    at a time.
+
+    Only datagrams from or to `port` are decoded; set it to None to decode
+    every UDP datagram. Frames that can not be decoded are counted in
+    `invalid` instead of raising an exception.
+    """
+
+    def __init__(
+        self,
+        source: str | os.PathLike | typing.BinaryIO,
+        port: int | None = DEFAULT_PORT,
+        incoming_msb: bool = True,
+        ignore_unknown: bool = False,
+    ) -> None:
+        self.port = port
+        self.incoming_msb = incoming_msb
+        self.ignore_unknown = ignore_unknown
+        self.invalid = 0
+
+        if isinstance(source, (str, os.PathLike)):
+            self._file: typing.BinaryIO = open(
+                typing.cast("str | os.PathLike[str]", source), "rb"
+            )
+            self._owns_file = True
+        else:
+            self._file = source
+            self._owns_file = False
+
+        self._mmap: mmap.mmap | None = None
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            # not a regular file, or an empty one
+            pass
+        else:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+
+    def _reader(self) -> Reader:
+        if self._mmap is None:
+            return self._file.read
+
+        view = memoryview(self._mmap)
+        position = 0
+
+        def read(size: int) -> memoryview:
+            nonlocal position
+            data = view[position : position + size]
+            position += len(data)
+            return data
+
+        return read
+
+    def payloads(self) -> Iterator[tuple[float, memoryview]]:
+        """
+        Yield the capture timestamp and raw payload of each datagram,
+        without decoding it.
+        """
+        return iter_udp_payloads(self._reader(), self.port)
+
+    def __iter__(self) -> Iterator[tuple[float, BaseMessage]]:
+        for timestamp, payload in self.payloads():
+            for frame in iter_frame_views(payload):
+                try:
+                    message = parse_message(
+                        frame, self.incoming_msb, self.ignore_unknown
+                    )
+                except UNDECODABLE_FRAME_EXCEPTIONS:
+                    self.invalid += 1
+                    continue
+
+                if message is not None:
+                    yield timestamp, message
+
+    def close(self) -> None:
+        """
+        Close the capture.
+        """
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # an unfinished iteration still has a view of it,
+                # so leave it to be closed once that is gone
+                pass
+            self._mmap = None
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> "PcapReader":
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
@@ -0,0 +1,455 @@
+"""
+Record streams of messages to a file with receive timestamps, and read them
+back by time range and message type without decoding the whole recording.
+
+A recording is made up of:
+- A header, with the bit order of the frames.
+- Records, each with a receive timestamp, the message ID(s) and the raw frame,
+  in the order they were received.
+- An index, written when the recording is closed. It holds the offset of the
+  first record in each `index_interval` of time, overall and for each message
+  type, plus the number of records of each message type.
+- A footer, pointing to the index.
+
+Recordings that were never closed have no index, so it is rebuilt by scanning
+the records when they are opened.
+"""
+
+import bisect
+import mmap
+import os
+import struct
+import time
+import typing
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+from gdl90py.exceptions import InvalidRecording
+from gdl90py.messages._base_message import BaseMessage
+from gdl90py.parser import (
+    MessageIDs,
+    frame_message_ids,
+    pack_message_ids,
+    parse_message,
+    unpack_message_ids,
+)
+
+MAGIC = b"GDL90REC"
+FOOTER_MAGIC = b"GDL90IDX"
+VERSION = 1
+
+FLAG_LSB = 0x01
+"""
+Header flag set when frames were stored with the Least Significant Bit first.
+"""
+
+_HEADER = struct.Struct("<8sBBH")
+# timestamp in nanoseconds since the epoch, message ID, ForeFlight sub ID,
+# frame length
+_RECORD = struct.Struct("<qBBH")
+_INDEX_ENTRY = struct.Struct("<qQ")
+_INTERVAL = struct.Struct("<Q")
+_COUNT = struct.Struct("<I")
+_TYPE = struct.Struct("<BBI")
+# index offset, magic
+_FOOTER = struct.Struct("<Q8s")
+
+
+@dataclass(frozen=True)
+class Record:
+    timestamp: float
+    """
+    Receive time, in seconds since the epoch.
+    """
+    message_ids: MessageIDs
+    frame: bytes | memoryview
+    """
+    Raw frame, including flag bytes, as it was received.
+    """
+
+
+class _Index:
+    """
+    Sparse time index of the records, overall and for each message type.
+    """
+
+    def __init__(self, interval: int) -> None:
+        # in nanoseconds
+        self.interval = interval
+        # (timestamp, offset) of the first record in each interval
+        self.entries: list[tuple[int, int]] = []
+        self.type_entries: dict[MessageIDs, list[tuple[int, int]]] = {}
+        self.counts: dict[MessageIDs, int] = {}
+
+        self._last_bucket: int | None = None
+        self._last_type_buckets: dict[MessageIDs, int] = {}
+
+    def add(self, timestamp: int, message_ids: MessageIDs, offset: int) -> None:
+        bucket = timestamp // self.interval
+        if bucket != self._last_bucket:
+            self.entries.append((timestamp, offset))
+            self._last_bucket = bucket
+
+        if bucket != self._last_type_buckets.get(message_ids):
+            self.type_entries.setdefault(message_ids, []).append((timestamp, offset))
+            self._last_type_buckets[message_ids] = bucket
+
+        self.counts[message_ids] = self.counts.get(message_ids, 0) + 1
+
+    def start_offset(
+        self, entries: list[tuple[int, int]], timestamp: int | None, default: int
+    ) -> int:
+        """
+        Offset to start scanning `entries` from, to find every record
+        at or after `timestamp`.
+        """
+        if timestamp is None or not entries:
+            return entries[0][1] if entries else default
+
+        position = bisect.bisect_right(entries, timestamp, key=lambda entry: entry[0])
+        return entries[max(position - 1, 0)][1]
+
+    def pack(self) -> bytes:
+        data = [_INTERVAL.pack(self.interval), _COUNT.pack(len(self.entries))]
+        data += [_INDEX_ENTRY.pack(*entry) for entry in self.entries]
+
+        data.append(_COUNT.pack(len(self.counts)))
+        for message_ids, count in self.counts.items():
+            entries = self.type_entries[message_ids]
+            data.append(_TYPE.pack(*pack_message_ids(message_ids), count))
+            data.append(_COUNT.pack(len(entries)))
+            data += [_INDEX_ENTRY.pack(*entry) for entry in entries]
+
+        return b"".join(data)
+
+    @classmethod
+    def unpack(cls, data: bytes | memoryview) -> "_Index":
+        position = 0
+
+        def read(structure: struct.Struct) -> tuple:
+            nonlocal position
+            values = structure.unpack_from(data, position)
+            position += structure.size
+            return values
+
+        def read_entries() -> list[tuple[int, int]]:
+            (count,) = read(_COUNT)
+            return [read(_INDEX_ENTRY) for _ in range(count)]
+
+        (interval,) = read(_INTERVAL)
+        index = cls(interval)
+        index.entries = read_entries()
+
+        (types,) = read(_COUNT)
+        for _ in range(types):
+            message_id, sub_id, count = read(_TYPE)
+            message_ids = unpack_message_ids(message_id, sub_id)
+            index.counts[message_ids] = count
+            index.type_entries[message_ids] = read_entries()
+
+        return index
+
+
+class RecordingWriter:
+    """
+    Write frames to a new recording. Example:
+
+    ```python
+    with RecordingWriter("flight.gdl90rec") as writer:
+        for datagram in datagrams:
+            for frame in iter_frame_views(datagram):
+                writer.write(frame)
+    ```
+
+    Set `incoming_msb` to match the bit order of the frames being written.
+    Frames are stamped with the time they are written, unless a timestamp
+    (in seconds since the epoch) is given. The time is taken from a monotonic
+    clock, so it never goes backwards even if the system clock is changed.
+    """
+
+    def __init__(
+        self,
+        destination: str | os.PathLike[str] | typing.BinaryIO,
+        incoming_msb: bool = True,
+        index_interval: float = 1.0,
+    ) -> None:
+        if isinstance(destination, (str, os.PathLike)):
+            self._file: typing.BinaryIO = open(
+                typing.cast("str | os.PathLike[str]", destination), "wb"
+            )
+            self._owns_file = True
+        else:
+            self._file = destination
+            self._owns_file = False
+
+        self.incoming_msb = incoming_msb
+        self._index = _Index(max(1, round(index_interval * 1e9)))
+        # map the monotonic clock onto the system clock once
+        self._epoch = time.time_ns() - time.monotonic_ns()
+        self._last_timestamp = -(2**63)
+        self._closed = False
+
+        flags = 0 if incoming_msb else FLAG_LSB
+        self._file.write(_HEADER.pack(MAGIC, VERSION, flags, 0))
+        self._offset = _HEADER.size
+
+    def write(
+        self, frame: bytes | bytearray | memoryview, timestamp: float | None = None
+    ) -> None:
+        """
+        Write a raw frame, including flag bytes.
+        """
+        if timestamp is None:
+            nanoseconds = self._epoch + time.monotonic_ns()
+        else:
+            nanoseconds = round(timestamp * 1e9)
+
+        if nanoseconds < self._last_timestamp:
+            raise ValueError("Timestamps must not go backwards")
+        if len(frame) > 0xFFFF:
+            raise ValueError(f"Frame of {len(frame)} bytes is too long to record")
+
+        message_ids = frame_message_ids(frame, self.incoming_msb)
+        self._index.add(nanoseconds, message_ids, self._offset)
+        self._last_timestamp = nanoseconds
+
+        self._file.write(
+            _RECORD.pack(nanoseconds, *pack_message_ids(message_ids), len(frame))
+        )
+        self._file.write(frame)
+        self._offset += _RECORD.size + len(frame)
+
+    def write_message(
+        self, message: BaseMessage, timestamp: float | None = None
+    ) -> None:
+        """
+        Serialize and write a message.
+        """
+        self.write(message.serialize(outgoing_lsb=not self.incoming_msb), timestamp)
+
+    def close(self) -> None:
+        """
+        Write the index and close the recording.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        self._file.write(self._index.pack())
+        self._file.write(_FOOTER.pack(self._offset, FOOTER_MAGIC))
+        self._file.flush()
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> "RecordingWriter":
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+
+class RecordingReader:
+    """
+    Read a recording. Example, decoding all traffic between 14:02 and 14:05:
+
+    ```python
+    with RecordingReader("flight.gdl90rec") as reader:
+        for timestamp, message in reader.messages(
+            start=datetime(2024, 6, 1, 14, 2).timestamp(),
+            end=datetime(2024, 6, 1, 14, 5).timestamp(),
+            message_types=[TrafficReportMessage],
+        ):
+            print(timestamp, message)
+    ```
+
+    The index is used to start reading at the first record in the time range,
+    and records of other message types are skipped without being decoded.
+    """
+
+    def __init__(
+        self,
+        source: str | os.PathLike[str] | typing.BinaryIO,
+        index_interval: float = 1.0,
+    ) -> None:
+        if isinstance(source, (str, os.PathLike)):
+            self._file: typing.BinaryIO = open(
+                typing.cast("str | os.PathLike[str]", source), "rb"
+            )
+            self._owns_file = True
+        else:
+            self._file = source
+            self._owns_file = False
+
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise InvalidRecording("Recording is empty") from None
+        self._view = memoryview(self._mmap)
+
+        if len(self._view) < _HEADER.size:
+            raise InvalidRecording("Recording is too short")
+
+        magic, version, flags, _ = _HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            raise InvalidRecording("Not a recording")
+        if version != VERSION:
+            raise InvalidRecording(f"Unsupported recording version {version}")
+
+        self.incoming_msb = not flags & FLAG_LSB
+
+        index, self._end = self._read_index()
+        if index is None:
+            index, self._end = self._rebuild_index(max(1, round(index_interval * 1e9)))
+        self._index = index
+
+    def _read_index(self) -> tuple[_Index | None, int]:
+        if len(self._view) < _HEADER.size + _FOOTER.size:
+            return None, 0
+
+        index_offset, magic = _FOOTER.unpack_from(
+            self._view, len(self._view) - _FOOTER.size
+        )
+        if magic != FOOTER_MAGIC or index_offset > len(self._view) - _FOOTER.size:
+            return None, 0
+
+        index = _Index.unpack(self._view[index_offset : -_FOOTER.size])
+        return index, index_offset
+
+    def _rebuild_index(self, interval: int) -> tuple[_Index, int]:
+        index = _Index(interval)
+        offset = _HEADER.size
+        end = len(self._view)
+
+        while offset + _RECORD.size <= end:
+            timestamp, message_id, sub_id, length = _RECORD.unpack_from(
+                self._view, offset
+            )
+            if offset + _RECORD.size + length > end:
+                # cut off while writing
+                break
+
+            index.add(timestamp, unpack_message_ids(message_id, sub_id), offset)
+            offset += _RECORD.size + length
+
+        return index, offset
+
+    @property
+    def message_counts(self) -> dict[MessageIDs, int]:
+        """
+        Number of records of each message type, keyed by message ID(s).
+        """
+        return dict(self._index.counts)
+
+    @property
+    def start_time(self) -> float | None:
+        """
+        Timestamp of the first record, or None if there are none.
+        """
+        if not self._index.entries:
+            return None
+        return self._index.entries[0][0] / 1e9
+
+    def records(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        message_types: Iterable[type[BaseMessage] | MessageIDs] | None = None,
+    ) -> Iterator[Record]:
+        """
+        Yield the records received from `start` up to and including `end`
+        (in seconds since the epoch), optionally only of the given message
+        classes or message ID(s). The frames are views of the recording,
+        so are only valid until it is closed.
+        """
+        start_ns = None if start is None else round(start * 1e9)
+        end_ns = None if end is None else round(end * 1e9)
+
+        if message_types is None:
+            wanted = None
+            offset = self._index.start_offset(self._index.entries, start_ns, self._end)
+        else:
+            wanted = {
+                message_type
+                if isinstance(message_type, tuple)
+                else message_type.MESSAGE_IDS
+                for message_type in message_types
+            }
+            offset = min(
+                (
+                    self._index.start_offset(
+                        self._index.type_entries[message_ids], start_ns, self._end
+                    )
+                    for message_ids in wanted
+                    if message_ids in self._index.type_entries
+                ),
+                default=self._end,
+            )
+
+        view = self._view
+        while offset < self._end:
+            timestamp, message_id, sub_id, length = _RECORD.unpack_from(view, offset)
+            if end_ns is not None and timestamp > end_ns:
+                return
+
+            frame_offset = offset + _RECORD.size
+            offset = frame_offset + length
+
+            if start_ns is not None and timestamp < start_ns:
+                continue
+
+            message_ids = unpack_message_ids(message_id, sub_id)
+            if wanted is not None and message_ids not in wanted:
+                continue
+
+            yield Record(timestamp / 1e9, message_ids, view[frame_offset:offset])
+
+    def frames(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        message_types: Iterable[type[BaseMessage] | MessageIDs] | None = None,
+    ) -> Iterator[tuple[float, bytes | memoryview]]:
+        """
+        Same as `records`, but only yields the timestamp and raw frame.
+        """
+        for record in self.records(start, end, message_types):
+            yield record.timestamp, record.frame
+
+    def messages(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        message_types: Iterable[type[BaseMessage] | MessageIDs] | None = None,
+        ignore_unknown: bool = False,
+    ) -> Iterator[tuple[float, BaseMessage]]:
+        """
+        Same as `records`, but decodes each frame and yields
+        the timestamp and message.
+        """
+        for record in self.records(start, end, message_types):
+            message = parse_message(record.frame, self.incoming_msb, ignore_unknown)
+            if message is not None:
+                yield record.timestamp, message
+
+    def __iter__(self) -> Iterator[tuple[float, BaseMessage]]:
+        return self.messages()
+
+    def close(self) -> None:
+        """
+        Close the recording.
+        """
+        try:
+            self._view.release()
+            self._mmap.close()
+        except BufferError:
+            # records are still holding views of it,
+            # so leave it to be closed once they are gone
+            pass
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> "RecordingReader":
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
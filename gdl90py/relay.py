@@ -0,0 +1,140 @@
+"""
+Forward raw frames of selected message types, without decoding them.
+"""
+
+import threading
+from collections.abc import Iterable
+
+import gdl90py.utils.gdl90
+from gdl90py.fanout import FanOutSender
+from gdl90py.messages._base_message import BaseMessage
+from gdl90py.parser import (
+    INVALID_FRAME_EXCEPTIONS,
+    MessageIDs,
+    frame_message_ids,
+    iter_frames,
+)
+from gdl90py.udp import DatagramReceiver
+
+
+class FrameFilter:
+    """
+    Pick out the frames of the given message classes or message ID(s) from
+    raw data, by their message ID(s) alone. Messages are never decoded, and
+    frames are returned exactly as received, as views of the data. Example:
+
+    ```python
+    frame_filter = FrameFilter([TrafficReportMessage, OwnshipReportMessage])
+    for datagram in datagrams:
+        forward(frame_filter.filter(datagram))
+    ```
+
+    Only the flag bytes and message ID(s) of a frame are checked, unless
+    `check_crc` is set. Frames that fail the CRC check, or have no message
+    ID, are counted in `invalid`. Frames of other types are counted in
+    `dropped`.
+    """
+
+    def __init__(
+        self,
+        message_types: Iterable[type[BaseMessage] | MessageIDs],
+        incoming_msb: bool = True,
+        check_crc: bool = False,
+    ) -> None:
+        self.message_ids = frozenset(
+            message_type
+            if isinstance(message_type, tuple)
+            else message_type.MESSAGE_IDS
+            for message_type in message_types
+        )
+        self.incoming_msb = incoming_msb
+        self.check_crc = check_crc
+
+        self.forwarded = 0
+        self.dropped = 0
+        self.invalid = 0
+
+    def filter(self, data: bytes | bytearray | memoryview) -> list[memoryview]:
+        """
+        Return views of the frames in `data` to forward.
+        """
+        view = memoryview(data)
+        message_ids = self.message_ids
+        incoming_msb = self.incoming_msb
+        frames = []
+
+        for offset, length in iter_frames(view):
+            frame = view[offset : offset + length]
+            try:
+                if self.check_crc:
+                    ids, _ = gdl90py.utils.gdl90.deconstruct_bytes(frame, incoming_msb)
+                else:
+                    ids = frame_message_ids(frame, incoming_msb)
+            except INVALID_FRAME_EXCEPTIONS:
+                self.invalid += 1
+                continue
+
+            if ids in message_ids:
+                frames.append(frame)
+            else:
+                self.dropped += 1
+
+        self.forwarded += len(frames)
+        return frames
+
+
+class Relay:
+    """
+    Receive datagrams, and forward the frames of the given message types to
+    every client of a `FanOutSender`, as they were received. Example:
+
+    ```python
+    relay = Relay(
+        open_datagram_receiver(port=4000),
+        FanOutSender([("192.168.1.20", 4000)]),
+        [TrafficReportMessage, OwnshipReportMessage],
+    )
+    relay.run()
+    ```
+
+    The frames forwarded from each datagram are sent together, packed into as
+    few datagrams as the sender allows. Frames keep their original bit order,
+    so `incoming_msb` must match the source, and the sender's `outgoing_lsb`
+    does not apply.
+
+    `run` blocks until `stop` is called from another thread, then closes
+    the receiver and sender.
+    """
+
+    def __init__(
+        self,
+        receiver: DatagramReceiver,
+        sender: FanOutSender,
+        message_types: Iterable[type[BaseMessage] | MessageIDs],
+        incoming_msb: bool = True,
+        check_crc: bool = False,
+    ) -> None:
+        self.receiver = receiver
+        self.sender = sender
+        self.filter = FrameFilter(message_types, incoming_msb, check_crc)
+
+        self._stopping = threading.Event()
+
+    def stop(self) -> None:
+        """
+        Stop relaying, from another thread.
+        """
+        self._stopping.set()
+
+    def run(self) -> None:
+        self._stopping.clear()
+        try:
+            while not self._stopping.is_set():
+                for datagram in self.receiver.receive(self.receiver.POLL_INTERVAL):
+                    frames = self.filter.filter(datagram)
+                    if frames:
+                        # the datagrams are only valid until the next receive
+                        self.sender.send_frames(frames)
+        finally:
+            self.receiver.close()
+            self.sender.close()
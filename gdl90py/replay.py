@@ -0,0 +1,209 @@
+"""
+Replay recorded streams over UDP with their original timing.
+"""
+
+import datetime
+import re
+import socket
+import threading
+import time
+from collections.abc import Callable, Iterable
+
+import gdl90py.utils.gdl90
+from gdl90py.aio import MAX_DATAGRAM_SIZE
+from gdl90py.messages.heartbeat import HeartbeatMessage
+from gdl90py.parser import INVALID_FRAME_EXCEPTIONS, iter_frames
+
+Source = Callable[[], Iterable[tuple[float, bytes | bytearray | memoryview]]]
+"""
+Function returning the timestamped frames or datagrams to replay, such as
+`RecordingReader.frames` or `PcapReader.payloads`. It is called again for
+each loop.
+"""
+
+# matches on any buffer, unlike `in` on a memoryview
+_HEARTBEAT_START = re.compile(
+    re.escape(bytes((gdl90py.utils.gdl90.FLAG_BYTE, HeartbeatMessage.MESSAGE_IDS[0])))
+)
+
+
+def patch_heartbeat_timestamp(
+    frame: bytes | bytearray | memoryview, seconds: int, incoming_msb: bool = True
+) -> bytes | bytearray:
+    """
+    Replace the timestamp (seconds since UTC midnight) of a raw Heartbeat frame,
+    without decoding the rest of the message.
+    """
+    message_ids, data = gdl90py.utils.gdl90.deconstruct_bytes(frame, incoming_msb)
+    if message_ids != HeartbeatMessage.MESSAGE_IDS:
+        raise ValueError("Not a Heartbeat frame")
+
+    seconds = min(seconds, 0x1FFFF)
+    data = bytearray(data)
+    # see the timestamp field of `HeartbeatMessage.LAYOUT`. The most significant
+    # bit is the top bit of the second status byte, followed by the rest
+    # with the least significant byte first
+    data[1] = (data[1] & 0x7F) | ((seconds >> 16) << 7)
+    data[2] = seconds & 0xFF
+    data[3] = (seconds >> 8) & 0xFF
+
+    return gdl90py.utils.gdl90.build_bytes(message_ids, data, not incoming_msb)
+
+
+def seconds_since_utc_midnight() -> int:
+    now = datetime.datetime.now(datetime.UTC)
+    return now.hour * 3600 + now.minute * 60 + now.second
+
+
+class Replayer:
+    """
+    Send a recorded stream to UDP targets, keeping the original time between
+    frames. Example:
+
+    ```python
+    with RecordingReader("flight.gdl90rec") as reader:
+        replayer = Replayer(reader.frames, [("127.0.0.1", 4000)], speed=2)
+        replayer.run()
+    ```
+
+    `speed` scales the original timing, so 2 replays twice as fast, and
+    None sends everything as fast as possible. Frames that are due at the same
+    time are packed into the same datagram, up to `max_datagram_size`.
+    Frames are sent as they were recorded, without being decoded, except for
+    Heartbeats when `patch_heartbeat_timestamps` is set. Their timestamps are
+    then replaced with the current time.
+
+    `run` blocks until the stream ends (never, if `loop` is set) or `stop`
+    is called from another thread.
+    """
+
+    def __init__(
+        self,
+        source: Source,
+        targets: Iterable[tuple[str, int]],
+        speed: float | None = 1.0,
+        loop: bool = False,
+        patch_heartbeat_timestamps: bool = False,
+        incoming_msb: bool = True,
+        max_datagram_size: int = MAX_DATAGRAM_SIZE,
+    ) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive, or None for maximum speed")
+
+        self.source = source
+        self.targets = list(targets)
+        self.speed = speed
+        self.loop = loop
+        self.patch_heartbeat_timestamps = patch_heartbeat_timestamps
+        self.incoming_msb = incoming_msb
+        self.max_datagram_size = max_datagram_size
+
+        self.frames_sent = 0
+        """
+        Number of frames (or datagrams from a packet capture) sent.
+        """
+        self.datagrams_sent = 0
+        self.loops = 0
+        """
+        Number of times the whole stream has been replayed.
+        """
+        self.max_lateness = 0.0
+        """
+        Longest time, in seconds, a frame was sent after it was due.
+        """
+
+        self._stopping = threading.Event()
+
+    def stop(self) -> None:
+        """
+        Stop replaying, from another thread.
+        """
+        self._stopping.set()
+
+    def run(self) -> None:
+        self._stopping.clear()
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+
+            while not self._stopping.is_set():
+                self._replay(sock)
+                self.loops += 1
+                if not self.loop:
+                    break
+
+    def _replay(self, sock: socket.socket) -> None:
+        speed = self.speed
+        max_size = self.max_datagram_size
+        stopping = self._stopping
+
+        pending: list[bytes | bytearray | memoryview] = []
+        pending_size = 0
+        first_timestamp = None
+        start = 0.0
+
+        def flush() -> None:
+            nonlocal pending_size
+            datagram = b"".join(pending)
+            for target in self.targets:
+                sock.sendto(datagram, target)
+            self.frames_sent += len(pending)
+            self.datagrams_sent += 1
+            pending.clear()
+            pending_size = 0
+
+        for timestamp, data in self.source():
+            if speed is not None:
+                if first_timestamp is None:
+                    first_timestamp = timestamp
+                    start = time.perf_counter()
+
+                due = start + (timestamp - first_timestamp) / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    # everything pending was due before this
+                    if pending:
+                        flush()
+                    if stopping.wait(delay):
+                        return
+                else:
+                    self.max_lateness = max(self.max_lateness, -delay)
+
+            if self.patch_heartbeat_timestamps and _HEARTBEAT_START.search(data):
+                data = self._patch_heartbeats(data)
+
+            if pending and pending_size + len(data) > max_size:
+                flush()
+                if stopping.is_set():
+                    return
+
+            pending.append(data)
+            pending_size += len(data)
+
+        if pending:
+            flush()
+
+    def _patch_heartbeats(
+        self, data: bytes | bytearray | memoryview
+    ) -> bytes | bytearray | memoryview:
+        """
+        Patch the timestamp of every Heartbeat frame in a frame or datagram.
+        """
+        seconds = seconds_since_utc_midnight()
+        patched = []
+        position = 0
+
+        for offset, length in iter_frames(data):
+            frame = data[offset : offset + length]
+            if data[offset + 1] == HeartbeatMessage.MESSAGE_IDS[0]:
+                try:
+                    frame = patch_heartbeat_timestamp(frame, seconds, self.incoming_msb)
+                except INVALID_FRAME_EXCEPTIONS:
+                    # send as recorded
+                    pass
+
+            patched.append(data[position:offset])
+            patched.append(frame)
+            position = offset + length
+
+        patched.append(data[position:])
+        return b"".join(patched)
@@ -0,0 +1,226 @@
+"""
+Read and decode messages from a serial port, or any other byte stream.
+"""
+
+import io
+import select
+import threading
+import typing
+from collections.abc import Iterator
+
+import gdl90py.utils.gdl90
+from gdl90py.messages._base_message import BaseMessage
+from gdl90py.parser import (
+    UNDECODABLE_FRAME_EXCEPTIONS,
+    FrameDecoder,
+    iter_frames,
+    parse_message,
+)
+from gdl90py.utils.ring_buffer import RingBuffer
+
+
+class ByteStream(typing.Protocol):
+    """
+    A stream `SerialReader` can read from. `readinto` and `fileno` are used
+    when the stream has them.
+    """
+
+    def read(self, size: int, /) -> bytes | None: ...
+
+
+class SerialReader:
+    """
+    Read from a byte stream, such as a `serial.Serial` port or a tty opened
+    with `open(path, "rb", buffering=0)`, in a background thread. Data is read
+    straight into a preallocated ring buffer, and messages are decoded from the
+    ring buffer when the consumer calls `poll` or iterates over the reader.
+    Example:
+
+    ```python
+    with SerialReader(serial.Serial("/dev/ttyUSB0", 115200, timeout=0.1)) as reader:
+        for message in reader:
+            print(message)
+    ```
+
+    If the consumer falls behind and the ring buffer fills up, further data is
+    discarded until there is room again, and counted in `overruns` and
+    `overrun_bytes`. Frames that can not be decoded are counted in `invalid`.
+
+    By default, a read returning no data is the end of the stream. Set
+    `stop_at_eof` to False for streams that return no data on a read timeout,
+    such as a `serial.Serial` with a timeout.
+    """
+
+    POLL_INTERVAL = 0.1
+    """
+    How often, in seconds, the background thread checks whether it should stop,
+    for streams that can be waited on with `select`.
+    """
+
+    def __init__(
+        self,
+        stream: ByteStream,
+        capacity: int = 65536,
+        incoming_msb: bool = True,
+        ignore_unknown: bool = False,
+        stop_at_eof: bool = True,
+    ) -> None:
+        self.stream = stream
+        self.incoming_msb = incoming_msb
+        self.ignore_unknown = ignore_unknown
+        self.stop_at_eof = stop_at_eof
+
+        self.invalid = 0
+        self.error: Exception | None = None
+        """
+        Exception that stopped the background thread, if any.
+        """
+
+        # a frame that wraps around the end of the ring buffer is mirrored
+        # past it, so frames are always decoded from a contiguous view
+        self._ring = RingBuffer(capacity, spare=FrameDecoder.MAX_FRAME_SIZE)
+        # number of unread bytes left in the ring buffer after the last poll,
+        # which are the start of an incomplete frame
+        self._pending = 0
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="gdl90py-serial-reader", daemon=True
+        )
+
+    @property
+    def overruns(self) -> int:
+        return self._ring.overruns
+
+    @property
+    def overrun_bytes(self) -> int:
+        return self._ring.overrun_bytes
+
+    def start(self) -> None:
+        """
+        Start reading in the background.
+        """
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop reading and wait up to `timeout` seconds for the background thread
+        to finish. Streams that can not be waited on with `select` must return
+        from their current read first, so give them a read timeout.
+        Anything already read can still be received.
+        """
+        self._stopping.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def __enter__(self) -> "SerialReader":
+        self.start()
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        try:
+            self._read_loop()
+        except Exception as e:
+            if not self._stopping.is_set():
+                self.error = e
+        finally:
+            self._ring.close()
+
+    def _read_loop(self) -> None:
+        fileno = None
+        get_fileno = getattr(self.stream, "fileno", None)
+        if get_fileno is not None:
+            try:
+                fileno = get_fileno()
+            except (OSError, io.UnsupportedOperation):
+                pass
+
+        readinto = getattr(self.stream, "readinto", None)
+
+        while not self._stopping.is_set():
+            if fileno is not None:
+                try:
+                    ready, _, _ = select.select([fileno], [], [], self.POLL_INTERVAL)
+                except OSError:
+                    # can not be waited on, such as a file on Windows
+                    fileno = None
+                    continue
+                if not ready:
+                    continue
+
+            if readinto is not None:
+                count = readinto(self._ring.writable())
+                if count:
+                    self._ring.commit(count)
+            else:
+                data = self.stream.read(len(self._ring.writable()))
+                count = len(data) if data else 0
+                if data:
+                    self._ring.write(data)
+
+            if not count and self.stop_at_eof:
+                return
+
+    def poll(self, timeout: float | None = None) -> list[BaseMessage]:
+        """
+        Wait up to `timeout` seconds for new data, then decode and return all
+        complete messages received. Returns an empty list if no new data
+        arrived in time, or the reader has stopped.
+        """
+        if not self._ring.wait(self._pending, timeout):
+            return []
+
+        view = self._ring.readable()
+        messages = []
+        consumed = 0
+
+        # frames are decoded straight from the ring buffer
+        for offset, length in iter_frames(view):
+            consumed = offset + length
+            try:
+                message = parse_message(
+                    view[offset:consumed], self.incoming_msb, self.ignore_unknown
+                )
+            except UNDECODABLE_FRAME_EXCEPTIONS:
+                self.invalid += 1
+                continue
+
+            if message is not None:
+                messages.append(message)
+
+        # keep the start of an incomplete frame until the rest arrives.
+        # Anything else left over is garbage
+        search_from = max(consumed, len(view) - FrameDecoder.MAX_FRAME_SIZE)
+        start = view[search_from:].tobytes().rfind(gdl90py.utils.gdl90.FLAG_BYTE)
+        if start < 0:
+            consumed = len(view)
+        else:
+            consumed = search_from + start
+
+        pending = len(view) - consumed
+        if pending >= self._ring.capacity:
+            # nothing more fits, so it can never be completed
+            consumed, pending = len(view), 0
+
+        self._ring.release(consumed)
+        self._pending = pending
+
+        return messages
+
+    def __iter__(self) -> Iterator[BaseMessage]:
+        """
+        Yield messages as they are received, until the reader has stopped and
+        everything read has been decoded. If reading stopped because of an
+        exception, it is then raised.
+        """
+        while True:
+            messages = self.poll()
+            if not messages and self._ring.closed and len(self._ring) <= self._pending:
+                break
+
+            yield from messages
+
+        if self.error is not None:
+            raise self.error
@@ -0,0 +1,479 @@
+"""
+Share decoded messages between processes through a ring buffer in shared memory.
+"""
+
+import functools
+import struct
+import sys
+import time
+import typing
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+
+from gdl90py.messages._base_message import BaseMessage
+from gdl90py.messages.heartbeat import HeartbeatMessage
+from gdl90py.messages.ownship_geometric_altitude import OwnshipGeometricAltitudeMessage
+from gdl90py.messages.ownship_report import OwnshipReportMessage
+from gdl90py.messages.traffic_report import TrafficReportMessage
+from gdl90py.parser import (
+    KNOWN_MESSAGE_TYPES,
+    MessageIDs,
+    pack_message_ids,
+    unpack_message_ids,
+)
+from gdl90py.utils.gdl90 import deconstruct_bytes
+from gdl90py.utils.layout import Field, _EnumLookup
+
+MAGIC = b"GDL90SHM"
+
+DEFAULT_MESSAGE_TYPES: tuple[type[BaseMessage], ...] = (
+    HeartbeatMessage,
+    OwnshipReportMessage,
+    OwnshipGeometricAltitudeMessage,
+    TrafficReportMessage,
+)
+
+# magic, number of slots, size of each slot
+_HEADER = struct.Struct("<8sII")
+# sequence number of the last record written
+_SEQUENCE = struct.Struct("<Q")
+_HEAD_OFFSET = _HEADER.size
+_CLOSED = struct.Struct("<B")
+_CLOSED_OFFSET = _HEAD_OFFSET + _SEQUENCE.size
+# slots start on their own cache line, away from the head
+_SLOTS_OFFSET = 64
+# sequence number, timestamp, message ID, sub ID
+_SLOT = struct.Struct("<QdBB6x")
+
+
+@dataclass(frozen=True)
+class RingRecord:
+    sequence: int
+    """
+    Number of the record, counting from 1 for the first record written.
+    """
+    timestamp: float
+    """
+    Time the record was written, in seconds since the epoch.
+    """
+    message_ids: MessageIDs
+    values: dict[str, typing.Any]
+    """
+    Attribute values of the message.
+    """
+
+    def message(self) -> BaseMessage:
+        return KNOWN_MESSAGE_TYPES[self.message_ids](**self.values)
+
+
+_Encode = Callable[[BaseMessage, typing.Any], typing.Any]
+
+
+def _field_format(
+    message_type: type[BaseMessage], field: Field, name: str
+) -> tuple[str, _Encode | None]:
+    """
+    Return the struct format of an attribute, and a function that converts
+    its value to what is stored, if it is not stored as is.
+    """
+    if hasattr(message_type, f"_decode_{name}"):
+        # the hook can return any type, so store the raw value
+        return "Q", field.encoder(getattr(message_type, f"_encode_{name}", None))
+
+    if field.kind is str:
+        encoding = field.encoding
+
+        def encode_str(message: BaseMessage, value: str) -> bytes:
+            return value.encode(encoding)
+
+        return f"{field.bits // 8}s", encode_str
+
+    if field.enum is not None:
+        return "q", None
+    if field.kind is bytes:
+        return f"{field.bits // 8}s", None
+    if field.kind is bool:
+        return "?", None
+    if field.kind is float:
+        return "d", None
+    return "q", None
+
+
+class _RecordFormat:
+    """
+    Fixed-width record of the attribute values of a message type, so readers
+    only copy the values out, without decoding the message data.
+
+    Numbers, bools and enums are stored as is, and strings encoded. Attributes
+    with a decoding hook on the message class, such as the timestamp of a
+    Heartbeat, are stored as their raw value. The record starts with a bitmask
+    of the attributes that are None.
+    """
+
+    def __init__(self, message_type: type[BaseMessage]) -> None:
+        self.message_type = message_type
+        self._names: list[str] = []
+        self._empty: list[typing.Any] = []
+        self._encoders: list[_Encode | None] = []
+
+        formats = ["<Q"]
+        namespace: dict[str, typing.Any] = {}
+        items = []
+
+        for field in message_type._layout.fields:
+            if field.name is None:
+                continue
+
+            field_format, encode = _field_format(message_type, field, field.name)
+            i = len(self._names)
+            formats.append(field_format)
+            self._names.append(field.name)
+            self._empty.append(b"" if field_format.endswith("s") else 0)
+            self._encoders.append(encode)
+
+            value = f"record[{i + 1}]"
+            hook = getattr(message_type, f"_decode_{field.name}", None)
+            if hook is not None:
+                namespace[f"decode_{i}"] = field.decoder(hook)
+                value = f"decode_{i}({value})"
+            elif field.enum is not None:
+                namespace[f"enum_{i}"] = _EnumLookup(field.enum)
+                value = f"enum_{i}[{value}]"
+            elif field.kind is str:
+                value = f"{value}.rstrip(b'\\x00').decode({field.encoding!r})"
+            items.append(
+                f"        {field.name!r}: None if nulls & {1 << i:#x} else {value},"
+            )
+
+        self.struct = struct.Struct("".join(formats))
+        self.size = self.struct.size
+
+        source = "\n".join(
+            [
+                "def values(record):",
+                "    nulls = record[0]",
+                "    return {",
+                *items,
+                "    }",
+            ]
+        )
+        exec(source, namespace)
+        self.values: Callable[[tuple[typing.Any, ...]], dict[str, typing.Any]] = (
+            namespace["values"]
+        )
+        """
+        Convert a record copied out with `struct` into attribute values.
+        """
+
+    def pack_into(self, buf: memoryview, offset: int, message: BaseMessage) -> None:
+        nulls = 0
+        values = []
+        for bit, (name, encode, empty) in enumerate(
+            zip(self._names, self._encoders, self._empty)
+        ):
+            value = getattr(message, name)
+            if value is None:
+                nulls |= 1 << bit
+                value = empty
+            elif encode is not None:
+                value = encode(message, value)
+            values.append(value)
+
+        self.struct.pack_into(buf, offset, nulls, *values)
+
+
+@functools.cache
+def _known_record_format(message_ids: MessageIDs) -> _RecordFormat | None:
+    """
+    Record format of a known message type, for readers.
+    """
+    message_type = KNOWN_MESSAGE_TYPES.get(message_ids)
+    return None if message_type is None else _RecordFormat(message_type)
+
+
+class SharedRingWriter:
+    """
+    Write decoded messages into a new ring buffer in shared memory, for any
+    number of `SharedRingReader`s in other processes. Only one process
+    decodes the incoming data, and the readers never decode frames or
+    unpickle anything. Example:
+
+    ```python
+    with SharedRingWriter("gdl90") as writer:
+        for message in receiver:
+            writer.write(message)
+    ```
+
+    Each slot of the ring holds one message, stored as a fixed-width record
+    of its attribute values, and is sized for the largest of `message_types`.
+    Messages of other types are skipped. Only the message types in
+    `KNOWN_MESSAGE_TYPES` can be shared. The writer never waits for readers,
+    so the oldest records are overwritten once the ring is full.
+
+    A process that receives frames can use `write_frame` instead, which only
+    decodes the frames of `message_types`.
+    """
+
+    def __init__(
+        self,
+        name: str | None = None,
+        slots: int = 4096,
+        message_types: Iterable[type[BaseMessage]] = DEFAULT_MESSAGE_TYPES,
+    ) -> None:
+        if slots < 1:
+            raise ValueError("slots must be at least 1")
+
+        self.message_types = frozenset(message_types)
+        for message_type in self.message_types:
+            # readers look up message types by message ID
+            if KNOWN_MESSAGE_TYPES.get(message_type.MESSAGE_IDS) is not message_type:
+                raise ValueError(f"{message_type.__name__} is not a known message type")
+
+        self.slots = slots
+        self._formats = {
+            message_type.MESSAGE_IDS: _RecordFormat(message_type)
+            for message_type in self.message_types
+        }
+        max_record_size = max(record.size for record in self._formats.values())
+        # keep every slot 8 byte aligned
+        self.slot_size = (_SLOT.size + max_record_size + 7) // 8 * 8
+
+        self.shm = shared_memory.SharedMemory(
+            name, create=True, size=_SLOTS_OFFSET + slots * self.slot_size
+        )
+        self._buf = _buffer(self.shm)
+        _HEADER.pack_into(self._buf, 0, MAGIC, slots, self.slot_size)
+        self._sequence = 0
+        self._closed = False
+
+    @property
+    def name(self) -> str:
+        """
+        Name of the shared memory, to open it with a `SharedRingReader`.
+        """
+        return self.shm.name
+
+    def write(self, message: BaseMessage, timestamp: float | None = None) -> int | None:
+        """
+        Write a message, and return its sequence number. Returns None if
+        the message is not one of `message_types`.
+        """
+        if type(message) not in self.message_types:
+            return None
+
+        return self._write(self._formats[message.MESSAGE_IDS], message, timestamp)
+
+    def write_frame(
+        self,
+        frame: bytes | bytearray | memoryview,
+        incoming_msb: bool = True,
+        timestamp: float | None = None,
+    ) -> int | None:
+        """
+        Same as `write`, but with a received frame, which is not decoded
+        unless it is one of `message_types`. Raises the same exceptions as
+        `parse_message` for an invalid frame.
+        """
+        message_ids, data = deconstruct_bytes(frame, incoming_msb)
+        record_format = self._formats.get(message_ids)
+        if record_format is None:
+            return None
+
+        message = record_format.message_type.unpack(data)
+        return self._write(record_format, message, timestamp)
+
+    def _write(
+        self,
+        record_format: _RecordFormat,
+        message: BaseMessage,
+        timestamp: float | None,
+    ) -> int:
+        buf = self._buf
+        sequence = self._sequence + 1
+        offset = _SLOTS_OFFSET + (sequence % self.slots) * self.slot_size
+
+        # readers check the sequence number before and after copying a slot,
+        # so mark it as being written first
+        _SEQUENCE.pack_into(buf, offset, 0)
+        record_format.pack_into(buf, offset + _SLOT.size, message)
+        _SLOT.pack_into(
+            buf,
+            offset,
+            sequence,
+            time.time() if timestamp is None else timestamp,
+            *pack_message_ids(message.MESSAGE_IDS),
+        )
+        _SEQUENCE.pack_into(buf, _HEAD_OFFSET, sequence)
+
+        self._sequence = sequence
+        return sequence
+
+    def close(self, unlink: bool = True) -> None:
+        """
+        Mark the ring as closed, so readers stop once they have read
+        everything, and free the shared memory once every reader has
+        closed it too.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        _CLOSED.pack_into(self._buf, _CLOSED_OFFSET, 1)
+        self.shm.close()
+        if unlink:
+            if sys.version_info < (3, 13) and sys.platform != "win32":
+                # a reader sharing this process's resource tracker may have
+                # unregistered it, and unlinking unregisters it again
+                resource_tracker.register(f"/{self.shm.name}", "shared_memory")
+            self.shm.unlink()
+
+    def __enter__(self) -> "SharedRingWriter":
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+
+def _buffer(shm: shared_memory.SharedMemory) -> memoryview:
+    """
+    Return the memory of open shared memory.
+    """
+    buf = shm.buf
+    if buf is None:
+        raise ValueError(f"{shm.name} is closed")
+    return buf
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Open existing shared memory, without it being unlinked when this
+    process exits.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+
+    shm = shared_memory.SharedMemory(name)
+    if sys.platform != "win32":
+        # before Python 3.13, opening always registers it with the resource
+        # tracker on POSIX, under its name with a leading slash
+        resource_tracker.unregister(f"/{shm.name}", "shared_memory")
+    return shm
+
+
+class SharedRingReader:
+    """
+    Read the messages written to a shared memory ring buffer by a
+    `SharedRingWriter` in another process. Any number of readers can read the
+    same ring, each at its own pace, without locking. Example:
+
+    ```python
+    with SharedRingReader("gdl90") as reader:
+        for message in reader:
+            print(message)
+    ```
+
+    By default, a new reader starts with the next message written. Set
+    `from_oldest` to start with the oldest message still in the ring.
+    Records overwritten before a reader got to them are counted in `lost`.
+    """
+
+    POLL_INTERVAL = 0.005
+    """
+    How often, in seconds, iterating over the reader checks for new records.
+    """
+
+    def __init__(self, name: str, from_oldest: bool = False) -> None:
+        self.shm = _attach(name)
+        self._buf = _buffer(self.shm)
+
+        magic, self.slots, self.slot_size = _HEADER.unpack_from(self._buf)
+        if magic != MAGIC:
+            self.shm.close()
+            raise ValueError(f"{name} is not a shared ring buffer")
+
+        self.lost = 0
+        head = self._head()
+        self.sequence = max(head - self.slots, 0) if from_oldest else head
+        """
+        Sequence number of the last record read.
+        """
+
+    def _head(self) -> int:
+        return _SEQUENCE.unpack_from(self._buf, _HEAD_OFFSET)[0]
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the writer has closed the ring.
+        """
+        return bool(_CLOSED.unpack_from(self._buf, _CLOSED_OFFSET)[0])
+
+    def read(self) -> list[RingRecord]:
+        """
+        Return every record written since the last read, without waiting.
+        """
+        buf = self._buf
+        head = self._head()
+        sequence = self.sequence
+
+        if head - sequence > self.slots:
+            # lapped by the writer
+            self.lost += head - self.slots - sequence
+            sequence = head - self.slots
+
+        records = []
+        for expected in range(sequence + 1, head + 1):
+            offset = _SLOTS_OFFSET + (expected % self.slots) * self.slot_size
+            number, timestamp, message_id, sub_id = _SLOT.unpack_from(buf, offset)
+            message_ids = unpack_message_ids(message_id, sub_id)
+            record_format = _known_record_format(message_ids)
+            if number != expected or record_format is None:
+                # overwritten before or while reading the header
+                self.lost += 1
+                continue
+
+            record = record_format.struct.unpack_from(buf, offset + _SLOT.size)
+            if _SEQUENCE.unpack_from(buf, offset)[0] != expected:
+                # overwritten while being copied
+                self.lost += 1
+                continue
+
+            records.append(
+                RingRecord(
+                    expected,
+                    timestamp,
+                    message_ids,
+                    record_format.values(record),
+                )
+            )
+
+        self.sequence = head
+        return records
+
+    def read_messages(self) -> list[BaseMessage]:
+        """
+        Same as `read`, but returns the messages.
+        """
+        return [record.message() for record in self.read()]
+
+    def __iter__(self) -> Iterator[BaseMessage]:
+        """
+        Yield messages as they are written, until the writer closes the ring.
+        """
+        while True:
+            # check before reading, so nothing written before closing is missed
+            closed = self.closed
+            yield from self.read_messages()
+            if closed:
+                return
+            time.sleep(self.POLL_INTERVAL)
+
+    def close(self) -> None:
+        self.shm.close()
+
+    def __enter__(self) -> "SharedRingReader":
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
@@ -0,0 +1,187 @@
+"""
+Receive messages from a TCP connection, or any other stream socket.
+"""
+
+import select
+import socket
+import threading
+import time
+import typing
+from collections.abc import Iterator
+
+from gdl90py.messages._base_message import BaseMessage
+from gdl90py.parser import FrameDecoder
+
+
+class TCPReceiver:
+    """
+    Connect to a TCP server and decode the messages it sends, where frames
+    may be split across reads. Used the same way as a `DatagramReceiver`.
+    Example:
+
+    ```python
+    with TCPReceiver(("192.168.10.1", 2000)) as receiver:
+        for message in receiver:
+            print(message)
+    ```
+
+    The connection is opened on the first `poll`. If it is lost, it is opened
+    again after `reconnect_delay` seconds, doubling after each failed attempt
+    up to `max_reconnect_delay`. A partial frame left over from the old
+    connection is discarded. Without `reconnect`, iteration stops when the
+    connection is closed by the server, and an error connecting is raised.
+
+    Data is read into a preallocated buffer of `read_size` bytes, only when
+    polled, so a slow consumer makes the server wait rather than data piling
+    up here. Frames that can not be decoded are counted in `invalid`.
+    """
+
+    POLL_INTERVAL = 0.1
+    """
+    How often, in seconds, iterating over the receiver checks whether it
+    has been closed.
+    """
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        reconnect: bool = True,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        connect_timeout: float = 10.0,
+        read_size: int = 65536,
+        incoming_msb: bool = True,
+        ignore_unknown: bool = False,
+    ) -> None:
+        self.address = address
+        self.reconnect = reconnect
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.connect_timeout = connect_timeout
+
+        self.invalid = 0
+        self.reconnects = 0
+        """
+        Number of times the connection has been opened again.
+        """
+        self.error: Exception | None = None
+        """
+        The last error reading from or connecting to the server, if any.
+        """
+
+        self.sock: socket.socket | None = None
+        self._decoder = FrameDecoder(incoming_msb, ignore_unknown)
+        self._view = memoryview(bytearray(read_size))
+        self._connected_before = False
+        # whether the connection has ended for good
+        self._finished = False
+        self._closing = threading.Event()
+        # delay before the next attempt after this one, and when it is due
+        self._delay = reconnect_delay
+        self._next_attempt = 0.0
+
+    def _connect(self, timeout: float | None) -> bool:
+        """
+        Connect, or wait up to `timeout` seconds for the next attempt.
+        Returns True once connected.
+        """
+        wait = self._next_attempt - time.monotonic()
+        if wait > 0:
+            if timeout is not None and timeout < wait:
+                self._closing.wait(timeout)
+                return False
+            if self._closing.wait(wait):
+                return False
+
+        try:
+            sock = socket.create_connection(self.address, self.connect_timeout)
+        except OSError as e:
+            self.error = e
+            if not self.reconnect:
+                self._finished = True
+                raise
+            self._next_attempt = time.monotonic() + self._delay
+            self._delay = min(self._delay * 2, self.max_reconnect_delay)
+            return False
+
+        if self._closing.is_set():
+            sock.close()
+            return False
+
+        self.sock = sock
+        if self._connected_before:
+            self.reconnects += 1
+        self._connected_before = True
+        self._delay = self.reconnect_delay
+        return True
+
+    def _disconnect(self) -> None:
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        self._decoder.reset()
+        if self.reconnect:
+            self._next_attempt = time.monotonic() + self._delay
+            self._delay = min(self._delay * 2, self.max_reconnect_delay)
+        else:
+            self._finished = True
+
+    def poll(self, timeout: float | None = None) -> list[BaseMessage]:
+        """
+        Wait up to `timeout` seconds for data, then decode and return all
+        complete messages received. Returns an empty list if no new data
+        arrived in time, or the receiver is reconnecting.
+        """
+        if self._finished or self._closing.is_set():
+            return []
+
+        if self.sock is None and not self._connect(timeout):
+            return []
+
+        sock = self.sock
+        if sock is None:
+            # closed from another thread
+            return []
+
+        try:
+            ready, _, _ = select.select([sock], [], [], timeout)
+            if not ready:
+                return []
+            count = sock.recv_into(self._view)
+        except (OSError, ValueError) as e:
+            if self._closing.is_set():
+                return []
+            self.error = e
+            count = 0
+
+        if not count:
+            self._disconnect()
+            return []
+
+        messages, invalid = self._decoder.feed_skip_invalid(self._view[:count])
+        self.invalid += invalid
+        return messages
+
+    def __iter__(self) -> Iterator[BaseMessage]:
+        """
+        Yield messages as they are received, until the receiver is closed
+        or the connection has ended for good.
+        """
+        while not self._finished and not self._closing.is_set():
+            yield from self.poll(self.POLL_INTERVAL)
+
+    def close(self) -> None:
+        """
+        Close the connection. Iterating over the receiver then stops.
+        """
+        self._closing.set()
+        self._finished = True
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def __enter__(self) -> "TCPReceiver":
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
@@ -0,0 +1,221 @@
+"""
+Keep the latest report of every traffic target in NumPy arrays, one array per
+attribute, instead of a dataclass per target.
+
+Requires NumPy, which is included with the `numpy` extra.
+"""
+
+import math
+import time
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import numpy as np
+
+from gdl90py.batch import decode_columns, decode_traffic_batch
+from gdl90py.messages._base_traffic_report import BaseTrafficReport
+from gdl90py.messages.traffic_report import TrafficReportMessage
+from gdl90py.utils.layout import Field
+
+UPDATED = "updated"
+"""
+Name of the column with the time each target was last updated.
+"""
+
+
+class TrafficTable:
+    """
+    Latest Traffic Report of every target, keyed by its 24-bit address, and
+    stored in preallocated NumPy arrays with one row per target. Example:
+
+    ```python
+    table = TrafficTable(max_age=20)
+    for message in receiver:
+        if isinstance(message, TrafficReportMessage):
+            table.update(message)
+
+    columns = table.snapshot()
+    low = columns["address"][columns["pressure_altitude"] < 3000]
+    ```
+
+    Columns have the same names and types as `decode_traffic_batch`, plus
+    `updated`, the time of the last report in seconds since the epoch.
+    A row takes around 100 bytes, plus an entry mapping the address to it,
+    rather than a dataclass and its attribute values per target. Updating a
+    target only writes its row.
+
+    Targets not updated for `max_age` seconds are left out of snapshots,
+    and removed by `evict`. The arrays start with room for `capacity`
+    targets, and double in size whenever they are full.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        max_age: float = 60.0,
+        message_class: type[BaseTrafficReport] = TrafficReportMessage,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.max_age = max_age
+        self.message_class = message_class
+        self.invalid = 0
+        """
+        Number of frames given to `update_frames` that could not be decoded.
+        """
+
+        layout = message_class._layout
+        self._fields: list[tuple[str, Field]] = [
+            (field.name, field) for field in layout.fields if field.name is not None
+        ]
+        empty = decode_columns(layout, np.zeros((0, layout.size), dtype=np.uint8))
+
+        self._columns: dict[str, np.ndarray] = {}
+        for name, field in self._fields:
+            dtype = (
+                np.dtype(f"U{field.bits // 8}")
+                if field.kind is str
+                else empty[name].dtype
+            )
+            self._columns[name] = np.zeros(capacity, dtype=dtype)
+        # NaN for free rows
+        self._columns[UPDATED] = np.full(capacity, np.nan)
+
+        self._slots: dict[int, int] = {}
+        # popped from the end, so rows are used from the start
+        self._free = list(range(capacity - 1, -1, -1))
+
+    @property
+    def capacity(self) -> int:
+        return len(self._columns[UPDATED])
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, address: int) -> bool:
+        return address in self._slots
+
+    def _slot(self, address: int) -> int:
+        slot = self._slots.get(address)
+        if slot is None:
+            if not self._free:
+                self._grow()
+            slot = self._slots[address] = self._free.pop()
+        return slot
+
+    def _grow(self) -> None:
+        old = self.capacity
+        new = old * 2
+        for name, column in self._columns.items():
+            grown = (
+                np.full(new, np.nan) if name == UPDATED else np.zeros(new, column.dtype)
+            )
+            grown[:old] = column
+            self._columns[name] = grown
+        self._free.extend(range(new - 1, old - 1, -1))
+
+    def update(
+        self, message: BaseTrafficReport, timestamp: float | None = None
+    ) -> None:
+        """
+        Store a report as the latest for its target.
+        """
+        slot = self._slot(message.address)
+        columns = self._columns
+
+        for name, field in self._fields:
+            value = getattr(message, name)
+            if value is None:
+                value = "" if field.kind is str else math.nan
+            columns[name][slot] = value
+
+        columns[UPDATED][slot] = time.time() if timestamp is None else timestamp
+
+    def update_many(
+        self, messages: Iterable[BaseTrafficReport], timestamp: float | None = None
+    ) -> None:
+        """
+        Same as `update`, for many reports.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        for message in messages:
+            self.update(message, timestamp)
+
+    def update_frames(
+        self,
+        frames: Sequence[bytes | bytearray | memoryview],
+        incoming_msb: bool = True,
+        timestamp: float | None = None,
+    ) -> int:
+        """
+        Decode complete frames with `decode_traffic_batch`, and store them
+        all at once, without creating a message for any of them. Frames that
+        can not be decoded are counted in `invalid`. Returns the number of
+        reports stored.
+        """
+        decoded = decode_traffic_batch(
+            frames, incoming_msb, self.message_class, ignore_invalid=True
+        )
+        addresses = decoded["address"]
+        self.invalid += len(frames) - len(addresses)
+
+        # the last report of each target wins
+        rows = {address: row for row, address in enumerate(addresses.tolist())}
+        slots = np.fromiter(map(self._slot, rows), dtype=np.intp, count=len(rows))
+        indexes = np.fromiter(rows.values(), dtype=np.intp, count=len(rows))
+
+        columns = self._columns
+        for name, column in decoded.items():
+            columns[name][slots] = column[indexes]
+        columns[UPDATED][slots] = time.time() if timestamp is None else timestamp
+
+        return len(addresses)
+
+    def evict(self, now: float | None = None) -> int:
+        """
+        Remove every target not updated for `max_age` seconds. Returns the
+        number of targets removed.
+        """
+        cutoff = (time.time() if now is None else now) - self.max_age
+        updated = self._columns[UPDATED]
+        stale = np.flatnonzero(updated < cutoff)
+
+        for address in self._columns["address"][stale].tolist():
+            del self._slots[address]
+        updated[stale] = np.nan
+        self._free.extend(stale.tolist())
+
+        return len(stale)
+
+    def snapshot(self, now: float | None = None) -> dict[str, np.ndarray]:
+        """
+        Return a copy of every column, with a row for each target updated in
+        the last `max_age` seconds, in no particular order.
+        """
+        cutoff = (time.time() if now is None else now) - self.max_age
+        current = self._columns[UPDATED] >= cutoff
+        return {name: column[current] for name, column in self._columns.items()}
+
+    def get(self, address: int) -> BaseTrafficReport | None:
+        """
+        Return the latest report of a target as a message, or None if there
+        is none. A callsign of None is returned as an empty string.
+        """
+        slot = self._slots.get(address)
+        if slot is None:
+            return None
+
+        values: dict[str, Any] = {}
+        for name, field in self._fields:
+            value = self._columns[name][slot].item()
+            if field.enum is not None:
+                value = field.enum(value)
+            elif isinstance(value, float) and math.isnan(value):
+                value = None
+            elif field.kind is int:
+                value = int(value)
+            values[name] = value
+
+        return self.message_class(**values)
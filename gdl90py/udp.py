@@ -0,0 +1,165 @@
+"""
+Receive messages from a UDP socket without allocating a buffer per datagram.
+"""
+
+import select
+import socket
+import typing
+from collections.abc import Iterator
+
+from gdl90py.messages._base_message import BaseMessage
+from gdl90py.parser import UNDECODABLE_FRAME_EXCEPTIONS, iter_frames, parse_message
+from gdl90py.utils.gdl90 import DEFAULT_PORT
+
+MAX_UDP_PAYLOAD = 65507
+"""
+Largest payload a UDP datagram over IPv4 can carry.
+"""
+
+
+class DatagramReceiver:
+    """
+    Receive datagrams from a UDP socket straight into a pool of preallocated
+    buffers with `socket.recv_into`, and decode them from there. Frames are
+    sliced as `memoryview`s of the buffers all the way through framing and
+    CRC checks, so the only new objects per message are the message and its
+    fields. Example:
+
+    ```python
+    with open_datagram_receiver(port=4000) as receiver:
+        for message in receiver:
+            print(message)
+    ```
+
+    Each call to `receive` (or `poll`) waits for a datagram, then reads as
+    many more as are already waiting, up to one per buffer. Frames that can
+    not be decoded are counted in `invalid`. Datagrams larger than
+    `buffer_size` are truncated by the operating system, so they are
+    counted in `truncated` and skipped.
+    """
+
+    POLL_INTERVAL = 0.1
+    """
+    How often, in seconds, iterating over the receiver checks whether it
+    has been closed.
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        buffers: int = 16,
+        buffer_size: int = MAX_UDP_PAYLOAD + 1,
+        incoming_msb: bool = True,
+        ignore_unknown: bool = False,
+    ) -> None:
+        if buffers < 1:
+            raise ValueError("buffers must be at least 1")
+
+        self.sock = sock
+        self.sock.setblocking(False)
+        self.incoming_msb = incoming_msb
+        self.ignore_unknown = ignore_unknown
+
+        self.datagrams = 0
+        self.invalid = 0
+        self.truncated = 0
+
+        self._views = [memoryview(bytearray(buffer_size)) for _ in range(buffers)]
+        self._closed = False
+
+    def receive(self, timeout: float | None = None) -> list[memoryview]:
+        """
+        Wait up to `timeout` seconds for datagrams, and return a view of each
+        one. The views point into the buffer pool, so they are only valid until
+        the next call. Returns an empty list if nothing arrived in time.
+        """
+        received = []
+        try:
+            ready, _, _ = select.select([self.sock], [], [], timeout)
+            if not ready:
+                return []
+
+            for view in self._views:
+                try:
+                    size = self.sock.recv_into(view)
+                except (BlockingIOError, InterruptedError):
+                    break
+
+                self.datagrams += 1
+                if size == len(view):
+                    self.truncated += 1
+                    continue
+
+                received.append(view[:size])
+        except (OSError, ValueError):
+            # closed from another thread
+            if self._closed:
+                return received
+            raise
+
+        return received
+
+    def poll(self, timeout: float | None = None) -> list[BaseMessage]:
+        """
+        Wait up to `timeout` seconds for datagrams, and return the messages
+        decoded from them.
+        """
+        messages = []
+
+        for datagram in self.receive(timeout):
+            for offset, length in iter_frames(datagram):
+                try:
+                    message = parse_message(
+                        datagram[offset : offset + length],
+                        self.incoming_msb,
+                        self.ignore_unknown,
+                    )
+                except UNDECODABLE_FRAME_EXCEPTIONS:
+                    self.invalid += 1
+                    continue
+
+                if message is not None:
+                    messages.append(message)
+
+        return messages
+
+    def __iter__(self) -> Iterator[BaseMessage]:
+        """
+        Yield messages as they are received, until the receiver is closed.
+        """
+        while not self._closed:
+            yield from self.poll(self.POLL_INTERVAL)
+
+    def close(self) -> None:
+        """
+        Close the socket. Iterating over the receiver then stops.
+        """
+        self._closed = True
+        self.sock.close()
+
+    def __enter__(self) -> "DatagramReceiver":
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+
+def open_datagram_receiver(
+    host: str = "0.0.0.0",
+    port: int = DEFAULT_PORT,
+    buffers: int = 16,
+    buffer_size: int = MAX_UDP_PAYLOAD + 1,
+    incoming_msb: bool = True,
+    ignore_unknown: bool = False,
+) -> DatagramReceiver:
+    """
+    Bind a `DatagramReceiver` to the given address.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.bind((host, port))
+    except OSError:
+        sock.close()
+        raise
+
+    return DatagramReceiver(sock, buffers, buffer_size, incoming_msb, ignore_unknown)
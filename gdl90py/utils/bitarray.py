@@ -13,38 +13,53 @@ def pop_bits(bitarray: BitArray, bits: int) -> BitArray:
     return value
 
 
+BIT_REVERSAL_TABLE = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+"""
+Translation table that maps every byte value to the same byte with
+the order of its bits flipped.
+"""
+
+
 def lsb(bitarray: BitArray) -> BitArray:
     """
     Flips the order of the bits in each byte.
     """
+    if len(bitarray) % 8 == 0:
+        return BitArray(bytes=bitarray.tobytes().translate(BIT_REVERSAL_TABLE))
+
     new = BitArray()
     for byte in bitarray.cut(8):
         new.append(byte[::-1])
     return new
 
 
-def lsb_bytes(bytes_: bytes | bytearray) -> bytes:
+def lsb_bytes(bytes_: bytes | bytearray | memoryview) -> bytes:
     """
     Flips the order of the bits in each byte.
     """
-    return lsb(BitArray(bytes_)).bytes
+    return bytes(bytes_).translate(BIT_REVERSAL_TABLE)
 
 
 def lsb_bytearray(bytearray_: bytearray) -> bytearray:
     """
     Flips the order of the bits in each byte.
     """
-    return bytearray(lsb(BitArray(bytearray_)).bytes)
+    return bytearray_.translate(BIT_REVERSAL_TABLE)
 
 
 def lsb_int(int_: int, length: int = 8) -> int:
     """
     Flips the order of the bits in each byte.
     """
-    return lsb(BitArray(uint=int_, length=length)).uint
+    if length % 8 != 0:
+        return lsb(BitArray(uint=int_, length=length)).uint
+
+    return int.from_bytes(
+        int_.to_bytes(length // 8, "big").translate(BIT_REVERSAL_TABLE), "big"
+    )
 
 
-def format_hex(data: BitArray | bytes | bytearray) -> str:
+def format_hex(data: BitArray | bytes | bytearray | memoryview) -> str:
     """
     Print a bitarray as seperate hexadecimal pairs.
     """
@@ -1,8 +1,15 @@
+import binascii
+import re
 from functools import cache
 
 from bitstring import BitArray
 
-from gdl90py.exceptions import InvalidCRC, MissingFlagBytes
+from gdl90py.exceptions import (
+    InvalidCRC,
+    InvalidMessageID,
+    MalformedEscape,
+    MissingFlagBytes,
+)
 from gdl90py.utils.bitarray import format_hex, lsb_bytes
 
 FLAG_BYTE = 0x7E
@@ -10,12 +17,25 @@ CONTROL_ESCAPE_BYTE = 0x7D
 ESCAPE_XOR_BYTE = 0x20
 MASK_16_BIT = 0xFFFF
 FOREFLIGHT_MESSAGE_ID = 0x65
+# standard UDP port messages are broadcast to
+DEFAULT_PORT = 4000
+
+# escaped flag and control escape bytes
+_ESCAPED_FLAG_BYTE = bytes((CONTROL_ESCAPE_BYTE, FLAG_BYTE ^ ESCAPE_XOR_BYTE))
+_ESCAPED_CONTROL_ESCAPE_BYTE = bytes(
+    (CONTROL_ESCAPE_BYTE, CONTROL_ESCAPE_BYTE ^ ESCAPE_XOR_BYTE)
+)
+# with more escapes than this, unescaping in bulk is faster
+_BULK_UNESCAPE_MIN_ESCAPES = 8
+# finds a control escape byte in any buffer, unlike `in` on a memoryview
+_CONTROL_ESCAPE_PATTERN = re.compile(re.escape(bytes((CONTROL_ESCAPE_BYTE,))))
 
 
 @cache
 def crc_table() -> list[int]:
     """
-    Builds the CRC table.
+    Builds the CRC table. The same list is returned by every call, so it must
+    not be modified. Use `CRC_TABLE` instead, which is immutable.
     """
     table = []
     for i in range(256):
@@ -27,19 +47,85 @@ def crc_table() -> list[int]:
     return table
 
 
-def compute_crc(data: bytes | bytearray) -> bytes:
+CRC_TABLE: tuple[int, ...] = tuple(crc_table())
+"""
+CRC-16/CCITT table (polynomial 0x1021), indexed by the high byte of the CRC.
+"""
+
+
+def crc16_table(data: bytes | bytearray | memoryview, crc: int = 0) -> int:
     """
-    Computes the CRC for the given input and returns 2 bytes
+    Computes the CRC as an integer, byte by byte as described in the
+    specification. A previous result can be passed as `crc` to continue it.
     """
-    crc = 0
+    table = CRC_TABLE
     for c in data:
-        m = crc << 8 & MASK_16_BIT
-        crc = crc_table()[(crc >> 8)] ^ m ^ c
+        crc = table[crc >> 8] ^ ((crc << 8) & MASK_16_BIT) ^ c
+
+    return crc
+
+
+def crc16(data: bytes | bytearray | memoryview) -> int:
+    """
+    Computes the CRC as an integer, using `binascii.crc_hqx`.
+
+    The specification shifts each byte straight into the CRC, while
+    `crc_hqx` (same polynomial) appends 16 zero bits to the data first.
+    Those 16 bits are the last 2 bytes of the data, so they are
+    combined in afterwards.
+    """
+    return binascii.crc_hqx(data[:-2], 0) ^ int.from_bytes(data[-2:], "big")
+
 
-    return crc.to_bytes(length=2, byteorder="little")
+class Crc16:
+    """
+    Incrementally computes the CRC of data that arrives in pieces,
+    such as a frame that is being unescaped.
+    """
+
+    def __init__(self, data: bytes | bytearray | memoryview = b"") -> None:
+        self._crc = 0
+        # the last 2 bytes are held back, see `crc16`
+        self._tail = b""
+        self.update(data)
+
+    def update(self, data: bytes | bytearray | memoryview) -> None:
+        """
+        Add more data.
+        """
+        if len(data) >= 2:
+            self._crc = binascii.crc_hqx(self._tail, self._crc)
+            self._crc = binascii.crc_hqx(data[:-2], self._crc)
+            self._tail = bytes(data[-2:])
+        else:
+            tail = self._tail + bytes(data)
+            self._crc = binascii.crc_hqx(tail[:-2], self._crc)
+            self._tail = tail[-2:]
+
+    @property
+    def value(self) -> int:
+        """
+        The CRC of all data so far, as an integer.
+        """
+        return self._crc ^ int.from_bytes(self._tail, "big")
+
+    def digest(self) -> bytes:
+        """
+        The CRC of all data so far, as the 2 bytes that follow it in a message.
+        """
+        return self.value.to_bytes(length=2, byteorder="little")
+
+
+def compute_crc(data: bytes | bytearray | memoryview) -> bytes:
+    """
+    Computes the CRC for the given input and returns 2 bytes
+    """
+    return crc16(data).to_bytes(length=2, byteorder="little")
 
 
-def check_crc(data: bytes | bytearray, crc: bytes | bytearray) -> None:
+def check_crc(
+    data: bytes | bytearray | memoryview, crc: bytes | bytearray | memoryview
+) -> None:
     """
     Checks if CRC is valid.
     """
@@ -52,75 +138,103 @@ def check_crc(data: bytes | bytearray, crc: bytes | bytearray) -> None:
         )
 
 
-def escape(data: bytes) -> bytearray:
+def escape(data: bytes | bytearray) -> bytes | bytearray:
     """
-    Properly escape the byte array
+    Properly escape the byte array. If nothing needs to be escaped,
+    the data is returned as is, without a copy.
     """
-    new_data = bytearray()
-    bytes_to_escape = {FLAG_BYTE, CONTROL_ESCAPE_BYTE}
-
-    for item in data:
-        if item in bytes_to_escape:
-            new_data.append(CONTROL_ESCAPE_BYTE)
-            new_data.append(item ^ ESCAPE_XOR_BYTE)
-        else:
-            new_data.append(item)
+    if FLAG_BYTE not in data and CONTROL_ESCAPE_BYTE not in data:
+        return data
 
-    return new_data
+    # control escape bytes first, so the ones added for flag bytes
+    # are not escaped again
+    return data.replace(
+        bytes((CONTROL_ESCAPE_BYTE,)), _ESCAPED_CONTROL_ESCAPE_BYTE
+    ).replace(bytes((FLAG_BYTE,)), _ESCAPED_FLAG_BYTE)
 
 
-def unescape(data: bytes | bytearray) -> bytearray:
+def unescape(
+    data: bytes | bytearray | memoryview, out: bytearray | None = None
+) -> bytearray:
     """
-    Unescape the byte array
+    Unescape the byte array. If `out` is given, its contents are replaced
+    with the result, so the same buffer can be reused.
     """
-    escaped_data = bytearray()
+    if out is None:
+        out = bytearray()
+    else:
+        out.clear()
+
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+
+    if CONTROL_ESCAPE_BYTE not in data:
+        out += data
+        return out
+
+    escapes = data.count(CONTROL_ESCAPE_BYTE)
+    if escapes >= _BULK_UNESCAPE_MIN_ESCAPES and escapes == data.count(
+        _ESCAPED_FLAG_BYTE
+    ) + data.count(_ESCAPED_CONTROL_ESCAPE_BYTE):
+        # only flag and control escape bytes are escaped, as they should be,
+        # so they can be replaced in bulk
+        out += data.replace(_ESCAPED_FLAG_BYTE, bytes((FLAG_BYTE,))).replace(
+            _ESCAPED_CONTROL_ESCAPE_BYTE, bytes((CONTROL_ESCAPE_BYTE,))
+        )
+        return out
+
+    start = 0
+    for _ in range(escapes):
+        escape_index = data.find(CONTROL_ESCAPE_BYTE, start)
+        if escape_index < 0:
+            # the last escape byte was escaped itself
+            break
 
-    while CONTROL_ESCAPE_BYTE in data:
-        escape_index = data.index(CONTROL_ESCAPE_BYTE)
         # Everything up to the escape character
-        escaped_data.extend(data[:escape_index])
+        out += data[start:escape_index]
 
-        # XOR with 0x20 to get the escaped value
-        escaped_value = data[escape_index + 1] ^ ESCAPE_XOR_BYTE
-        # Appending the escaped value
-        escaped_data.append(escaped_value)
+        if escape_index + 1 == len(data):
+            raise MalformedEscape("Data ends with an escape byte")
 
-        # Remove prefix bytes, escape, and escaped value
-        data = data[escape_index + 2 :]
+        # XOR with 0x20 to get the escaped value
+        out.append(data[escape_index + 1] ^ ESCAPE_XOR_BYTE)
+        start = escape_index + 2
 
     # Append the remaining characters after processing escapes
-    escaped_data.extend(data)
-    return escaped_data
+    out += data[start:]
+    return out
 
 
 def build(message_ids: tuple[int, ...], data: BitArray, outgoing_lsb: bool) -> bytes:
     """
     Build a message by adding ID(s), CRC, and flag bytes.
     """
-    message_id_bytes = b""
-    for message_id in message_ids:
-        message_id_bytes += message_id.to_bytes()
+    return build_bytes(message_ids, data.tobytes(), outgoing_lsb)
 
-    # add the message ID to the front
-    message_id_data = message_id_bytes + data.tobytes()
 
-    # add the CRC
-    message_id_data_crc = message_id_data + compute_crc(message_id_data)
+def build_bytes(
+    message_ids: tuple[int, ...], data: bytes | bytearray, outgoing_lsb: bool
+) -> bytes:
+    """
+    Same as `build`, but takes the message data as bytes.
+    """
+    # add the message ID to the front (each ID is a single byte)
+    message_id_data = bytearray(message_ids)
+    message_id_data += data
 
-    # escape
-    message_id_data_crc_escaped = escape(message_id_data_crc)
+    # add the CRC
+    message_id_data += compute_crc(message_id_data)
 
-    # add flag bytes
-    message_id_data_crc_escaped.insert(0, FLAG_BYTE)
-    message_id_data_crc_escaped.append(FLAG_BYTE)
+    # escape and add flag bytes
+    frame = bytearray((FLAG_BYTE,))
+    frame += escape(message_id_data)
+    frame.append(FLAG_BYTE)
 
     # flip bit order
     if outgoing_lsb:
-        message_id_data_crc_escaped = lsb_bytes(message_id_data_crc_escaped)
-    else:
-        message_id_data_crc_escaped = bytes(message_id_data_crc_escaped)
+        return lsb_bytes(frame)
 
-    return message_id_data_crc_escaped
+    return bytes(frame)
 
 
 def deconstruct(
@@ -130,6 +244,20 @@ def deconstruct(
     Deconstruct a message. Checks the CRC and returns the message ID(s)
     and the message data seperately.
     """
+    message_ids, message_data = deconstruct_bytes(data, incoming_msb)
+    return message_ids, BitArray(message_data)
+
+
+def deconstruct_bytes(
+    data: bytes | bytearray | memoryview, incoming_msb: bool
+) -> tuple[tuple[int, ...], bytes | bytearray | memoryview]:
+    """
+    Same as `deconstruct`, but returns the message data as bytes.
+
+    Given a `memoryview` of a frame with the Most Significant Bit first and
+    nothing escaped, the message data is returned as a `memoryview` of the
+    same buffer instead, without copying anything.
+    """
 
     if data[0] != FLAG_BYTE and data[-1] != FLAG_BYTE:
         raise MissingFlagBytes("Data is missing flag bytes")
@@ -142,7 +270,13 @@ def deconstruct(
         message_without_flags = lsb_bytes(message_without_flags)
 
     # Unescape the data
-    unescaped_message = unescape(message_without_flags)
+    if isinstance(
+        message_without_flags, memoryview
+    ) and not _CONTROL_ESCAPE_PATTERN.search(message_without_flags):
+        # nothing to unescape, so keep slicing the original buffer
+        unescaped_message = message_without_flags
+    else:
+        unescaped_message = unescape(message_without_flags)
 
     # Extract the data and CRC
     received_crc = unescaped_message[-2:]
@@ -152,14 +286,18 @@ def deconstruct(
     check_crc(message_id_data, received_crc)
 
     # Extract message ID and data
+    if not message_id_data:
+        raise InvalidMessageID("Data is missing a message ID")
     message_id = message_id_data[0]
 
     # ForeFlight messages have a sub ID
     if message_id == FOREFLIGHT_MESSAGE_ID:
+        if len(message_id_data) < 2:
+            raise InvalidMessageID("ForeFlight message is missing a sub ID")
         message_ids = (message_id, message_id_data[1])
         message_data = message_id_data[2:]
     else:
         message_ids = (message_id,)
         message_data = message_id_data[1:]
 
-    return message_ids, BitArray(message_data)
+    return message_ids, message_data
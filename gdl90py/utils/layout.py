@@ -0,0 +1,464 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Literal
+
+from gdl90py.exceptions import (
+    BadIntegerSize,
+    DataTooLong,
+    DataTooShort,
+    UnexpectedNegative,
+)
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    Describes where a single field lives within the data of a message,
+    and how its raw bits translate to a Python value.
+
+    Fields may overlap. This is used when a handful of bits are shared
+    between multiple attributes, such as a combined invalid value.
+    """
+
+    name: str | None
+    """
+    Attribute name on the message. None for reserved bits.
+    """
+    offset: int
+    """
+    Position of the first bit, counting from the start of the message data
+    (after the message ID(s)).
+    """
+    bits: int
+    """
+    Width of the field in bits.
+    """
+    signed: bool = False
+    """
+    Whether the raw value is a two's complement signed integer.
+    """
+    resolution: float | None = None
+    """
+    Value of a single increment of the raw value.
+    """
+    value_offset: int = 0
+    """
+    Amount subtracted from the value after the resolution is applied.
+    """
+    invalid: int | None = None
+    """
+    Raw value that represents an invalid or unavailable value (None),
+    after the byte order is applied.
+    """
+    enum: type[IntEnum] | None = None
+    """
+    Enum the raw value is a member of.
+    """
+    kind: type = int
+    """
+    Python type of the value. One of int, float, bool, str or bytes.
+    """
+    byteorder: Literal["big", "little"] = "big"
+    """
+    Byte order of the raw value.
+    """
+    encoding: Literal["ascii", "utf-8"] = "ascii"
+    """
+    Encoding of str values.
+    """
+    valid: tuple[float, float] | None = None
+    """
+    Range of values that can be encoded. Values outside of it are
+    encoded as the invalid value.
+    """
+    minimum: float | None = None
+    """
+    Values below this are encoded as this.
+    """
+    maximum: float | None = None
+    """
+    Values above this are encoded as this.
+    """
+    constrain: bool = True
+    """
+    Whether values that do not fit in the field are constrained to the
+    closest value that does. Otherwise an exception is raised.
+    """
+
+    def _convert(self) -> Callable[[int], Any]:
+        """
+        Build a function that converts a raw value into a Python value.
+        """
+        if self.enum is not None:
+            return self.enum
+
+        if self.kind is bool:
+            return bool
+
+        size = self.bits // 8
+
+        if self.kind is str:
+            encoding = self.encoding
+
+            def convert_str(raw: int) -> str:
+                # strings are padded with trailing spaces
+                return raw.to_bytes(size, "big").decode(encoding).rstrip()
+
+            return convert_str
+
+        if self.kind is bytes:
+
+            def convert_bytes(raw: int) -> bytes:
+                return raw.to_bytes(size, "big")
+
+            return convert_bytes
+
+        sign_bit = 1 << (self.bits - 1) if self.signed else 0
+        modulus = 1 << self.bits
+        resolution = self.resolution
+        value_offset = self.value_offset
+        kind = self.kind
+
+        def convert_number(raw: int) -> Any:
+            if raw & sign_bit:
+                raw -= modulus
+
+            if resolution is None:
+                return raw - value_offset
+
+            return kind(raw * resolution) - value_offset
+
+        return convert_number
+
+    def decoder(self, hook: Callable[[int], Any] | None = None) -> Callable[[int], Any]:
+        """
+        Build a function that converts a raw value into a Python value.
+        A `hook` replaces the default conversion, but the invalid value
+        and byte order are still handled.
+        """
+        convert = hook or self._convert()
+
+        if self.invalid is not None:
+            invalid = self.invalid
+            valid = convert
+
+            def convert(raw: int) -> Any:
+                if raw == invalid:
+                    return None
+                return valid(raw)
+
+        if self.byteorder == "little":
+            size = self.bits // 8
+            inner = convert
+
+            def convert(raw: int) -> Any:
+                return inner(int.from_bytes(raw.to_bytes(size, "big"), "little"))
+
+        return convert
+
+    def _convert_value(self) -> Callable[[Any, Any], int]:
+        """
+        Build a function that converts a Python value into a raw value,
+        before it is fit into the field.
+        """
+        size = self.bits // 8
+
+        if self.enum is not None:
+
+            def convert_enum(message: Any, value: IntEnum) -> int:
+                return value.value
+
+            return convert_enum
+
+        if self.kind is bool:
+
+            def convert_bool(message: Any, value: bool) -> int:
+                return 1 if value else 0
+
+            return convert_bool
+
+        if self.kind is str:
+            encoding = self.encoding
+
+            def convert_str(message: Any, value: str) -> int:
+                return pack_str(value, size, encoding)
+
+            return convert_str
+
+        if self.kind is bytes:
+
+            def convert_bytes(message: Any, value: bytes) -> int:
+                return int.from_bytes(value, "big")
+
+            return convert_bytes
+
+        minimum = self.minimum
+        maximum = self.maximum
+        resolution = self.resolution
+        value_offset = self.value_offset
+
+        def convert_number(message: Any, value: Any) -> int:
+            if minimum is not None:
+                value = max(value, minimum)
+            if maximum is not None:
+                value = min(value, maximum)
+
+            if resolution is None:
+                # clamping to a float limit can turn the value into a float
+                return int(value + value_offset)
+
+            return int((value + value_offset) / resolution)
+
+        return convert_number
+
+    def _fit(self, raw: int) -> int:
+        """
+        Fit a raw value into the width of the field, as two's complement
+        if it is signed.
+        """
+        if self.signed:
+            maximum = (1 << (self.bits - 1)) - 1
+            minimum = -maximum - 1
+            kind = "a signed"
+        else:
+            if raw < 0:
+                raise UnexpectedNegative(
+                    "Cannot serialize negative value for unsigned integer."
+                )
+            maximum = (1 << self.bits) - 1
+            minimum = 0
+            kind = "an unsigned"
+
+        if self.constrain and self.kind is not bytes:
+            raw = max(min(raw, maximum), minimum)
+        elif raw > maximum:
+            raise BadIntegerSize(
+                f"{raw} exceeds the maximum value for {kind} {self.bits}-bit integer"
+            )
+        elif raw < minimum:
+            raise BadIntegerSize(
+                f"{raw} exceeds the minimum value for {kind} {self.bits}-bit integer"
+            )
+
+        return raw & ((1 << self.bits) - 1)
+
+    def encoder(
+        self, hook: Callable[[Any, Any], int] | None = None
+    ) -> Callable[[Any, Any], int]:
+        """
+        Build a function that takes a message and the value of this field,
+        and returns the raw value. A `hook` replaces the default conversion,
+        but the invalid value, valid range, width and byte order are
+        still handled.
+        """
+        convert = hook or self._convert_value()
+        fit = self._fit
+        invalid = self.invalid
+        valid = self.valid
+        size = self.bits // 8
+        little_endian = self.byteorder == "little"
+
+        def encode(message: Any, value: Any) -> int:
+            if invalid is not None and (
+                value is None
+                or (valid is not None and not (valid[0] <= value <= valid[1]))
+            ):
+                raw = invalid
+            else:
+                raw = fit(convert(message, value))
+
+            if little_endian:
+                raw = int.from_bytes(raw.to_bytes(size, "big"), "little")
+
+            return raw
+
+        return encode
+
+
+class Layout:
+    """
+    The complete bit layout of the data of a message. Built once per message
+    class, so each message can be decoded from a single integer with
+    shifts and masks.
+    """
+
+    def __init__(self, fields: tuple[Field, ...], owner: type) -> None:
+        """
+        `owner` is the message class. A classmethod on it named
+        `_decode_<field name>` taking the raw value replaces the
+        default conversion of that field. Likewise, a method named
+        `_encode_<field name>` taking the value and returning the raw value
+        replaces the default conversion when encoding.
+        Overlapping fields are combined with a bitwise OR when encoding.
+        """
+        self.fields = fields
+        self.bits = max(field.offset + field.bits for field in fields)
+        self.size = self.bits // 8
+
+        self.unpack_value = self._build_unpack_value(owner)
+        self.pack_value = self._build_pack_value(owner)
+
+    def _build_unpack_value(self, owner: type) -> Callable[[int], dict[str, Any]]:
+        """
+        Generate a function that takes the message data as a single integer
+        and returns a dictionary of attribute values.
+        """
+        namespace: dict[str, Any] = {}
+        items = []
+
+        for i, field in enumerate(self.fields):
+            if field.name is None:
+                continue
+
+            shift = self.bits - field.offset - field.bits
+            raw = f"((value >> {shift}) & {(1 << field.bits) - 1:#x})"
+            hook = getattr(owner, f"_decode_{field.name}", None)
+
+            expression = None
+            if hook is None and field.byteorder == "big":
+                # with an invalid value, bind the raw value once to compare it
+                name = "raw" if field.invalid is not None else raw
+                expression = _decode_expression(field, name, namespace, i)
+
+            if expression is None:
+                # fall back to calling the field's decoder
+                namespace[f"decode_{i}"] = field.decoder(hook)
+                expression = f"decode_{i}({raw})"
+            elif field.invalid is not None:
+                expression = (
+                    f"None if (raw := {raw}) == {field.invalid:#x} else {expression}"
+                )
+
+            items.append(f"        {field.name!r}: {expression},")
+
+        source = "\n".join(
+            ["def unpack_value(value):", "    return {", *items, "    }"]
+        )
+        exec(source, namespace)
+        return namespace["unpack_value"]
+
+    def _build_pack_value(self, owner: type) -> Callable[[Any], int]:
+        """
+        Generate a function that takes a message and returns the message data
+        as a single integer.
+        """
+        namespace: dict[str, Any] = {}
+        items = []
+
+        for i, field in enumerate(self.fields):
+            if field.name is None:
+                continue
+
+            shift = self.bits - field.offset - field.bits
+            value = f"message.{field.name}"
+            hook = getattr(owner, f"_encode_{field.name}", None)
+
+            if hook is None and field.enum is not None:
+                # every member is known to fit, so the value can be used as is
+                if max(field.enum) >> field.bits:
+                    raise ValueError(f"{field.enum} does not fit in {field.bits} bits")
+                expression = f"{value}.value"
+            elif hook is None and field.kind is bool:
+                expression = f"(1 if {value} else 0)"
+            else:
+                namespace[f"encode_{i}"] = field.encoder(hook)
+                expression = f"encode_{i}(message, {value})"
+
+            items.append(f"({expression} << {shift})")
+
+        source = "def pack_value(message):\n    return " + (" | ".join(items) or "0")
+        exec(source, namespace)
+        return namespace["pack_value"]
+
+    def check_bits(self, bits: int) -> None:
+        """
+        Raise an exception if data of the given number of bits
+        does not match the layout.
+        """
+        if bits > self.bits:
+            raise DataTooLong(f"Data is {bits} bits long")
+        if bits < self.bits:
+            raise DataTooShort(f"Data is {bits} bits long")
+
+    def unpack(self, data: bytes | bytearray | memoryview) -> dict[str, Any]:
+        """
+        Decode the data of a message into a dictionary of attribute values.
+        """
+        if len(data) != self.size:
+            self.check_bits(len(data) * 8)
+
+        return self.unpack_value(int.from_bytes(data, "big"))
+
+    def pack(self, message: Any) -> bytes:
+        """
+        Encode the attribute values of a message into the data of a message.
+        """
+        return self.pack_value(message).to_bytes(self.size, "big")
+
+
+def pack_str(value: str, size: int, encoding: Literal["ascii", "utf-8"]) -> int:
+    """
+    Convert a string into the raw value of a field that is `size` bytes long.
+    The string is padded with trailing spaces, and extra characters are removed.
+    """
+    value_bytes = value.ljust(size)[:size].encode(encoding)[:size]
+    return int.from_bytes(value_bytes, "big")
+
+
+def _decode_expression(
+    field: Field, raw: str, namespace: dict[str, Any], index: int
+) -> str | None:
+    """
+    Python expression that converts the raw value (named by `raw`) of a field
+    into its Python value, without any function calls where possible.
+    Returns None if the field can not be expressed inline.
+    """
+    if field.enum is not None:
+        namespace[f"enum_{index}"] = _EnumLookup(field.enum)
+        return f"enum_{index}[{raw}]"
+
+    if field.kind is bool:
+        return f"{raw} != 0"
+
+    if field.kind is str:
+        return (
+            f"{raw}.to_bytes({field.bits // 8}, 'big')"
+            f".decode({field.encoding!r}).rstrip()"
+        )
+
+    if field.kind is bytes:
+        return f"{raw}.to_bytes({field.bits // 8}, 'big')"
+
+    if field.kind not in (int, float):
+        return None
+
+    expression = raw
+    if field.signed:
+        # flipping the sign bit and then subtracting it sign-extends the value
+        sign_bit = 1 << (field.bits - 1)
+        expression = f"(({expression} ^ {sign_bit:#x}) - {sign_bit:#x})"
+    if field.resolution is not None:
+        expression = f"{expression} * {field.resolution!r}"
+        if field.kind is int:
+            expression = f"int({expression})"
+    if field.value_offset:
+        expression = f"({expression} - {field.value_offset})"
+
+    return expression
+
+
+class _EnumLookup(dict):
+    """
+    Maps raw values to enum members. Unknown values are passed to the
+    enum itself, so they raise the usual ValueError.
+    """
+
+    def __init__(self, enum: type[IntEnum]) -> None:
+        super().__init__((member.value, member) for member in enum)
+        self.enum = enum
+
+    def __missing__(self, key: int) -> IntEnum:
+        return self.enum(key)
@@ -0,0 +1,155 @@
+import threading
+
+
+class RingBuffer:
+    """
+    Preallocated circular byte buffer shared by one producer thread and one
+    consumer thread. Neither side copies data: the producer reads directly into
+    `writable()` and calls `commit`, the consumer looks at `readable()` and calls
+    `release` once done with it.
+
+    When the consumer falls behind and the buffer is full, new data is discarded
+    rather than overwriting data the consumer has not released, and counted as
+    an overrun.
+
+    `spare` bytes are allocated past the end of the buffer. When unread data
+    wraps around, up to that many bytes from the start are mirrored there, so
+    `readable()` can return them contiguously.
+    """
+
+    def __init__(self, capacity: int, spare: int = 0) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.capacity = capacity
+        self.spare = spare
+
+        self._buffer = bytearray(capacity + spare)
+        self._view = memoryview(self._buffer)
+        # data that arrives while full is read into here and thrown away
+        self._scratch = memoryview(bytearray(min(capacity, 4096)))
+
+        # total number of bytes ever written and released. Only the
+        # producer changes `_written` and only the consumer changes `_released`
+        self._written = 0
+        self._released = 0
+        self._full = False
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self.overruns = 0
+        """
+        Number of writes discarded because the buffer was full.
+        """
+        self.overrun_bytes = 0
+        """
+        Number of bytes discarded because the buffer was full.
+        """
+
+    def __len__(self) -> int:
+        """
+        Number of bytes written but not yet released.
+        """
+        return self._written - self._released
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def writable(self) -> memoryview:
+        """
+        Return the contiguous free space to write into. If the buffer is full,
+        a scratch area is returned instead, and anything committed to it is
+        discarded.
+        """
+        used = len(self)
+        if used == self.capacity:
+            self._full = True
+            return self._scratch
+
+        self._full = False
+        start = self._written % self.capacity
+        end = min(self.capacity, start + self.capacity - used)
+        return self._view[start:end]
+
+    def commit(self, count: int) -> None:
+        """
+        Mark `count` bytes of the last `writable()` as written.
+        """
+        if self._full:
+            if count:
+                self.overruns += 1
+                self.overrun_bytes += count
+            return
+
+        with self._condition:
+            self._written += count
+            self._condition.notify_all()
+
+    def write(self, data: bytes | bytearray | memoryview) -> int:
+        """
+        Copy `data` into the buffer, for producers that can not write into
+        `writable()` directly. Returns the number of bytes written; the rest
+        is counted as an overrun.
+        """
+        written = 0
+        while written < len(data):
+            view = self.writable()
+            if self._full:
+                break
+
+            count = min(len(view), len(data) - written)
+            view[:count] = data[written : written + count]
+            self.commit(count)
+            written += count
+
+        if written < len(data):
+            self.overruns += 1
+            self.overrun_bytes += len(data) - written
+
+        return written
+
+    def readable(self) -> memoryview:
+        """
+        Return the unread data. If it wraps around the end of the buffer,
+        only the part up to the end plus at most `spare` bytes from the start
+        are returned.
+        """
+        used = len(self)
+        start = self._released % self.capacity
+        contiguous = min(used, self.capacity - start)
+
+        if contiguous < used and self.spare:
+            mirrored = min(used - contiguous, self.spare)
+            self._view[self.capacity : self.capacity + mirrored] = self._view[:mirrored]
+            contiguous += mirrored
+
+        return self._view[start : start + contiguous]
+
+    def release(self, count: int) -> None:
+        """
+        Mark `count` bytes from the start of `readable()` as consumed, making
+        room for the producer.
+        """
+        if count > len(self):
+            raise ValueError("Can not release more than has been written")
+
+        with self._condition:
+            self._released += count
+
+    def wait(self, size: int = 0, timeout: float | None = None) -> bool:
+        """
+        Wait until there are more than `size` unread bytes, or the buffer is
+        closed. Returns True if there are.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: len(self) > size or self._closed, timeout)
+            return len(self) > size
+
+    def close(self) -> None:
+        """
+        Mark that nothing more will be written, waking up any waiting consumer.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
@@ -0,0 +1,469 @@
+"""
+Stream decoded messages to web browsers as JSON, over WebSocket or
+Server-Sent Events, with asyncio.
+"""
+
+import asyncio
+import base64
+import collections
+import dataclasses
+import datetime
+import enum
+import functools
+import hashlib
+import json
+import struct
+import time
+import typing
+from collections.abc import AsyncIterable, Iterable
+
+from gdl90py.messages._base_message import BaseMessage
+from gdl90py.messages.heartbeat import HeartbeatMessage
+from gdl90py.messages.ownship_geometric_altitude import OwnshipGeometricAltitudeMessage
+from gdl90py.messages.ownship_report import OwnshipReportMessage
+from gdl90py.messages.traffic_report import TrafficReportMessage
+
+DEFAULT_MESSAGE_TYPES: tuple[type[BaseMessage], ...] = (
+    HeartbeatMessage,
+    OwnshipReportMessage,
+    OwnshipGeometricAltitudeMessage,
+    TrafficReportMessage,
+)
+
+_WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_OPCODE_TEXT = 0x1
+_OPCODE_CLOSE = 0x8
+_OPCODE_PING = 0x9
+_OPCODE_PONG = 0xA
+# browsers only send small control frames to a feed
+_MAX_CLIENT_FRAME = 4096
+
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+@functools.cache
+def _field_names(message_class: type[BaseMessage]) -> tuple[str, ...]:
+    return tuple(field.name for field in dataclasses.fields(message_class))
+
+
+def _json_value(value: typing.Any) -> typing.Any:
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, datetime.time):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+def message_to_dict(message: BaseMessage) -> dict[str, typing.Any]:
+    """
+    Convert a message into a dictionary of JSON types, with its class name
+    under `"type"`. Enums are given by name, times as ISO 8601 strings, and
+    bytes as hex strings.
+    """
+    result: dict[str, typing.Any] = {"type": type(message).__name__}
+    for name in _field_names(type(message)):
+        result[name] = _json_value(getattr(message, name))
+    return result
+
+
+def encode_message(message: BaseMessage) -> bytes:
+    """
+    Encode a message as compact JSON, in UTF-8.
+    """
+    return _encoder.encode(message_to_dict(message)).encode()
+
+
+def _websocket_frame(payload: bytes, opcode: int = _OPCODE_TEXT) -> bytes:
+    """
+    Build a single unmasked WebSocket frame, as sent by a server.
+    """
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def _response(
+    status: str,
+    body: bytes = b"",
+    content_type: str = "text/plain; charset=utf-8",
+    allow_origin: str | None = None,
+) -> bytes:
+    headers = [
+        f"HTTP/1.1 {status}",
+        f"Content-Type: {content_type}",
+        f"Content-Length: {len(body)}",
+        "Cache-Control: no-cache",
+        "Connection: close",
+    ]
+    if allow_origin is not None:
+        headers.append(f"Access-Control-Allow-Origin: {allow_origin}")
+    return ("\r\n".join(headers) + "\r\n\r\n").encode() + body
+
+
+class _Subscriber:
+    """
+    One connected browser. Updates are queued here and written by its own
+    task, so a slow client only holds up itself.
+    """
+
+    def __init__(
+        self, writer: asyncio.StreamWriter, websocket: bool, max_queue: int
+    ) -> None:
+        self.writer = writer
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.queue: collections.deque[bytes] = collections.deque()
+        self.ready = asyncio.Event()
+
+    def put(self, chunk: bytes) -> bool:
+        """
+        Queue an update, dropping the oldest if the queue is full.
+        Returns False if one was dropped.
+        """
+        dropped = len(self.queue) >= self.max_queue
+        if dropped:
+            self.queue.popleft()
+        self.queue.append(chunk)
+        self.ready.set()
+        return not dropped
+
+    async def send_forever(self) -> None:
+        while True:
+            await self.ready.wait()
+            self.ready.clear()
+            chunks = list(self.queue)
+            self.queue.clear()
+            self.writer.writelines(chunks)
+            # waits while the client is behind, with updates queuing meanwhile
+            await self.writer.drain()
+
+
+class WebBridge:
+    """
+    HTTP server that streams messages to browsers as JSON. Example:
+
+    ```python
+    async with await open_udp_receiver() as receiver:
+        await WebBridge(port=8080).run(receiver)
+    ```
+
+    It serves:
+    - `/ws`, a WebSocket sending each message as a text message.
+    - `/events`, the same as Server-Sent Events, for `EventSource`.
+    - `/traffic`, a snapshot of the latest ownship report and the latest
+      traffic report of every target heard from in the last
+      `traffic_timeout` seconds, as `{"ownship": ..., "traffic": [...]}`.
+
+    Messages are encoded by `encode_message`. Only `message_types` are
+    published. Each message is encoded once, however many clients are
+    connected, and the snapshot is only encoded again after it changes.
+
+    Every client has a queue of at most `max_queue` updates waiting to be
+    sent. When a client can not keep up, its oldest queued updates are
+    dropped, and counted in `dropped`, so it never holds up the other
+    clients or makes memory grow.
+
+    `publish` must be called from the event loop the server is running on.
+    Set `port` to 0 to pick any free port; it is updated once started.
+    """
+
+    REQUEST_TIMEOUT = 10.0
+    """
+    How long, in seconds, a client has to send its request.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        message_types: Iterable[type[BaseMessage]] = DEFAULT_MESSAGE_TYPES,
+        max_queue: int = 256,
+        traffic_timeout: float = 30.0,
+        allow_origin: str | None = "*",
+    ) -> None:
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+
+        self.host = host
+        self.port = port
+        self.message_types = frozenset(message_types)
+        self.max_queue = max_queue
+        self.traffic_timeout = traffic_timeout
+        self.allow_origin = allow_origin
+
+        self.published = 0
+        self.dropped = 0
+
+        self._server: asyncio.Server | None = None
+        self._subscribers: set[_Subscriber] = set()
+        self._connections: set[asyncio.StreamWriter] = set()
+        # latest encoded reports, with when they were received
+        self._ownship: tuple[float, bytes] | None = None
+        self._traffic: dict[int, tuple[float, bytes]] = {}
+        self._snapshot: bytes | None = None
+
+    @property
+    def subscribers(self) -> int:
+        """
+        Number of clients connected to `/ws` or `/events`.
+        """
+        return len(self._subscribers)
+
+    def publish(self, message: BaseMessage) -> None:
+        """
+        Send a message to every client, and update the snapshot.
+        """
+        if type(message) not in self.message_types:
+            return
+
+        payload = encode_message(message)
+        self.published += 1
+
+        if isinstance(message, TrafficReportMessage):
+            self._traffic[message.address] = (time.monotonic(), payload)
+            self._snapshot = None
+        elif isinstance(message, OwnshipReportMessage):
+            self._ownship = (time.monotonic(), payload)
+            self._snapshot = None
+
+        # framed at most once per protocol
+        event = frame = None
+        for subscriber in self._subscribers:
+            if subscriber.websocket:
+                if frame is None:
+                    frame = _websocket_frame(payload)
+                chunk = frame
+            else:
+                if event is None:
+                    event = b"data: " + payload + b"\n\n"
+                chunk = event
+
+            if not subscriber.put(chunk):
+                self.dropped += 1
+
+    def snapshot(self) -> bytes:
+        """
+        Return the snapshot served at `/traffic`, as JSON.
+        """
+        cutoff = time.monotonic() - self.traffic_timeout
+
+        stale = [
+            address
+            for address, (received, _) in self._traffic.items()
+            if received < cutoff
+        ]
+        for address in stale:
+            del self._traffic[address]
+        if stale:
+            self._snapshot = None
+
+        if self._ownship is not None and self._ownship[0] < cutoff:
+            self._ownship = None
+            self._snapshot = None
+
+        if self._snapshot is None:
+            ownship = b"null" if self._ownship is None else self._ownship[1]
+            traffic = b",".join(payload for _, payload in self._traffic.values())
+            self._snapshot = (
+                b'{"ownship":' + ownship + b',"traffic":[' + traffic + b"]}"
+            )
+
+        return self._snapshot
+
+    async def start(self) -> None:
+        """
+        Start accepting connections.
+        """
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def run(self, messages: AsyncIterable[BaseMessage]) -> None:
+        """
+        Start the server if needed, and publish messages until they run out.
+        Then close the server.
+        """
+        if self._server is None:
+            await self.start()
+        try:
+            async for message in messages:
+                self.publish(message)
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """
+        Stop accepting connections, and disconnect every client.
+        """
+        if self._server is None:
+            return
+        server = self._server
+        self._server = None
+
+        server.close()
+        for writer in self._connections:
+            writer.close()
+        await server.wait_closed()
+
+    async def __aenter__(self) -> "WebBridge":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: typing.Any) -> None:
+        await self.close()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._connections.add(writer)
+        try:
+            try:
+                request = await asyncio.wait_for(
+                    reader.readuntil(b"\r\n\r\n"), self.REQUEST_TIMEOUT
+                )
+            except (
+                asyncio.IncompleteReadError,
+                asyncio.LimitOverrunError,
+                TimeoutError,
+            ):
+                return
+
+            try:
+                method, path, headers = _parse_request(request)
+            except ValueError:
+                writer.write(_response("400 Bad Request", b"Bad request\n"))
+                return
+
+            if method != "GET":
+                writer.write(_response("405 Method Not Allowed", b"GET only\n"))
+            elif path == "/traffic":
+                writer.write(
+                    _response(
+                        "200 OK", self.snapshot(), "application/json", self.allow_origin
+                    )
+                )
+            elif path == "/events":
+                writer.write(self._event_stream_headers())
+                await self._stream(reader, writer, websocket=False)
+            elif path == "/ws":
+                key = headers.get("sec-websocket-key")
+                if headers.get("upgrade", "").lower() != "websocket" or key is None:
+                    writer.write(_response("400 Bad Request", b"Expected WebSocket\n"))
+                    return
+                writer.write(_websocket_handshake(key))
+                await self._stream(reader, writer, websocket=True)
+            else:
+                writer.write(_response("404 Not Found", b"Not found\n"))
+        except OSError:
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    def _event_stream_headers(self) -> bytes:
+        headers = [
+            "HTTP/1.1 200 OK",
+            "Content-Type: text/event-stream",
+            "Cache-Control: no-cache",
+        ]
+        if self.allow_origin is not None:
+            headers.append(f"Access-Control-Allow-Origin: {self.allow_origin}")
+        return ("\r\n".join(headers) + "\r\n\r\n").encode()
+
+    async def _stream(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        websocket: bool,
+    ) -> None:
+        """
+        Send updates to a client until either side closes the connection.
+        """
+        subscriber = _Subscriber(writer, websocket, self.max_queue)
+        self._subscribers.add(subscriber)
+
+        sending = asyncio.create_task(subscriber.send_forever())
+        receiving = asyncio.create_task(
+            _read_websocket(reader, writer) if websocket else _read_until_closed(reader)
+        )
+        try:
+            await asyncio.wait(
+                (sending, receiving), return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            self._subscribers.discard(subscriber)
+            sending.cancel()
+            receiving.cancel()
+            await asyncio.gather(sending, receiving, return_exceptions=True)
+
+
+def _parse_request(request: bytes) -> tuple[str, str, dict[str, str]]:
+    """
+    Return the method, path (without any query) and headers of a request,
+    with header names in lower case.
+    """
+    lines = request.decode("latin-1").split("\r\n")
+    method, target, _ = lines[0].split(" ")
+
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    return method, target.partition("?")[0], headers
+
+
+def _websocket_handshake(key: str) -> bytes:
+    accept = base64.b64encode(hashlib.sha1(key.encode() + _WEBSOCKET_GUID).digest())
+    return (
+        b"HTTP/1.1 101 Switching Protocols\r\n"
+        b"Upgrade: websocket\r\n"
+        b"Connection: Upgrade\r\n"
+        b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+    )
+
+
+async def _read_until_closed(reader: asyncio.StreamReader) -> None:
+    while await reader.read(1024):
+        pass
+
+
+async def _read_websocket(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """
+    Answer pings, and ignore anything else the client sends until it closes
+    the connection.
+    """
+    try:
+        while True:
+            first, second = await reader.readexactly(2)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                (length,) = struct.unpack("!H", await reader.readexactly(2))
+            elif length == 127:
+                (length,) = struct.unpack("!Q", await reader.readexactly(8))
+            if length > _MAX_CLIENT_FRAME:
+                return
+
+            mask = await reader.readexactly(4) if second & 0x80 else bytes(4)
+            payload = bytes(
+                byte ^ mask[index % 4]
+                for index, byte in enumerate(await reader.readexactly(length))
+            )
+
+            if opcode == _OPCODE_CLOSE:
+                writer.write(_websocket_frame(payload[:2], _OPCODE_CLOSE))
+                return
+            if opcode == _OPCODE_PING:
+                writer.write(_websocket_frame(payload, _OPCODE_PONG))
+    except asyncio.IncompleteReadError:
+        return
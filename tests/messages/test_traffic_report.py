@@ -9,7 +9,7 @@ from gdl90py.enums import (
     Integrity,
     TrackType,
 )
-from gdl90py.exceptions import DataTooLong, InvalidCallsign
+from gdl90py.exceptions import DataTooLong, DataTooShort, InvalidCallsign
 from gdl90py.messages.traffic_report import TrafficReportMessage
 
 
@@ -110,6 +110,32 @@ def test_traffic_report_serialize_invalid_longitude(longitude: float):
     assert tr.serialize(outgoing_lsb=False)[9:12] == b"\x00\x00\x00"
 
 
+def test_traffic_report_traffic_alert_round_trip():
+    tr = TrafficReportMessage(
+        traffic_alert=True,
+        address_type=AddressType.ads_b_icao,
+        address=int("52642511", 8),
+        latitude=44.90708,
+        longitude=-122.99488,
+        pressure_altitude=5000,
+        track_type=TrackType.true_track_angle,
+        report_extrapolated=False,
+        airborne=True,
+        integrity=Integrity.less_than_25_m_hpl_and_37_5_m_vpl,
+        accuracy=Accuracy.less_than_30_m_hfom_and_45_m_vfom,
+        horizontal_velocity=123,
+        vertical_velocity=64,
+        track=45,
+        emitter_category=EmitterCategory.light,
+        callsign="N825V",
+        emergency_priority_code=EmergencyPriorityCode.no_emergency,
+    )
+    data = tr.serialize(outgoing_lsb=False)
+    # traffic alert status is the upper nibble of the first byte
+    assert data[2] == 0x10
+    assert TrafficReportMessage.deserialize(data).traffic_alert is True
+
+
 @pytest.mark.parametrize(
     "pressure_altitude, expected",
     (
@@ -407,3 +433,8 @@ def test_traffic_report_deserialize_too_long():
         TrafficReportMessage.deserialize(
             b"\x7e\x14\x00\xab\x45\x49\x1f\xef\x15\xa8\x89\x78\x0f\x09\xa9\x07\xb0\x01\x20\x01\x4e\x38\x32\x35\x56\x20\x20\x20\x00\x00\xbb\xfc\x7e"
         )
+
+
+def test_traffic_report_deserialize_too_short():
+    with pytest.raises(DataTooShort):
+        TrafficReportMessage.unpack(bytes(26))
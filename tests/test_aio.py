@@ -0,0 +1,280 @@
+import asyncio
+import socket
+import typing
+from collections.abc import AsyncIterable
+
+import pytest
+
+from gdl90py.aio import (
+    Broadcaster,
+    StreamReceiver,
+    UDPReceiver,
+    open_tcp_receiver,
+    open_udp_receiver,
+    pack_datagrams,
+)
+from gdl90py.messages._base_message import BaseMessage
+from gdl90py.messages.height_above_terrain import HeightAboveTerrainMessage
+from gdl90py.messages.initialization import InitializationMessage
+
+
+def frame(i: int) -> bytes:
+    return HeightAboveTerrainMessage(height_above_terrain=i).serialize(
+        outgoing_lsb=False
+    )
+
+
+def height(message: BaseMessage) -> int | None:
+    assert isinstance(message, HeightAboveTerrainMessage)
+    return message.height_above_terrain
+
+
+async def receive(receiver: AsyncIterable[BaseMessage], count: int) -> list:
+    messages = []
+    async for message in receiver:
+        messages.append(height(message))
+        if len(messages) == count:
+            break
+    return messages
+
+
+async def wait_for(condition, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.001)
+
+
+def address(receiver: UDPReceiver) -> tuple[str, int]:
+    assert receiver.transport is not None
+    return receiver.transport.get_extra_info("sockname")
+
+
+def send(receiver: UDPReceiver, *datagrams: bytes) -> None:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        for datagram in datagrams:
+            sock.sendto(datagram, address(receiver))
+
+
+def test_udp_receiver():
+    async def main():
+        async with await open_udp_receiver("127.0.0.1", 0) as receiver:
+            # multiple frames in one datagram, and a truncated frame
+            send(receiver, frame(1) + frame(2), frame(3)[:-1], frame(4))
+            return await asyncio.wait_for(receive(receiver, 3), 2)
+
+    assert asyncio.run(main()) == [1, 2, 4]
+
+
+def test_udp_receiver_invalid():
+    async def main():
+        async with await open_udp_receiver("127.0.0.1", 0) as receiver:
+            bad_crc = frame(1)[:-3] + b"\x00\x00\x7e"
+            unknown = b"\x7e\x55\x00\x00\x50\x0a\x7e"
+            # valid CRCs, but no message ID, and no ForeFlight sub ID
+            empty = b"\x7e\x00\x00\x7e"
+            no_sub_id = b"\x7e\x65\x65\x00\x7e"
+            send(receiver, bad_crc + frame(2), unknown, empty + no_sub_id, frame(3))
+            messages = await asyncio.wait_for(receive(receiver, 2), 2)
+            return messages, receiver.invalid
+
+    assert asyncio.run(main()) == ([2, 3], 4)
+
+
+def test_udp_receiver_drop_oldest():
+    async def main():
+        async with await open_udp_receiver("127.0.0.1", 0, maxsize=2) as receiver:
+            send(receiver, frame(1), frame(2), frame(3))
+            await wait_for(lambda: receiver.dropped == 1)
+            return await receive(receiver, 2)
+
+    assert asyncio.run(main()) == [2, 3]
+
+
+def test_udp_receiver_block():
+    async def main():
+        async with await open_udp_receiver(
+            "127.0.0.1", 0, maxsize=2, overflow="block"
+        ) as receiver:
+            send(receiver, frame(1) + frame(2))
+            transport = typing.cast(asyncio.ReadTransport, receiver.transport)
+            await wait_for(lambda: not transport.is_reading())
+            send(receiver, frame(3))
+            messages = await asyncio.wait_for(receive(receiver, 3), 2)
+            return messages, receiver.dropped
+
+    assert asyncio.run(main()) == ([1, 2, 3], 0)
+
+
+def test_udp_receiver_stops_when_closed():
+    async def main():
+        receiver = await open_udp_receiver("127.0.0.1", 0)
+        send(receiver, frame(1))
+        await wait_for(lambda: receiver._queue.qsize() == 1)
+        receiver.close()
+        return [message async for message in receiver]
+
+    assert asyncio.run(main()) == [HeightAboveTerrainMessage(height_above_terrain=1)]
+
+
+def test_udp_receiver_bad_arguments():
+    with pytest.raises(ValueError):
+        UDPReceiver(maxsize=0)
+
+    with pytest.raises(ValueError):
+        UDPReceiver(overflow="drop_newest")  # type: ignore
+
+
+def test_pack_datagrams():
+    assert pack_datagrams([b"a" * 3, b"b" * 3, b"c" * 3, b"d" * 8], 7) == [
+        b"aaabbb",
+        b"ccc",
+        b"dddddddd",
+    ]
+    assert pack_datagrams([]) == []
+
+
+def test_broadcaster():
+    initialization = InitializationMessage(
+        audio_test=False,
+        audio_inhibit=False,
+        CDTI_ok=True,
+        CSA_audio_disable=False,
+        CSA_disable=False,
+    )
+
+    def provider(message_class):
+        if message_class is InitializationMessage:
+            return [initialization]
+        # enough to need more than one datagram
+        return [HeightAboveTerrainMessage(height_above_terrain=i) for i in range(300)]
+
+    async def main():
+        async with await open_udp_receiver(
+            "127.0.0.1", 0, maxsize=10_000, incoming_msb=False
+        ) as receiver:
+            broadcaster = Broadcaster(
+                provider,
+                {InitializationMessage: 50, HeightAboveTerrainMessage: 10},
+                targets=[address(receiver)],
+            )
+            task = asyncio.create_task(broadcaster.run())
+            await asyncio.sleep(0.25)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            await wait_for(lambda: receiver._queue.qsize() > 0)
+            await asyncio.sleep(0.05)
+            receiver.close()
+            messages = [message async for message in receiver]
+            return broadcaster, messages
+
+    broadcaster, messages = asyncio.run(main())
+    assert broadcaster.transport is None
+
+    stats = broadcaster.stats[InitializationMessage]
+    assert 10 <= stats.sends <= 14
+    assert stats.frames == stats.datagrams == stats.sends
+    assert stats.jitter.count == stats.latency.count == stats.sends
+    assert 0 <= stats.latency.mean <= stats.latency.maximum
+
+    stats = broadcaster.stats[HeightAboveTerrainMessage]
+    assert 2 <= stats.sends <= 4
+    assert stats.frames == 300 * stats.sends
+    assert stats.datagrams > stats.sends
+
+    assert (
+        messages.count(initialization) == broadcaster.stats[InitializationMessage].sends
+    )
+
+
+def test_broadcaster_bad_rate():
+    with pytest.raises(ValueError):
+        Broadcaster(lambda message_class: [], {InitializationMessage: 0})
+
+    with pytest.raises(ValueError):
+        Broadcaster(lambda message_class: [], {})
+
+
+async def serve(*sessions: bytes):
+    """
+    Start a TCP server that sends each session's data to a new connection,
+    split into small writes, then closes it.
+    """
+    remaining = list(sessions)
+
+    async def handle(reader, writer):
+        data = remaining.pop(0) if remaining else b""
+        for i in range(0, len(data), 3):
+            writer.write(data[i : i + 3])
+            await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def test_tcp_receiver():
+    async def main():
+        server = await serve(frame(1) + b"\x7e\x55\x00\x00\x50\x0a\x7e" + frame(2))
+        async with server:
+            host, port = server.sockets[0].getsockname()
+            async with open_tcp_receiver(host, port, reconnect=False) as receiver:
+                messages = [height(m) async for m in receiver]
+                return messages, receiver.invalid
+
+    assert asyncio.run(main()) == ([1, 2], 1)
+
+
+def test_tcp_receiver_reconnects():
+    async def main():
+        # the partial frame at the end of the first session is dropped
+        server = await serve(frame(1) + frame(2)[:-2], frame(3))
+        async with server:
+            host, port = server.sockets[0].getsockname()
+            async with open_tcp_receiver(host, port, reconnect_delay=0.01) as receiver:
+                messages = await asyncio.wait_for(receive(receiver, 2), 2)
+                return messages, receiver.reconnects
+
+    assert asyncio.run(main()) == ([1, 3], 1)
+
+
+def test_tcp_receiver_connection_refused():
+    with socket.create_server(("127.0.0.1", 0)) as sock:
+        host, port = sock.getsockname()
+
+    async def main():
+        receiver = open_tcp_receiver(host, port, reconnect=False)
+        with pytest.raises(ConnectionRefusedError):
+            await anext(receiver)
+
+        # keeps trying until closed
+        receiver = open_tcp_receiver(host, port, reconnect_delay=0.01)
+        task = asyncio.create_task(anext(receiver))
+        await wait_for(lambda: receiver.error is not None)
+        receiver.close()
+        with pytest.raises(StopAsyncIteration):
+            await task
+
+    asyncio.run(main())
+
+
+def test_stream_receiver_close():
+    async def main():
+        reader = asyncio.StreamReader()
+        reader.feed_data(frame(1) + frame(2)[:4])
+
+        async def connect():
+            return reader, None
+
+        receiver = StreamReceiver(connect, reconnect=False)
+        assert height(await anext(receiver)) == 1
+
+        task = asyncio.create_task(anext(receiver))
+        await asyncio.sleep(0.01)
+        reader.feed_data(frame(2)[4:])
+        assert height(await task) == 2
+
+        reader.feed_eof()
+        assert [m async for m in receiver] == []
+
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+import math
+from typing import Any
+
+import pytest
+
+from gdl90py.enums import (
+    Accuracy,
+    AddressType,
+    EmergencyPriorityCode,
+    EmitterCategory,
+    Integrity,
+    TrackType,
+)
+from gdl90py.exceptions import InvalidCRC
+from gdl90py.messages.ownship_report import OwnshipReportMessage
+from gdl90py.messages.traffic_report import TrafficReportMessage
+
+np = pytest.importorskip("numpy")
+
+from gdl90py.batch import decode_traffic_batch  # noqa: E402
+
+
+def traffic_report(i: int, **kwargs) -> TrafficReportMessage:
+    values: dict[str, Any] = dict(
+        traffic_alert=bool(i % 2),
+        address_type=AddressType.ads_b_icao,
+        address=0xABC000 + i,
+        latitude=44.90708 - i / 100,
+        longitude=-122.99488 + i / 100,
+        pressure_altitude=5000 + i * 100,
+        track_type=TrackType.true_track_angle,
+        report_extrapolated=False,
+        airborne=True,
+        integrity=Integrity.less_than_25_m_hpl_and_37_5_m_vpl,
+        accuracy=Accuracy.less_than_30_m_hfom_and_45_m_vfom,
+        horizontal_velocity=123 + i,
+        vertical_velocity=-64 * i,
+        track=45 + i,
+        emitter_category=EmitterCategory.light,
+        callsign=f"N{i}",
+        emergency_priority_code=EmergencyPriorityCode.no_emergency,
+    )
+    values.update(kwargs)
+    return TrafficReportMessage(**values)
+
+
+MESSAGES = [traffic_report(i) for i in range(20)] + [
+    traffic_report(20, pressure_altitude=None, horizontal_velocity=None),
+    # contains bytes that need to be escaped
+    traffic_report(21, address=0x7E7D7E),
+]
+
+
+def assert_columns_match(columns: dict, messages: list[TrafficReportMessage]) -> None:
+    for name, column in columns.items():
+        assert len(column) == len(messages)
+        for value, message in zip(column, messages):
+            expected = getattr(message, name)
+            if expected is None:
+                assert math.isnan(value)
+            elif isinstance(expected, float):
+                assert value == pytest.approx(expected)
+            else:
+                assert value == expected
+
+
+@pytest.mark.parametrize("outgoing_lsb", [True, False])
+def test_decode_traffic_batch(outgoing_lsb: bool):
+    frames = [message.serialize(outgoing_lsb=outgoing_lsb) for message in MESSAGES]
+    columns = decode_traffic_batch(frames, incoming_msb=not outgoing_lsb)
+
+    expected = [
+        TrafficReportMessage.deserialize(frame, incoming_msb=not outgoing_lsb)
+        for frame in frames
+    ]
+    assert_columns_match(columns, expected)
+
+
+def test_decode_traffic_batch_dtypes():
+    columns = decode_traffic_batch([message.serialize() for message in MESSAGES], False)
+    assert columns["address"].dtype == np.uint32
+    assert columns["latitude"].dtype == np.float64
+    assert columns["pressure_altitude"].dtype == np.float64
+    assert columns["airborne"].dtype == np.bool_
+    assert columns["callsign"][1] == "N1"
+
+
+def test_decode_traffic_batch_empty():
+    columns = decode_traffic_batch([])
+    assert len(columns["address"]) == 0
+
+
+def test_decode_traffic_batch_ownship():
+    message = OwnshipReportMessage(**traffic_report(1).__dict__)
+    columns = decode_traffic_batch(
+        [message.serialize(outgoing_lsb=False)], message_class=OwnshipReportMessage
+    )
+    assert columns["address"][0] == message.address
+
+
+def test_decode_traffic_batch_invalid():
+    frames = [message.serialize(outgoing_lsb=False) for message in MESSAGES[:3]]
+    frames[1] = frames[1][:-3] + b"\x00\x00\x7e"
+    with pytest.raises(InvalidCRC):
+        decode_traffic_batch(frames)
+
+
+def test_decode_traffic_batch_ignore_invalid():
+    frames = [message.serialize(outgoing_lsb=False) for message in MESSAGES[:3]]
+    frames[1] = frames[1][:-3] + b"\x00\x00\x7e"
+    frames.append(OwnshipReportMessage(**MESSAGES[3].__dict__).serialize(False))
+    columns = decode_traffic_batch(frames, ignore_invalid=True)
+    assert list(columns["address"]) == [MESSAGES[0].address, MESSAGES[2].address]
@@ -0,0 +1,129 @@
+import socket
+import threading
+
+import pytest
+
+from gdl90py.fanout import FanOutSender
+from gdl90py.messages.height_above_terrain import HeightAboveTerrainMessage
+from gdl90py.parser import parse_messages
+
+
+@pytest.fixture
+def receivers():
+    socks = []
+    for _ in range(3):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.settimeout(2)
+        socks.append(sock)
+    yield socks
+    for sock in socks:
+        sock.close()
+
+
+def messages(count: int) -> list:
+    return [HeightAboveTerrainMessage(height_above_terrain=i) for i in range(count)]
+
+
+def test_fan_out_sender(receivers, monkeypatch):
+    serialized = []
+    serialize = HeightAboveTerrainMessage.serialize
+
+    def counting_serialize(self, outgoing_lsb=True):
+        serialized.append(self)
+        return serialize(self, outgoing_lsb)
+
+    monkeypatch.setattr(HeightAboveTerrainMessage, "serialize", counting_serialize)
+
+    with FanOutSender(
+        [sock.getsockname() for sock in receivers], outgoing_lsb=False
+    ) as sender:
+        # enough to need more than one datagram
+        assert sender.send(messages(300)) > 1
+
+        assert len(serialized) == 300
+        for sock in receivers:
+            received = []
+            while len(received) < 300:
+                received += parse_messages(sock.recv(65536))
+            assert received == messages(300)
+            assert sender.stats(sock.getsockname()).datagrams > 1
+
+
+def test_fan_out_sender_clients(receivers):
+    first, second, _ = (sock.getsockname() for sock in receivers)
+
+    with FanOutSender() as sender:
+        sender.add_client(first)
+        sender.add_client(second)
+        sender.add_client(first)
+        assert sender.clients == [first, second]
+
+        sender.remove_client(first)
+        sender.remove_client(first)
+        assert sender.clients == [second]
+
+        sender.send(messages(1))
+        assert parse_messages(receivers[1].recv(65536), incoming_msb=False) == (
+            messages(1)
+        )
+
+    assert sender.clients == []
+
+
+def test_fan_out_sender_clients_from_threads(receivers):
+    address = receivers[0].getsockname()
+    kept = [(address[0], port) for port in range(40000, 40040)]
+    removed = [(address[0], port) for port in range(41000, 41040)]
+
+    def add_and_remove(start: int) -> None:
+        for i in range(start, len(kept), 4):
+            sender.add_client(kept[i])
+            sender.add_client(removed[i])
+            sender.remove_client(removed[i])
+            sender.send(messages(1))
+
+    with FanOutSender() as sender:
+        threads = [threading.Thread(target=add_and_remove, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(sender.clients) == kept
+
+
+def test_fan_out_sender_unreachable_client(receivers):
+    # nothing listening on this port
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        closed = sock.getsockname()
+
+    reachable = receivers[0].getsockname()
+
+    with FanOutSender([closed, reachable]) as sender:
+        for _ in range(3):
+            sender.send(messages(1))
+
+        # the refusal of one send is reported on the next
+        assert sender.stats(closed).errors >= 1
+        assert isinstance(sender.stats(closed).last_error, ConnectionRefusedError)
+        assert sender.stats(reachable).datagrams == 3
+        assert sender.stats(reachable).errors == 0
+
+
+def test_fan_out_sender_full_buffer(receivers):
+    class FullSocket(socket.socket):
+        def send(self, data, flags=0):
+            raise BlockingIOError
+
+    slow, fast = (sock.getsockname() for sock in receivers[:2])
+
+    with FanOutSender([slow, fast]) as sender:
+        sender._clients[slow].sock.close()
+        sender._clients[slow].sock = FullSocket(socket.AF_INET, socket.SOCK_DGRAM)
+        sender.send(messages(1))
+
+        assert sender.stats(slow).dropped == 1
+        assert sender.stats(slow).datagrams == 0
+        assert sender.stats(fast).datagrams == 1
@@ -0,0 +1,144 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gdl90py.exceptions import InvalidCRC
+from gdl90py.messages.height_above_terrain import HeightAboveTerrainMessage
+from gdl90py.messages.ownship_geometric_altitude import (
+    OwnshipGeometricAltitudeMessage,
+)
+from gdl90py.parallel import (
+    parse_buffer_threaded,
+    parse_file_parallel,
+    split_chunks,
+)
+from gdl90py.parser import iter_frames, parse_message, parse_messages
+
+
+def frame(i: int) -> bytes:
+    return HeightAboveTerrainMessage(height_above_terrain=i).serialize(
+        outgoing_lsb=False
+    )
+
+
+@pytest.fixture
+def stream() -> bytes:
+    frames = []
+    for i in range(5000):
+        frames.append(frame(i))
+        if i % 7 == 0:
+            frames.append(
+                OwnshipGeometricAltitudeMessage(
+                    geo_altitude=i * 5,
+                    vertical_warning_indicator=False,
+                    vertical_figure_of_merit=10,
+                ).serialize(outgoing_lsb=False)
+            )
+    return b"".join(frames)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 100, 4096, 1 << 20])
+def test_split_chunks(stream: bytes, chunk_size: int) -> None:
+    chunks = split_chunks(stream, chunk_size)
+
+    assert chunks[0][0] == 0
+    assert chunks[-1][1] == len(stream)
+    for (_, end), (start, _) in zip(chunks, chunks[1:]):
+        assert end == start
+
+    frames = [
+        stream[offset : offset + length]
+        for start, end in chunks
+        for offset, length in iter_frames(stream, start, end)
+    ]
+    assert frames == [
+        stream[offset : offset + length] for offset, length in iter_frames(stream)
+    ]
+
+
+def test_split_chunks_no_boundary() -> None:
+    assert split_chunks(b"~abc~", 1) == [(0, 5)]
+    assert split_chunks(b"", 1) == []
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("chunk_size", [None, 4096])
+def test_parse_file_parallel(tmp_path, stream, workers, chunk_size) -> None:
+    path = tmp_path / "stream.bin"
+    path.write_bytes(stream)
+
+    messages = list(parse_file_parallel(path, workers, chunk_size=chunk_size))
+
+    assert messages == parse_messages(stream)
+
+
+def test_parse_file_parallel_empty(tmp_path) -> None:
+    path = tmp_path / "stream.bin"
+    path.write_bytes(b"")
+
+    assert list(parse_file_parallel(path, 2)) == []
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_file_parallel_invalid(tmp_path, workers) -> None:
+    corrupt = bytearray(frame(1))
+    corrupt[2] ^= 0x10
+    path = tmp_path / "stream.bin"
+    path.write_bytes(frame(0) * 2000 + corrupt + frame(2) * 2000)
+
+    with pytest.raises(InvalidCRC):
+        list(parse_file_parallel(path, workers, chunk_size=1024))
+
+    messages = list(
+        parse_file_parallel(path, workers, ignore_invalid=True, chunk_size=1024)
+    )
+    assert messages == parse_messages(frame(0) * 2000 + frame(2) * 2000)
+
+
+@pytest.mark.parametrize("workers", [None, 1, 4])
+@pytest.mark.parametrize("chunk_size", [None, 1000])
+def test_parse_buffer_threaded(stream, workers, chunk_size) -> None:
+    messages = list(parse_buffer_threaded(stream, workers, chunk_size=chunk_size))
+
+    assert messages == parse_messages(stream)
+
+
+def test_parse_buffer_threaded_executor(stream) -> None:
+    with ThreadPoolExecutor(2) as executor:
+        for _ in range(2):
+            messages = list(
+                parse_buffer_threaded(stream, chunk_size=1000, executor=executor)
+            )
+            assert messages == parse_messages(stream)
+
+
+def test_parse_buffer_threaded_invalid() -> None:
+    corrupt = bytearray(frame(1))
+    corrupt[2] ^= 0x10
+    stream = frame(0) * 2000 + corrupt + frame(2) * 2000
+
+    with pytest.raises(InvalidCRC):
+        list(parse_buffer_threaded(stream, 4, chunk_size=1024))
+
+    messages = list(
+        parse_buffer_threaded(stream, 4, ignore_invalid=True, chunk_size=1024)
+    )
+    assert messages == parse_messages(frame(0) * 2000 + frame(2) * 2000)
+
+
+def test_parse_message_concurrently(stream) -> None:
+    frames = [
+        stream[offset : offset + length] for offset, length in iter_frames(stream)
+    ]
+    expected = [parse_message(f) for f in frames]
+    barrier = threading.Barrier(8)
+
+    def decode() -> list:
+        barrier.wait()
+        return [parse_message(f) for f in frames]
+
+    with ThreadPoolExecutor(8) as executor:
+        results = [executor.submit(decode) for _ in range(8)]
+        for result in results:
+            assert result.result() == expected
@@ -1,8 +1,17 @@
+import mmap
+import tempfile
+
 import pytest
 
-from gdl90py.exceptions import UnkownMessageID
+from gdl90py.exceptions import InvalidCRC, MalformedEscape, UnkownMessageID
 from gdl90py.messages.initialization import InitializationMessage
-from gdl90py.parser import parse_message, parse_messages
+from gdl90py.parser import (
+    FrameDecoder,
+    iter_frame_views,
+    iter_frames,
+    parse_message,
+    parse_messages,
+)
 
 
 def test_parse_message_known():
@@ -58,3 +67,137 @@ def test_parse_messages_ignore2():
     assert parse_messages(
         b"\x7e\x55\x00\x00\x50\x0a\x7e\x7e\x02\x41\x01\x43\x61\x7e", ignore_unknown=True
     ) == [i]
+
+
+INITIALIZATION_FRAME = b"\x7e\x02\x41\x01\x43\x61\x7e"
+INITIALIZATION_MESSAGE = InitializationMessage(
+    audio_test=True,
+    audio_inhibit=False,
+    CDTI_ok=True,
+    CSA_audio_disable=False,
+    CSA_disable=True,
+)
+
+
+def test_parse_messages_multiple():
+    assert parse_messages(INITIALIZATION_FRAME * 3) == [INITIALIZATION_MESSAGE] * 3
+
+
+def test_parse_messages_partial_trailing_frame():
+    assert parse_messages(INITIALIZATION_FRAME + INITIALIZATION_FRAME[:4]) == [
+        INITIALIZATION_MESSAGE
+    ]
+
+
+def test_frame_decoder_split_frame():
+    decoder = FrameDecoder()
+    assert list(decoder.feed(INITIALIZATION_FRAME[:3])) == []
+    assert decoder.pending == 3
+    assert list(decoder.feed(INITIALIZATION_FRAME[3:])) == [INITIALIZATION_MESSAGE]
+    assert decoder.pending == 0
+
+
+def test_frame_decoder_byte_at_a_time():
+    decoder = FrameDecoder()
+    output = []
+    for byte in INITIALIZATION_FRAME * 2:
+        output.extend(decoder.feed(bytes([byte])))
+    assert output == [INITIALIZATION_MESSAGE] * 2
+
+
+def test_frame_decoder_leading_garbage():
+    decoder = FrameDecoder()
+    assert list(decoder.feed(b"\x01\x02\x03" + INITIALIZATION_FRAME)) == [
+        INITIALIZATION_MESSAGE
+    ]
+
+
+def test_frame_decoder_join_mid_stream():
+    # the tail end of a previous frame, followed by a full frame
+    decoder = FrameDecoder()
+    assert list(decoder.feed(b"\x43\x61\x7e" + INITIALIZATION_FRAME)) == [
+        INITIALIZATION_MESSAGE
+    ]
+
+
+def test_frame_decoder_recovers_after_invalid_crc():
+    decoder = FrameDecoder()
+    messages = decoder.feed(b"\x7e\x01\x02\x03" + INITIALIZATION_FRAME)
+    with pytest.raises(InvalidCRC):
+        next(messages)
+    assert list(decoder.feed(b"")) == [INITIALIZATION_MESSAGE]
+
+
+def test_frame_decoder_recovers_after_malformed_escape():
+    decoder = FrameDecoder()
+    messages = decoder.feed(b"\x7e\x01\x02\x7d" + INITIALIZATION_FRAME)
+    with pytest.raises(MalformedEscape):
+        next(messages)
+    assert list(decoder.feed(b"")) == [INITIALIZATION_MESSAGE]
+
+
+def test_frame_decoder_ignore_unknown():
+    decoder = FrameDecoder(ignore_unknown=True)
+    assert list(
+        decoder.feed(b"\x7e\x55\x00\x00\x50\x0a\x7e" + INITIALIZATION_FRAME)
+    ) == [INITIALIZATION_MESSAGE]
+
+
+def test_frame_decoder_feed_skip_invalid():
+    decoder = FrameDecoder()
+    messages, invalid = decoder.feed_skip_invalid(
+        # invalid CRC, then a valid CRC without a message ID
+        b"\x7e\x01\x02\x03\x7e\x7e\x00\x00\x7e"
+        + INITIALIZATION_FRAME
+        + INITIALIZATION_FRAME[:3]
+    )
+    assert messages == [INITIALIZATION_MESSAGE]
+    assert invalid == 2
+
+    assert decoder.feed_skip_invalid(INITIALIZATION_FRAME[3:]) == (
+        [INITIALIZATION_MESSAGE],
+        0,
+    )
+
+
+def test_frame_decoder_drops_oversized_frame():
+    decoder = FrameDecoder()
+    assert list(decoder.feed(b"\x7e" + b"\x00" * FrameDecoder.MAX_FRAME_SIZE)) == []
+    assert decoder.pending == 0
+    assert list(decoder.feed(INITIALIZATION_FRAME)) == [INITIALIZATION_MESSAGE]
+
+
+def test_frame_decoder_reset():
+    decoder = FrameDecoder()
+    list(decoder.feed(INITIALIZATION_FRAME[:3]))
+    decoder.reset()
+    assert decoder.pending == 0
+    assert list(decoder.feed(INITIALIZATION_FRAME)) == [INITIALIZATION_MESSAGE]
+
+
+STREAM = b"\x00" + INITIALIZATION_FRAME + b"\x7e" + INITIALIZATION_FRAME + b"\x00\x7e"
+
+
+@pytest.mark.parametrize("buffer_type", [bytes, bytearray, memoryview])
+def test_iter_frames(buffer_type):
+    frames = list(iter_frames(buffer_type(STREAM)))
+    assert frames == [
+        (1, len(INITIALIZATION_FRAME)),
+        (2 + len(INITIALIZATION_FRAME), len(INITIALIZATION_FRAME)),
+    ]
+
+
+def test_iter_frames_range():
+    assert list(iter_frames(STREAM, 2)) == [
+        (2 + len(INITIALIZATION_FRAME), len(INITIALIZATION_FRAME))
+    ]
+    assert list(iter_frames(STREAM, 0, len(INITIALIZATION_FRAME))) == []
+
+
+def test_iter_frames_mmap():
+    with tempfile.TemporaryFile() as f:
+        f.write((b"\x00" + INITIALIZATION_FRAME) * 6)
+        f.flush()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            messages = [parse_message(view) for view in iter_frame_views(m)]
+            assert messages == [INITIALIZATION_MESSAGE] * 6
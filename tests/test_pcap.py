@@ -0,0 +1,240 @@
+import io
+import struct
+
+import pytest
+
+from gdl90py.exceptions import InvalidCapture
+from gdl90py.messages.height_above_terrain import HeightAboveTerrainMessage
+from gdl90py.pcap import (
+    LINKTYPE_ETHERNET,
+    LINKTYPE_LINUX_SLL,
+    LINKTYPE_RAW,
+    PcapReader,
+)
+
+
+def frame(i: int) -> bytes:
+    return HeightAboveTerrainMessage(height_above_terrain=i).serialize(
+        outgoing_lsb=False
+    )
+
+
+def udp(payload: bytes, destination_port: int = 4000, source_port: int = 4001) -> bytes:
+    return (
+        struct.pack(">HHHH", source_port, destination_port, 8 + len(payload), 0)
+        + payload
+    )
+
+
+def ipv4(payload: bytes, protocol: int = 17, flags_fragment: int = 0) -> bytes:
+    return (
+        struct.pack(
+            ">BBHHHBBH4s4s",
+            0x45,
+            0,
+            20 + len(payload),
+            0,
+            flags_fragment,
+            64,
+            protocol,
+            0,
+            bytes([192, 168, 1, 2]),
+            bytes([192, 168, 1, 255]),
+        )
+        + payload
+    )
+
+
+def ipv6(payload: bytes) -> bytes:
+    # with a hop-by-hop options extension header
+    return (
+        struct.pack(">IHBB16s16s", 6 << 28, 8 + len(payload), 0, 64, b"", b"")
+        + bytes([17, 0])
+        + bytes(6)
+        + payload
+    )
+
+
+def ethernet(payload: bytes, ethertype: int = 0x0800, vlan: bool = False) -> bytes:
+    header = bytes(12)
+    if vlan:
+        header += struct.pack(">HH", 0x8100, 5)
+    return header + struct.pack(">H", ethertype) + payload
+
+
+def pcap(
+    packets: list[tuple[float, bytes]],
+    link_type: int = LINKTYPE_ETHERNET,
+    byteorder: str = "<",
+    nanoseconds: bool = False,
+) -> bytes:
+    magic = 0xA1B23C4D if nanoseconds else 0xA1B2C3D4
+    scale = 1e9 if nanoseconds else 1e6
+    data = struct.pack(byteorder + "IHHiIII", magic, 2, 4, 0, 0, 65535, link_type)
+    for timestamp, packet in packets:
+        seconds = int(timestamp)
+        fraction = round((timestamp - seconds) * scale)
+        data += struct.pack(
+            byteorder + "IIII", seconds, fraction, len(packet), len(packet)
+        )
+        data += packet
+    return data
+
+
+def pcapng_block(block_type: int, body: bytes, byteorder: str = "<") -> bytes:
+    body += bytes(-len(body) % 4)
+    length = 12 + len(body)
+    return (
+        struct.pack(byteorder + "II", block_type, length)
+        + body
+        + struct.pack(byteorder + "I", length)
+    )
+
+
+def pcapng(
+    packets: list[tuple[int, bytes]],
+    link_type: int = LINKTYPE_ETHERNET,
+    byteorder: str = "<",
+) -> bytes:
+    data = pcapng_block(
+        0x0A0D0D0A, struct.pack(byteorder + "IHHq", 0x1A2B3C4D, 1, 0, -1), byteorder
+    )
+    # timestamps in milliseconds
+    options = struct.pack(byteorder + "HH", 9, 1) + bytes([3, 0, 0, 0])
+    options += struct.pack(byteorder + "HH", 0, 0)
+    data += pcapng_block(
+        1, struct.pack(byteorder + "HHI", link_type, 0, 65535) + options, byteorder
+    )
+    for timestamp, packet in packets:
+        data += pcapng_block(
+            6,
+            struct.pack(
+                byteorder + "IIIII",
+                0,
+                timestamp >> 32,
+                timestamp & 0xFFFFFFFF,
+                len(packet),
+                len(packet),
+            )
+            + packet,
+            byteorder,
+        )
+    return data
+
+
+def heights(reader: PcapReader) -> list[tuple[float, int | None]]:
+    results = []
+    for timestamp, message in reader:
+        assert isinstance(message, HeightAboveTerrainMessage)
+        results.append((timestamp, message.height_above_terrain))
+    return results
+
+
+def test_pcap_reader(tmp_path):
+    path = tmp_path / "capture.pcap"
+    path.write_bytes(
+        pcap(
+            [
+                (1000.5, ethernet(ipv4(udp(frame(1) + frame(2))))),
+                # different port
+                (1001.0, ethernet(ipv4(udp(frame(3), 5000, 5001)))),
+                # not UDP
+                (1002.0, ethernet(ipv4(udp(frame(4)), protocol=6))),
+                # fragmented
+                (1003.0, ethernet(ipv4(udp(frame(5)), flags_fragment=0x2000))),
+                (1004.25, ethernet(ipv4(udp(frame(6))), vlan=True)),
+                (1005.0, ethernet(ipv6(udp(frame(7))), ethertype=0x86DD)),
+            ]
+        )
+    )
+
+    with PcapReader(path) as reader:
+        assert reader._mmap is not None
+        assert heights(reader) == [(1000.5, 1), (1000.5, 2), (1004.25, 6), (1005.0, 7)]
+
+
+def test_pcap_reader_any_port(tmp_path):
+    path = tmp_path / "capture.pcap"
+    path.write_bytes(pcap([(1.0, ethernet(ipv4(udp(frame(3), 5000, 5001))))]))
+
+    with PcapReader(path, port=None) as reader:
+        assert heights(reader) == [(1.0, 3)]
+
+
+@pytest.mark.parametrize("byteorder", ["<", ">"])
+@pytest.mark.parametrize("nanoseconds", [True, False])
+def test_pcap_reader_formats(byteorder, nanoseconds):
+    data = pcap(
+        [(12.5, ipv4(udp(frame(1))))],
+        link_type=LINKTYPE_RAW,
+        byteorder=byteorder,
+        nanoseconds=nanoseconds,
+    )
+    # not memory-mapped
+    assert heights(PcapReader(io.BytesIO(data))) == [(12.5, 1)]
+
+
+def test_pcap_reader_linux_sll():
+    packet = bytes(14) + struct.pack(">H", 0x0800) + ipv4(udp(frame(1)))
+    data = pcap([(1.0, packet)], link_type=LINKTYPE_LINUX_SLL)
+    assert heights(PcapReader(io.BytesIO(data))) == [(1.0, 1)]
+
+
+@pytest.mark.parametrize("byteorder", ["<", ">"])
+def test_pcapng_reader(tmp_path, byteorder):
+    path = tmp_path / "capture.pcapng"
+    path.write_bytes(
+        pcapng(
+            [
+                (1500, ethernet(ipv4(udp(frame(1))))),
+                (2750, ethernet(ipv4(udp(frame(2), 5000, 5001)))),
+                (3000, ethernet(ipv4(udp(frame(3))))),
+            ],
+            byteorder=byteorder,
+        )
+    )
+
+    with PcapReader(path) as reader:
+        assert heights(reader) == [(1.5, 1), (3.0, 3)]
+
+
+def test_pcap_reader_truncated(tmp_path):
+    data = pcap([(1.0, ipv4(udp(frame(1)))), (2.0, ipv4(udp(frame(2))))], LINKTYPE_RAW)
+    path = tmp_path / "capture.pcap"
+    path.write_bytes(data[:-3])
+
+    with PcapReader(path) as reader:
+        assert heights(reader) == [(1.0, 1)]
+
+
+def test_pcap_reader_truncated_ipv6():
+    packets = [(1.0, bytes([0x60, 0, 0, 0])), (2.0, ipv6(udp(frame(2))))]
+    data = pcap(packets, LINKTYPE_RAW)
+    assert heights(PcapReader(io.BytesIO(data))) == [(2.0, 2)]
+
+
+def test_pcap_reader_invalid_frames():
+    bad_crc = frame(1)[:-3] + b"\x00\x00\x7e"
+    data = pcap([(1.0, ipv4(udp(bad_crc + frame(2))))], LINKTYPE_RAW)
+    reader = PcapReader(io.BytesIO(data))
+    assert heights(reader) == [(1.0, 2)]
+    assert reader.invalid == 1
+
+
+def test_pcap_reader_empty(tmp_path):
+    path = tmp_path / "capture.pcap"
+    path.write_bytes(b"")
+
+    with PcapReader(path) as reader:
+        assert heights(reader) == []
+
+
+def test_pcap_reader_not_a_capture():
+    with pytest.raises(InvalidCapture):
+        list(PcapReader(io.BytesIO(b"not a capture file")))
+
+
+def test_pcapng_reader_invalid_section_length():
+    data = struct.pack("<III", 0x0A0D0D0A, 8, 0x1A2B3C4D) + bytes(32)
+    with pytest.raises(InvalidCapture):
+        list(PcapReader(io.BytesIO(data)))
@@ -0,0 +1,153 @@
+import io
+
+import pytest
+
+from gdl90py.exceptions import InvalidRecording
+from gdl90py.messages.foreflight_id import ForeFlightIDMessage
+from gdl90py.messages.height_above_terrain import HeightAboveTerrainMessage
+from gdl90py.messages.initialization import InitializationMessage
+from gdl90py.recording import (
+    RecordingReader,
+    RecordingWriter,
+    frame_message_ids,
+)
+
+START = 1_700_000_000.0
+
+INITIALIZATION = InitializationMessage(
+    audio_test=False,
+    audio_inhibit=False,
+    CDTI_ok=True,
+    CSA_audio_disable=False,
+    CSA_disable=False,
+)
+FOREFLIGHT_ID = ForeFlightIDMessage(
+    device_serial_number=1234,
+    device_name="gdl90py",
+    device_long_name="gdl90py",
+    is_msl=True,
+)
+
+
+def height(i: int) -> HeightAboveTerrainMessage:
+    return HeightAboveTerrainMessage(height_above_terrain=i)
+
+
+def write_recording(path, incoming_msb: bool = True, close: bool = True) -> None:
+    writer = RecordingWriter(path, incoming_msb=incoming_msb)
+    # 10 messages a second for 10 seconds, with a few other messages mixed in
+    for i in range(100):
+        writer.write_message(height(i), START + i / 10)
+        if i % 25 == 0:
+            writer.write_message(INITIALIZATION, START + i / 10)
+    writer.write_message(FOREFLIGHT_ID, START + 10)
+    if close:
+        writer.close()
+
+
+@pytest.mark.parametrize("incoming_msb", [True, False])
+def test_recording_round_trip(tmp_path, incoming_msb):
+    path = tmp_path / "flight.gdl90rec"
+    write_recording(path, incoming_msb)
+
+    with RecordingReader(path) as reader:
+        assert reader.incoming_msb is incoming_msb
+        assert reader.start_time == START
+        assert reader.message_counts == {(9,): 100, (2,): 4, (0x65, 0): 1}
+
+        messages = list(reader)
+        assert len(messages) == 105
+        assert messages[0] == (START, height(0))
+        assert messages[1] == (START, INITIALIZATION)
+        assert messages[-1] == (START + 10, FOREFLIGHT_ID)
+
+
+def test_recording_time_range(tmp_path):
+    path = tmp_path / "flight.gdl90rec"
+    write_recording(path)
+
+    with RecordingReader(path) as reader:
+        messages = list(reader.messages(start=START + 2.05, end=START + 5))
+        assert [message for _, message in messages] == [
+            height(i) for i in range(21, 26)
+        ] + [INITIALIZATION] + [height(i) for i in range(26, 51)] + [INITIALIZATION]
+        assert all(START + 2.05 <= timestamp <= START + 5 for timestamp, _ in messages)
+
+
+def test_recording_message_types(tmp_path):
+    path = tmp_path / "flight.gdl90rec"
+    write_recording(path)
+
+    with RecordingReader(path) as reader:
+        assert list(reader.messages(message_types=[InitializationMessage])) == [
+            (START + i / 10, INITIALIZATION) for i in range(0, 100, 25)
+        ]
+        assert list(
+            reader.messages(start=START + 3, message_types=[(2,), ForeFlightIDMessage])
+        ) == [
+            (START + 5, INITIALIZATION),
+            (START + 7.5, INITIALIZATION),
+            (START + 10, FOREFLIGHT_ID),
+        ]
+        assert list(reader.messages(message_types=[(0x0A,)])) == []
+
+
+def test_recording_index_starts_reading_in_range(tmp_path):
+    path = tmp_path / "flight.gdl90rec"
+    write_recording(path)
+
+    with RecordingReader(path) as reader:
+        records = reader.records(start=START + 9)
+        first = next(records)
+        assert first.timestamp == START + 9
+        assert first.message_ids == (9,)
+        assert (
+            reader._index.start_offset(
+                reader._index.entries, round((START + 9) * 1e9), 0
+            )
+            > len(reader._view) // 2
+        )
+
+
+def test_recording_unclosed(tmp_path):
+    path = tmp_path / "flight.gdl90rec"
+    with open(path, "wb") as f:
+        write_recording(f, close=False)
+        f.write(b"\x00" * 5)  # partially written record
+
+    with RecordingReader(path) as reader:
+        assert reader.message_counts == {(9,): 100, (2,): 4, (0x65, 0): 1}
+        assert len(list(reader.messages(start=START + 5))) == 50 + 2 + 1
+
+
+def test_recording_timestamps_go_backwards():
+    writer = RecordingWriter(io.BytesIO())
+    writer.write_message(height(1), START + 1)
+    with pytest.raises(ValueError):
+        writer.write_message(height(1), START)
+
+
+def test_recording_default_timestamps(tmp_path):
+    path = tmp_path / "flight.gdl90rec"
+    with RecordingWriter(path) as writer:
+        writer.write_message(height(1))
+        writer.write_message(height(2))
+
+    with RecordingReader(path) as reader:
+        (first, _), (second, _) = list(reader)
+        assert 0 <= second - first < 1
+
+
+def test_recording_invalid(tmp_path):
+    path = tmp_path / "flight.gdl90rec"
+    path.write_bytes(b"not a recording, no")
+    with pytest.raises(InvalidRecording):
+        RecordingReader(path)
+
+
+def test_frame_message_ids():
+    assert frame_message_ids(height(1).serialize(outgoing_lsb=False)) == (9,)
+    assert frame_message_ids(height(1).serialize(), incoming_msb=False) == (9,)
+    assert frame_message_ids(FOREFLIGHT_ID.serialize(outgoing_lsb=False)) == (0x65, 0)
+    # escaped sub ID
+    assert frame_message_ids(b"\x7e\x65\x7d\x5e\x00\x00\x7e") == (0x65, 0x7E)
@@ -0,0 +1,108 @@
+import socket
+import threading
+
+import pytest
+
+from gdl90py.fanout import FanOutSender
+from gdl90py.messages.foreflight_id import ForeFlightIDMessage
+from gdl90py.messages.height_above_terrain import HeightAboveTerrainMessage
+from gdl90py.messages.ownship_geometric_altitude import (
+    OwnshipGeometricAltitudeMessage,
+)
+from gdl90py.relay import FrameFilter, Relay
+from gdl90py.udp import open_datagram_receiver
+
+HEIGHT = HeightAboveTerrainMessage(height_above_terrain=123)
+ALTITUDE = OwnshipGeometricAltitudeMessage(
+    geo_altitude=1000, vertical_warning_indicator=False, vertical_figure_of_merit=10
+)
+FOREFLIGHT_ID = ForeFlightIDMessage(
+    device_serial_number=1,
+    device_name="gdl90py",
+    device_long_name="gdl90py",
+    is_msl=False,
+)
+
+
+@pytest.mark.parametrize("msb", [True, False])
+@pytest.mark.parametrize("check_crc", [True, False])
+def test_frame_filter(msb, check_crc):
+    frames = [m.serialize(outgoing_lsb=not msb) for m in (HEIGHT, ALTITUDE)] * 2
+    frames.append(FOREFLIGHT_ID.serialize(outgoing_lsb=not msb))
+    data = b"garbage" + b"".join(frames)
+
+    frame_filter = FrameFilter(
+        [HeightAboveTerrainMessage, ForeFlightIDMessage.MESSAGE_IDS],
+        incoming_msb=msb,
+        check_crc=check_crc,
+    )
+    forwarded = frame_filter.filter(data)
+
+    # the original bytes, in the original order
+    assert [bytes(frame) for frame in forwarded] == [frames[0], frames[2], frames[4]]
+    assert frame_filter.forwarded == 3
+    assert frame_filter.dropped == 2
+    assert frame_filter.invalid == 0
+
+
+def test_frame_filter_crc():
+    bad_crc = bytearray(HEIGHT.serialize(outgoing_lsb=False))
+    bad_crc[-2] ^= 0x01
+    frames = [bytes(bad_crc), HEIGHT.serialize(outgoing_lsb=False)]
+
+    unchecked = FrameFilter([HeightAboveTerrainMessage])
+    assert len(unchecked.filter(b"".join(frames))) == 2
+
+    checked = FrameFilter([HeightAboveTerrainMessage], check_crc=True)
+    assert [bytes(f) for f in checked.filter(b"".join(frames))] == frames[1:]
+    assert checked.invalid == 1
+
+
+def test_frame_filter_crc_no_message_id():
+    # valid CRCs, but no message ID, and no ForeFlight sub ID
+    data = b"\x7e\x00\x00\x7e\x7e\x65\x65\x00\x7e" + HEIGHT.serialize(
+        outgoing_lsb=False
+    )
+    frame_filter = FrameFilter(
+        [HeightAboveTerrainMessage, ForeFlightIDMessage], check_crc=True
+    )
+    assert len(frame_filter.filter(data)) == 1
+    assert frame_filter.invalid == 2
+
+
+def test_relay():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as downstream:
+        downstream.bind(("127.0.0.1", 0))
+        downstream.settimeout(2)
+
+        receiver = open_datagram_receiver("127.0.0.1", 0)
+        receiver.POLL_INTERVAL = 0.01
+        relay = Relay(
+            receiver,
+            FanOutSender([downstream.getsockname()]),
+            [HeightAboveTerrainMessage],
+            incoming_msb=False,
+        )
+        thread = threading.Thread(target=relay.run)
+        thread.start()
+
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as source:
+                # LSB, as sent by most devices
+                source.sendto(
+                    ALTITUDE.serialize() + HEIGHT.serialize(),
+                    receiver.sock.getsockname(),
+                )
+                source.sendto(ALTITUDE.serialize(), receiver.sock.getsockname())
+                source.sendto(HEIGHT.serialize(), receiver.sock.getsockname())
+
+                assert downstream.recv(65536) == HEIGHT.serialize()
+                assert downstream.recv(65536) == HEIGHT.serialize()
+        finally:
+            relay.stop()
+            thread.join(2)
+
+    assert not thread.is_alive()
+    assert relay.filter.forwarded == 2
+    assert relay.filter.dropped == 2
+    assert relay.sender.clients == []
@@ -0,0 +1,135 @@
+import dataclasses
+import datetime
+import socket
+import threading
+import time
+
+import pytest
+
+from gdl90py.messages.heartbeat import HeartbeatMessage
+from gdl90py.messages.height_above_terrain import HeightAboveTerrainMessage
+from gdl90py.parser import parse_messages
+from gdl90py.replay import Replayer, patch_heartbeat_timestamp
+
+HEARTBEAT = HeartbeatMessage(
+    gps_position_valid=True,
+    maintenance_required=False,
+    ident_talkback=False,
+    self_assigned_address_talkback=False,
+    gps_battery_low=False,
+    RATCS_talkback=False,
+    UAT_initialized=True,
+    CSA_requested=True,
+    CSA_unavailable=False,
+    UTC_timing_valid=True,
+    timestamp=datetime.time(1, 2, 3, tzinfo=datetime.UTC),
+    uplink_messages_count=4,
+    basic_long_messages_count=567,
+)
+
+
+def frame(i: int) -> bytes:
+    return HeightAboveTerrainMessage(height_above_terrain=i).serialize(
+        outgoing_lsb=False
+    )
+
+
+@pytest.fixture
+def receiver():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.settimeout(2)
+        yield sock
+
+
+def receive(sock: socket.socket, count: int) -> list:
+    messages = []
+    while len(messages) < count:
+        messages += parse_messages(sock.recv(65536))
+    return messages
+
+
+@pytest.mark.parametrize(
+    "seconds,expected",
+    [
+        (12345, datetime.time(3, 25, 45, tzinfo=datetime.UTC)),
+        # uses the 17th bit
+        (23 * 3600 + 59 * 60 + 59, datetime.time(23, 59, 59, tzinfo=datetime.UTC)),
+    ],
+)
+@pytest.mark.parametrize("msb", [True, False])
+def test_patch_heartbeat_timestamp(seconds, expected, msb):
+    patched = patch_heartbeat_timestamp(
+        HEARTBEAT.serialize(outgoing_lsb=not msb), seconds, incoming_msb=msb
+    )
+    assert HeartbeatMessage.deserialize(patched, incoming_msb=msb) == (
+        dataclasses.replace(HEARTBEAT, timestamp=expected)
+    )
+
+
+def test_patch_heartbeat_timestamp_not_heartbeat():
+    with pytest.raises(ValueError):
+        patch_heartbeat_timestamp(frame(1), 0)
+
+
+def test_replayer_max_speed(receiver):
+    frames = [(1000.0 + i, frame(i)) for i in range(1000)]
+    replayer = Replayer(
+        lambda: frames, [receiver.getsockname()], speed=None, max_datagram_size=100
+    )
+    replayer.run()
+
+    messages = receive(receiver, 1000)
+    assert [message.height_above_terrain for message in messages] == list(range(1000))
+    assert replayer.frames_sent == 1000
+    # frames packed into datagrams
+    assert replayer.datagrams_sent < 1000
+
+
+def test_replayer_timing(receiver):
+    frames = [(1000.0 + i / 10, frame(i)) for i in range(5)]
+    replayer = Replayer(lambda: frames, [receiver.getsockname()], speed=2)
+
+    start = time.perf_counter()
+    replayer.run()
+    elapsed = time.perf_counter() - start
+
+    assert 0.2 <= elapsed < 0.5
+    # sent one at a time
+    assert replayer.datagrams_sent == 5
+    assert len(receive(receiver, 5)) == 5
+
+
+def test_replayer_loop(receiver):
+    frames = [(1000.0, frame(1)), (1000.0, frame(2))]
+    replayer = Replayer(lambda: frames, [receiver.getsockname()], loop=True)
+
+    thread = threading.Thread(target=replayer.run)
+    thread.start()
+    messages = receive(receiver, 6)
+    replayer.stop()
+    thread.join(2)
+
+    assert not thread.is_alive()
+    assert replayer.loops >= 3
+    assert [message.height_above_terrain for message in messages[:6]] == [1, 2] * 3
+
+
+def test_replayer_patch_heartbeat_timestamps(receiver):
+    # as part of a datagram, as from a packet capture
+    frames = [(1000.0, frame(1) + HEARTBEAT.serialize(outgoing_lsb=False) + frame(2))]
+    replayer = Replayer(
+        lambda: frames, [receiver.getsockname()], patch_heartbeat_timestamps=True
+    )
+    replayer.run()
+
+    first, heartbeat, last = receive(receiver, 3)
+    assert first.height_above_terrain == 1
+    assert last.height_above_terrain == 2
+    assert heartbeat.timestamp != HEARTBEAT.timestamp
+    assert dataclasses.replace(heartbeat, timestamp=HEARTBEAT.timestamp) == HEARTBEAT
+
+
+def test_replayer_bad_speed():
+    with pytest.raises(ValueError):
+        Replayer(lambda: [], [], speed=0)
@@ -0,0 +1,108 @@
+import io
+import os
+import sys
+
+import pytest
+
+from gdl90py.messages.height_above_terrain import HeightAboveTerrainMessage
+from gdl90py.serial_reader import SerialReader
+
+
+def frame(i: int) -> bytes:
+    return HeightAboveTerrainMessage(height_above_terrain=i).serialize(
+        outgoing_lsb=False
+    )
+
+
+def heights(messages: list) -> list[int]:
+    return [message.height_above_terrain for message in messages]
+
+
+@pytest.fixture
+def pty_pair():
+    if sys.platform == "win32":
+        pytest.skip("ptys are not available on Windows")
+
+    import pty
+    import tty
+
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    stream = open(slave, "rb", buffering=0)
+    yield master, stream
+    os.close(master)
+    stream.close()
+
+
+def poll_until(reader: SerialReader, count: int) -> list:
+    messages = []
+    while len(messages) < count:
+        received = reader.poll(timeout=2)
+        assert received or not reader._ring.closed
+        messages += received
+    return messages
+
+
+def test_serial_reader_pty(pty_pair):
+    master, stream = pty_pair
+    with SerialReader(stream) as reader:
+        data = b"\x00\x01" + frame(1) + frame(2) + frame(3)
+        # split mid-frame
+        os.write(master, data[:10])
+        os.write(master, data[10:])
+        assert heights(poll_until(reader, 3)) == [1, 2, 3]
+
+    assert reader.overruns == 0
+    assert reader.error is None
+
+
+def test_serial_reader_wraps_around(pty_pair):
+    master, stream = pty_pair
+    # frames will keep crossing the end of the ring buffer
+    with SerialReader(stream, capacity=32) as reader:
+        for i in range(20):
+            os.write(master, frame(i))
+            assert heights(poll_until(reader, 1)) == [i]
+
+
+def test_serial_reader_overrun():
+    data = b"".join(frame(i) for i in range(100))
+    reader = SerialReader(io.BytesIO(data), capacity=70)
+    reader.start()
+    reader._thread.join(2)
+
+    messages = list(reader)
+    assert heights(messages) == list(range(10))
+    assert reader.overruns > 0
+    assert reader.overrun_bytes == len(data) - 70
+
+
+def test_serial_reader_invalid():
+    bad_crc = frame(1)[:-3] + b"\x00\x00\x7e"
+    stream = io.BytesIO(bad_crc + frame(2) + b"\x7e\x55\x00\x00\x50\x0a\x7e" + frame(3))
+    with SerialReader(stream) as reader:
+        assert heights(list(reader)) == [2, 3]
+
+    assert reader.invalid == 2
+
+
+def test_serial_reader_read_only_stream():
+    class Stream:
+        def __init__(self, data: bytes) -> None:
+            self.data = io.BytesIO(data)
+
+        def read(self, size: int) -> bytes:
+            return self.data.read(min(size, 3))
+
+    with SerialReader(Stream(frame(1) + frame(2))) as reader:
+        assert heights(list(reader)) == [1, 2]
+
+
+def test_serial_reader_error():
+    class Stream(io.RawIOBase):
+        def readinto(self, buffer) -> int:
+            raise OSError("unplugged")
+
+    with SerialReader(Stream()) as reader:
+        with pytest.raises(OSError):
+            list(reader)
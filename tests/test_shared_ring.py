@@ -0,0 +1,223 @@
+import datetime
+import multiprocessing
+
+import pytest
+
+from gdl90py.enums import (
+    Accuracy,
+    AddressType,
+    EmergencyPriorityCode,
+    EmitterCategory,
+    Integrity,
+    TrackType,
+)
+from gdl90py.exceptions import InvalidCRC
+from gdl90py.messages.foreflight_id import ForeFlightIDMessage
+from gdl90py.messages.heartbeat import HeartbeatMessage
+from gdl90py.messages.height_above_terrain import HeightAboveTerrainMessage
+from gdl90py.messages.ownship_geometric_altitude import (
+    OwnshipGeometricAltitudeMessage,
+)
+from gdl90py.messages.traffic_report import TrafficReportMessage
+from gdl90py.shared_ring import MAGIC, SharedRingReader, SharedRingWriter
+
+
+def altitude(i: int) -> OwnshipGeometricAltitudeMessage:
+    return OwnshipGeometricAltitudeMessage(
+        geo_altitude=i * 5,
+        vertical_warning_indicator=False,
+        vertical_figure_of_merit=10,
+    )
+
+
+FOREFLIGHT_ID = ForeFlightIDMessage(
+    device_serial_number=1,
+    device_name="gdl90py",
+    device_long_name="gdl90py",
+    is_msl=False,
+)
+
+
+@pytest.fixture
+def writer():
+    with SharedRingWriter(slots=8) as writer:
+        yield writer
+
+
+def test_shared_ring(writer):
+    with (
+        SharedRingReader(writer.name) as first,
+        SharedRingReader(writer.name) as second,
+    ):
+        assert first.read() == []
+
+        assert writer.write(altitude(1), timestamp=12.5) == 1
+        assert writer.write(altitude(2)) == 2
+        # not one of the message types
+        assert writer.write(HeightAboveTerrainMessage(height_above_terrain=1)) is None
+
+        records = first.read()
+        assert [record.sequence for record in records] == [1, 2]
+        assert records[0].timestamp == 12.5
+        assert records[0].message_ids == OwnshipGeometricAltitudeMessage.MESSAGE_IDS
+        assert [record.message() for record in records] == [altitude(1), altitude(2)]
+        assert first.read() == []
+
+        # each reader has its own position
+        writer.write(altitude(3))
+        assert first.read_messages() == [altitude(3)]
+        assert second.read_messages() == [altitude(1), altitude(2), altitude(3)]
+
+
+TRAFFIC = TrafficReportMessage(
+    traffic_alert=True,
+    address_type=AddressType.ads_b_icao,
+    address=0xABCDEF,
+    latitude=44.90708,
+    longitude=-122.99488,
+    pressure_altitude=None,
+    track_type=TrackType.true_track_angle,
+    report_extrapolated=False,
+    airborne=True,
+    integrity=Integrity.less_than_25_m_hpl_and_37_5_m_vpl,
+    accuracy=Accuracy.less_than_30_m_hfom_and_45_m_vfom,
+    horizontal_velocity=123,
+    vertical_velocity=-640,
+    track=45,
+    emitter_category=EmitterCategory.light,
+    callsign="N12345",
+    emergency_priority_code=EmergencyPriorityCode.no_emergency,
+)
+
+HEARTBEAT = HeartbeatMessage(
+    gps_position_valid=True,
+    maintenance_required=False,
+    ident_talkback=False,
+    self_assigned_address_talkback=False,
+    gps_battery_low=False,
+    RATCS_talkback=False,
+    UAT_initialized=True,
+    CSA_requested=False,
+    CSA_unavailable=False,
+    UTC_timing_valid=True,
+    timestamp=datetime.time(12, 30, 5, tzinfo=datetime.UTC),
+    uplink_messages_count=3,
+    basic_long_messages_count=100,
+)
+
+
+def test_shared_ring_decoded_values(writer):
+    with SharedRingReader(writer.name) as reader:
+        writer.write(TRAFFIC)
+        writer.write(HEARTBEAT)
+        writer.write_frame(TRAFFIC.serialize(outgoing_lsb=False))
+
+        records = reader.read()
+        assert records[0].values["pressure_altitude"] is None
+        assert records[0].values["address_type"] is AddressType.ads_b_icao
+        assert records[0].values["callsign"] == "N12345"
+        assert [record.message() for record in records] == [
+            TRAFFIC,
+            HEARTBEAT,
+            TrafficReportMessage.deserialize(TRAFFIC.serialize(outgoing_lsb=False)),
+        ]
+
+
+def test_shared_ring_sub_ids():
+    with SharedRingWriter(slots=8, message_types=[ForeFlightIDMessage]) as writer:
+        with SharedRingReader(writer.name) as reader:
+            writer.write(FOREFLIGHT_ID)
+            assert reader.read_messages() == [FOREFLIGHT_ID]
+
+
+def test_shared_ring_write_frame(writer):
+    with SharedRingReader(writer.name) as reader:
+        frame = altitude(7).serialize(outgoing_lsb=False)
+        assert writer.write_frame(memoryview(frame)) == 1
+        assert writer.write_frame(altitude(8).serialize(), incoming_msb=False) == 2
+        assert (
+            writer.write_frame(
+                HeightAboveTerrainMessage(height_above_terrain=1).serialize(
+                    outgoing_lsb=False
+                )
+            )
+            is None
+        )
+        with pytest.raises(InvalidCRC):
+            writer.write_frame(frame[:-3] + bytes([frame[-3] ^ 1]) + frame[-2:])
+
+        assert reader.read_messages() == [altitude(7), altitude(8)]
+
+
+def test_shared_ring_start(writer):
+    for i in range(3):
+        writer.write(altitude(i))
+
+    with SharedRingReader(writer.name) as reader:
+        assert reader.read() == []
+    with SharedRingReader(writer.name, from_oldest=True) as reader:
+        assert reader.read_messages() == [altitude(i) for i in range(3)]
+
+
+def test_shared_ring_lapped(writer):
+    with SharedRingReader(writer.name) as reader:
+        for i in range(20):
+            writer.write(altitude(i))
+
+        assert reader.read_messages() == [altitude(i) for i in range(12, 20)]
+        assert reader.lost == 12
+
+
+def test_shared_ring_iter_stops_when_closed():
+    writer = SharedRingWriter(slots=8)
+    reader = SharedRingReader(writer.name)
+    writer.write(altitude(1))
+    writer.close()
+
+    assert list(reader) == [altitude(1)]
+    reader.close()
+
+
+def test_shared_ring_not_a_ring():
+    with SharedRingWriter(slots=4) as writer:
+        buf = writer.shm.buf
+        assert buf is not None
+        buf[: len(MAGIC)] = bytes(len(MAGIC))
+        with pytest.raises(ValueError):
+            SharedRingReader(writer.name)
+
+
+def read_all(name: str, started, results) -> None:
+    with SharedRingReader(name) as reader:
+        started.set()
+        altitudes = []
+        for message in reader:
+            assert isinstance(message, OwnshipGeometricAltitudeMessage)
+            altitudes.append(message.geo_altitude)
+        results.put(altitudes)
+
+
+def test_shared_ring_unknown_message_type():
+    class CustomAltitudeMessage(OwnshipGeometricAltitudeMessage):
+        pass
+
+    with pytest.raises(ValueError):
+        SharedRingWriter(message_types=[CustomAltitudeMessage])
+
+
+def test_shared_ring_processes():
+    context = multiprocessing.get_context("spawn")
+    started = context.Event()
+    results = context.Queue()
+
+    with SharedRingWriter(slots=1024) as writer:
+        process = context.Process(target=read_all, args=(writer.name, started, results))
+        process.start()
+        assert started.wait(30)
+
+        for i in range(500):
+            writer.write(altitude(i))
+
+    assert results.get(timeout=30) == [i * 5 for i in range(500)]
+    process.join(30)
+    assert process.exitcode == 0
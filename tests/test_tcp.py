@@ -0,0 +1,94 @@
+import socket
+
+import pytest
+
+from gdl90py.messages._base_message import BaseMessage
+from gdl90py.messages.height_above_terrain import HeightAboveTerrainMessage
+from gdl90py.tcp import TCPReceiver
+
+
+def frame(i: int) -> bytes:
+    return HeightAboveTerrainMessage(height_above_terrain=i).serialize(
+        outgoing_lsb=False
+    )
+
+
+def height(message: BaseMessage) -> int | None:
+    assert isinstance(message, HeightAboveTerrainMessage)
+    return message.height_above_terrain
+
+
+@pytest.fixture
+def server():
+    with socket.create_server(("127.0.0.1", 0)) as sock:
+        sock.settimeout(2)
+        yield sock
+
+
+def poll(receiver: TCPReceiver, count: int) -> list:
+    messages = []
+    for _ in range(100):
+        messages += [height(m) for m in receiver.poll(0.05)]
+        if len(messages) >= count:
+            break
+    return messages
+
+
+def test_tcp_receiver(server):
+    with TCPReceiver(server.getsockname()) as receiver:
+        # connects on the first poll
+        assert receiver.poll(0) == []
+        connection, _ = server.accept()
+
+        with connection:
+            # an unknown message ID, and a valid CRC without a message ID
+            invalid = b"\x7e\x55\x00\x00\x50\x0a\x7e\x7e\x00\x00\x7e"
+            data = frame(1) + invalid + frame(2)
+            # frames split across sends
+            for i in range(0, len(data), 3):
+                connection.sendall(data[i : i + 3])
+            assert poll(receiver, 2) == [1, 2]
+            assert receiver.invalid == 2
+
+
+def test_tcp_receiver_reconnects(server):
+    with TCPReceiver(server.getsockname(), reconnect_delay=0.01) as receiver:
+        receiver.poll(0)
+        connection, _ = server.accept()
+        with connection:
+            # a partial frame is dropped when the connection is lost
+            connection.sendall(frame(1) + frame(2)[:-2])
+            assert poll(receiver, 1) == [1]
+
+        assert poll(receiver, 1) == []
+        connection, _ = server.accept()
+        with connection:
+            connection.sendall(frame(3))
+            assert poll(receiver, 1) == [3]
+
+        assert receiver.reconnects == 1
+
+
+def test_tcp_receiver_no_reconnect(server):
+    receiver = TCPReceiver(server.getsockname(), reconnect=False)
+    receiver.POLL_INTERVAL = 0.01
+    receiver.poll(0)
+    connection, _ = server.accept()
+    with connection:
+        connection.sendall(frame(1) + frame(2))
+
+    # stops when the server closes the connection
+    assert [height(m) for m in receiver] == [1, 2]
+    receiver.close()
+
+
+def test_tcp_receiver_connection_refused():
+    with socket.create_server(("127.0.0.1", 0)) as sock:
+        address = sock.getsockname()
+
+    with pytest.raises(ConnectionRefusedError):
+        TCPReceiver(address, reconnect=False).poll(0)
+
+    with TCPReceiver(address) as receiver:
+        assert receiver.poll(0) == []
+        assert isinstance(receiver.error, ConnectionRefusedError)
@@ -0,0 +1,125 @@
+import math
+from typing import Any
+
+import pytest
+
+from gdl90py.enums import (
+    Accuracy,
+    AddressType,
+    EmergencyPriorityCode,
+    EmitterCategory,
+    Integrity,
+    TrackType,
+)
+from gdl90py.messages.traffic_report import TrafficReportMessage
+
+np = pytest.importorskip("numpy")
+
+from gdl90py.traffic_table import TrafficTable  # noqa: E402
+
+
+def traffic_report(i: int, **kwargs) -> TrafficReportMessage:
+    values: dict[str, Any] = dict(
+        traffic_alert=bool(i % 2),
+        address_type=AddressType.ads_b_icao,
+        address=0xABC000 + i,
+        latitude=44.90708 - i / 100,
+        longitude=-122.99488 + i / 100,
+        pressure_altitude=5000 + i * 100,
+        track_type=TrackType.true_track_angle,
+        report_extrapolated=False,
+        airborne=True,
+        integrity=Integrity.less_than_25_m_hpl_and_37_5_m_vpl,
+        accuracy=Accuracy.less_than_30_m_hfom_and_45_m_vfom,
+        horizontal_velocity=123 + i,
+        vertical_velocity=-64 * i,
+        track=45,
+        emitter_category=EmitterCategory.light,
+        callsign=f"N{i}",
+        emergency_priority_code=EmergencyPriorityCode.no_emergency,
+    )
+    values.update(kwargs)
+    return TrafficReportMessage(**values)
+
+
+def test_traffic_table_update():
+    table = TrafficTable(capacity=4)
+    table.update(traffic_report(1), timestamp=100)
+    table.update(traffic_report(2, pressure_altitude=None), timestamp=100)
+    table.update(traffic_report(1, pressure_altitude=9000), timestamp=101)
+
+    assert len(table) == 2
+    assert traffic_report(1).address in table
+    assert table.get(traffic_report(1).address) == traffic_report(
+        1, pressure_altitude=9000
+    )
+    assert table.get(traffic_report(2).address) == traffic_report(
+        2, pressure_altitude=None
+    )
+    assert table.get(0x123456) is None
+
+    columns = table.snapshot(now=101)
+    assert list(columns["address"]) == [0xABC001, 0xABC002]
+    assert list(columns["updated"]) == [101, 100]
+    assert columns["pressure_altitude"][0] == 9000
+    assert math.isnan(columns["pressure_altitude"][1])
+    assert list(columns["callsign"]) == ["N1", "N2"]
+
+
+def test_traffic_table_grows():
+    table = TrafficTable(capacity=2)
+    table.update_many([traffic_report(i) for i in range(5)])
+    assert table.capacity == 8
+    assert len(table) == 5
+    assert sorted(table.snapshot()["address"]) == [0xABC000 + i for i in range(5)]
+    assert table.get(0xABC000) == traffic_report(0)
+
+
+def test_traffic_table_evict():
+    table = TrafficTable(capacity=4, max_age=10)
+    table.update(traffic_report(1), timestamp=100)
+    table.update(traffic_report(2), timestamp=105)
+
+    # stale targets are left out of snapshots before being evicted
+    assert list(table.snapshot(now=112)["address"]) == [0xABC002]
+    assert len(table) == 2
+
+    assert table.evict(now=112) == 1
+    assert len(table) == 1
+    assert table.get(0xABC001) is None
+
+    # the freed row is reused
+    table.update(traffic_report(3), timestamp=112)
+    assert table.capacity == 4
+    assert sorted(table.snapshot(now=112)["address"]) == [0xABC002, 0xABC003]
+
+
+@pytest.mark.parametrize("outgoing_lsb", [True, False])
+def test_traffic_table_update_frames(outgoing_lsb: bool):
+    messages = [traffic_report(i) for i in range(3)] + [
+        traffic_report(1, pressure_altitude=7000),
+        # contains bytes that need to be escaped
+        traffic_report(4, address=0x7E7D7E),
+    ]
+    frames = [message.serialize(outgoing_lsb=outgoing_lsb) for message in messages]
+    frames.append(frames[0][:-3] + b"\x00\x00\x7e")
+
+    table = TrafficTable(capacity=2)
+    assert table.update_frames(frames, incoming_msb=not outgoing_lsb) == 5
+    assert table.invalid == 1
+    assert len(table) == 4
+
+    decoded = [
+        TrafficReportMessage.deserialize(frame, incoming_msb=not outgoing_lsb)
+        for frame in frames[:-1]
+    ]
+    assert table.get(0xABC001) == decoded[3]
+    assert table.get(0x7E7D7E) == decoded[4]
+    columns = table.snapshot()
+    assert columns["callsign"].dtype == np.dtype("U8")
+    assert columns["address"].dtype == np.uint32
+
+
+def test_traffic_table_bad_arguments():
+    with pytest.raises(ValueError):
+        TrafficTable(capacity=0)
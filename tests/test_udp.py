@@ -0,0 +1,106 @@
+import socket
+import threading
+
+import pytest
+
+from gdl90py.messages.height_above_terrain import HeightAboveTerrainMessage
+from gdl90py.udp import DatagramReceiver, open_datagram_receiver
+
+
+def frame(i: int) -> bytes:
+    return HeightAboveTerrainMessage(height_above_terrain=i).serialize(
+        outgoing_lsb=False
+    )
+
+
+@pytest.fixture
+def receiver():
+    with open_datagram_receiver("127.0.0.1", 0, buffers=4, buffer_size=64) as r:
+        yield r
+
+
+def send(receiver: DatagramReceiver, *datagrams: bytes) -> None:
+    address = receiver.sock.getsockname()
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        for datagram in datagrams:
+            sock.sendto(datagram, address)
+
+
+def poll(receiver: DatagramReceiver, count: int) -> list:
+    messages = []
+    while len(messages) < count:
+        received = receiver.poll(2)
+        assert received
+        for message in received:
+            assert isinstance(message, HeightAboveTerrainMessage)
+            messages.append(message.height_above_terrain)
+    return messages
+
+
+def test_datagram_receiver(receiver):
+    # multiple frames in one datagram, and a truncated frame
+    send(receiver, frame(1) + frame(2), frame(3)[:-1], frame(4))
+
+    assert poll(receiver, 3) == [1, 2, 4]
+    assert receiver.datagrams == 3
+
+
+def test_datagram_receiver_reuses_buffers(receiver):
+    send(receiver, *(frame(i) for i in range(10)))
+
+    assert poll(receiver, 10) == list(range(10))
+    # each receive reads at most one datagram per buffer
+    assert receiver.poll(0) == []
+
+
+def test_datagram_receiver_views(receiver):
+    send(receiver, frame(1), frame(2))
+
+    views = []
+    while len(views) < 2:
+        views += [view.tobytes() for view in receiver.receive(2)]
+
+    assert views == [frame(1), frame(2)]
+
+
+def test_datagram_receiver_invalid(receiver):
+    bad_crc = frame(1)[:-3] + b"\x00\x00\x7e"
+    unknown = b"\x7e\x55\x00\x00\x50\x0a\x7e"
+    send(receiver, bad_crc + frame(2), unknown, b"\x7e" + b"\x00" * 70, frame(3))
+
+    assert poll(receiver, 2) == [2, 3]
+    assert receiver.invalid == 2
+    assert receiver.truncated == 1
+
+
+def test_datagram_receiver_lsb():
+    with open_datagram_receiver("127.0.0.1", 0, incoming_msb=False) as receiver:
+        send(receiver, HeightAboveTerrainMessage(height_above_terrain=5).serialize())
+        assert poll(receiver, 1) == [5]
+
+
+def test_datagram_receiver_iter(receiver):
+    receiver.POLL_INTERVAL = 0.01
+    send(receiver, frame(1), frame(2))
+    received = []
+
+    def consume():
+        for message in receiver:
+            received.append(message.height_above_terrain)
+
+    thread = threading.Thread(target=consume)
+    thread.start()
+    while len(received) < 2 and thread.is_alive():
+        thread.join(0.01)
+    receiver.close()
+    thread.join(2)
+
+    assert not thread.is_alive()
+    assert received == [1, 2]
+    assert receiver.poll(0) == []
+
+
+def test_datagram_receiver_bad_arguments():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        with pytest.raises(ValueError):
+            DatagramReceiver(sock, buffers=0)
@@ -0,0 +1,229 @@
+import asyncio
+import base64
+import datetime
+import json
+import os
+
+import pytest
+
+from gdl90py.enums import (
+    Accuracy,
+    AddressType,
+    EmergencyPriorityCode,
+    EmitterCategory,
+    Integrity,
+    TrackType,
+)
+from gdl90py.messages.heartbeat import HeartbeatMessage
+from gdl90py.messages.height_above_terrain import HeightAboveTerrainMessage
+from gdl90py.messages.traffic_report import TrafficReportMessage
+from gdl90py.web import WebBridge, encode_message, message_to_dict
+
+
+def traffic(address: int, altitude: int = 1000) -> TrafficReportMessage:
+    return TrafficReportMessage(
+        traffic_alert=False,
+        address_type=AddressType.ads_b_icao,
+        address=address,
+        latitude=44.9,
+        longitude=-93.2,
+        pressure_altitude=altitude,
+        track_type=TrackType.true_track_angle,
+        report_extrapolated=False,
+        airborne=True,
+        integrity=Integrity.less_than_25_m_hpl_and_37_5_m_vpl,
+        accuracy=Accuracy.less_than_30_m_hfom_and_45_m_vfom,
+        horizontal_velocity=120,
+        vertical_velocity=0,
+        track=90,
+        emitter_category=EmitterCategory.light,
+        callsign="N12345",
+        emergency_priority_code=EmergencyPriorityCode.no_emergency,
+    )
+
+
+async def request(bridge: WebBridge, path: str) -> tuple[bytes, bytes]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", bridge.port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return head, body
+
+
+async def wait_for(condition, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.001)
+
+
+async def open_websocket(bridge: WebBridge):
+    reader, writer = await asyncio.open_connection("127.0.0.1", bridge.port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write(
+        (
+            "GET /ws HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+            f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        ).encode()
+    )
+    head = await reader.readuntil(b"\r\n\r\n")
+    return reader, writer, head
+
+
+async def read_websocket_message(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    first, length = await reader.readexactly(2)
+    if length == 126:
+        length = int.from_bytes(await reader.readexactly(2), "big")
+    return first & 0x0F, await reader.readexactly(length)
+
+
+def event_addresses(events: list[bytes]) -> list[int]:
+    return [json.loads(event.removeprefix(b"data: "))["address"] for event in events]
+
+
+def test_message_to_dict():
+    result = message_to_dict(traffic(0xABCDEF))
+    assert result["type"] == "TrafficReportMessage"
+    assert result["address"] == 0xABCDEF
+    assert result["address_type"] == "ads_b_icao"
+    assert result["callsign"] == "N12345"
+
+    heartbeat = HeartbeatMessage(
+        gps_position_valid=True,
+        maintenance_required=False,
+        ident_talkback=False,
+        self_assigned_address_talkback=False,
+        gps_battery_low=False,
+        RATCS_talkback=False,
+        UAT_initialized=True,
+        CSA_requested=False,
+        CSA_unavailable=False,
+        UTC_timing_valid=True,
+        timestamp=datetime.time(12, 30, 5, tzinfo=datetime.UTC),
+        uplink_messages_count=0,
+        basic_long_messages_count=0,
+    )
+    assert json.loads(encode_message(heartbeat))["timestamp"] == "12:30:05+00:00"
+
+
+def test_web_bridge_snapshot():
+    async def main():
+        async with WebBridge(port=0) as bridge:
+            bridge.publish(traffic(1, 1000))
+            bridge.publish(traffic(2))
+            bridge.publish(traffic(1, 2000))
+            # not one of the message types
+            bridge.publish(HeightAboveTerrainMessage(height_above_terrain=1))
+
+            head, body = await request(bridge, "/traffic?fresh=1")
+            missing, _ = await request(bridge, "/missing")
+            return bridge, head, json.loads(body), missing
+
+    bridge, head, snapshot, missing = asyncio.run(main())
+    assert head.startswith(b"HTTP/1.1 200 OK")
+    assert b"Content-Type: application/json" in head
+    assert snapshot["ownship"] is None
+    assert [(t["address"], t["pressure_altitude"]) for t in snapshot["traffic"]] == [
+        (1, 2000),
+        (2, 1000),
+    ]
+    assert bridge.published == 3
+    assert missing.startswith(b"HTTP/1.1 404")
+
+
+def test_web_bridge_snapshot_evicts_stale_traffic():
+    bridge = WebBridge(traffic_timeout=0)
+    bridge.publish(traffic(1))
+    assert json.loads(bridge.snapshot())["traffic"] == []
+
+
+def test_web_bridge_event_stream():
+    async def main():
+        async with WebBridge(port=0) as bridge:
+            reader, writer = await asyncio.open_connection("127.0.0.1", bridge.port)
+            writer.write(b"GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            head = await reader.readuntil(b"\r\n\r\n")
+            await wait_for(lambda: bridge.subscribers == 1)
+
+            bridge.publish(traffic(1))
+            bridge.publish(traffic(2))
+            events = [await reader.readuntil(b"\n\n") for _ in range(2)]
+
+            writer.close()
+            await wait_for(lambda: bridge.subscribers == 0)
+            return head, events
+
+    head, events = asyncio.run(main())
+    assert b"Content-Type: text/event-stream" in head
+    assert event_addresses(events) == [1, 2]
+
+
+def test_web_bridge_websocket():
+    async def main():
+        async with WebBridge(port=0) as bridge:
+            reader, writer, head = await open_websocket(bridge)
+            await wait_for(lambda: bridge.subscribers == 1)
+
+            bridge.publish(traffic(1))
+            opcode, payload = await read_websocket_message(reader)
+
+            # masked ping from the client
+            mask = b"\x01\x02\x03\x04"
+            writer.write(
+                b"\x89\x84" + mask + bytes(b ^ m for b, m in zip(b"ping", mask))
+            )
+            pong = await read_websocket_message(reader)
+
+            writer.write(b"\x88\x80" + mask)
+            close = await read_websocket_message(reader)
+            await wait_for(lambda: bridge.subscribers == 0)
+            writer.close()
+            return head, opcode, payload, pong, close
+
+    head, opcode, payload, pong, close = asyncio.run(main())
+    assert head.startswith(b"HTTP/1.1 101")
+    assert opcode == 0x1
+    assert json.loads(payload)["address"] == 1
+    assert pong == (0xA, b"ping")
+    assert close == (0x8, b"")
+
+
+def test_web_bridge_drops_oldest_for_slow_clients():
+    async def main():
+        async with WebBridge(port=0, max_queue=2) as bridge:
+            reader, writer = await asyncio.open_connection("127.0.0.1", bridge.port)
+            writer.write(b"GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            await reader.readuntil(b"\r\n\r\n")
+            await wait_for(lambda: bridge.subscribers == 1)
+
+            # published faster than the client's task can send them
+            for address in range(5):
+                bridge.publish(traffic(address))
+            events = [await reader.readuntil(b"\n\n") for _ in range(2)]
+            writer.close()
+            return bridge.dropped, events
+
+    dropped, events = asyncio.run(main())
+    assert dropped == 3
+    assert event_addresses(events) == [3, 4]
+
+
+def test_web_bridge_run():
+    async def messages():
+        yield traffic(1)
+        yield traffic(2)
+
+    async def main():
+        bridge = WebBridge(port=0)
+        await bridge.run(messages())
+        return bridge
+
+    bridge = asyncio.run(main())
+    assert bridge.published == 2
+    assert len(json.loads(bridge.snapshot())["traffic"]) == 2
+
+
+def test_web_bridge_bad_arguments():
+    with pytest.raises(ValueError):
+        WebBridge(max_queue=0)
@@ -2,6 +2,7 @@ import pytest
 from bitstring import BitArray
 
 from gdl90py.utils.bitarray import (
+    BIT_REVERSAL_TABLE,
     format_hex,
     lsb,
     lsb_bytearray,
@@ -24,12 +25,29 @@ def test_lsb():
     assert result.hex == "482c"
 
 
+def test_lsb_not_byte_aligned():
+    bitarray = BitArray(bin="110100")
+    result = lsb(bitarray)
+    assert result.bin == "001011"
+
+
+def test_bit_reversal_table():
+    for value in range(256):
+        assert BIT_REVERSAL_TABLE[value] == int(f"{value:08b}"[::-1], 2)
+
+
 def test_lsb_bytes():
     input_bytes = b"\x12\x34"
     result = lsb_bytes(input_bytes)
     assert result == b"\x48\x2c"
 
 
+def test_lsb_bytes_memoryview():
+    input_bytes = memoryview(b"\x12\x34")
+    result = lsb_bytes(input_bytes)
+    assert result == b"\x48\x2c"
+
+
 def test_lsb_bytearray():
     input_bytearray = bytearray(b"\x12\x34")
     result = lsb_bytearray(input_bytearray)
@@ -42,6 +60,14 @@ def test_lsb_int():
     assert result == 222
 
 
+@pytest.mark.parametrize(
+    "input_, length, expected",
+    ((0x1234, 16, 0x482C), (0b101, 3, 0b101), (0b110, 3, 0b011)),
+)
+def test_lsb_int_length(input_: int, length: int, expected: int):
+    assert lsb_int(input_, length) == expected
+
+
 @pytest.mark.parametrize(
     "input_, expected",
     ((b"\x12\x34", "0x12 0x34"), (BitArray(bytes=b"\x12\x34"), "0x12 0x34")),
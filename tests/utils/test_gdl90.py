@@ -2,7 +2,12 @@ import pytest
 from bitstring import BitArray
 
 import gdl90py.utils.gdl90
-from gdl90py.exceptions import InvalidCRC, MissingFlagBytes
+from gdl90py.exceptions import (
+    InvalidCRC,
+    InvalidMessageID,
+    MalformedEscape,
+    MissingFlagBytes,
+)
 
 
 def test_crc_table():
@@ -20,6 +25,46 @@ def test_compute_crc():
     assert crc == b"\xb3\x8b"
 
 
+def test_crc_table_constant():
+    assert gdl90py.utils.gdl90.CRC_TABLE == tuple(gdl90py.utils.gdl90.crc_table())
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"\x00",
+        b"\x7e\x7d",
+        b"\x00\x81\x41\xdb\xd0\x08\x02",
+        bytes(range(256)) * 4,
+    ],
+)
+def test_crc16_matches_table(data: bytes):
+    assert gdl90py.utils.gdl90.crc16(data) == gdl90py.utils.gdl90.crc16_table(data)
+
+
+def test_crc16_table_continue():
+    data = b"\x00\x81\x41\xdb\xd0\x08\x02"
+    crc = gdl90py.utils.gdl90.crc16_table(data[:3])
+    assert gdl90py.utils.gdl90.crc16_table(data[3:], crc) == 0x8BB3
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 1024])
+def test_crc16_incremental(chunk_size: int):
+    data = bytes(range(256)) * 4
+    crc = gdl90py.utils.gdl90.Crc16()
+    for i in range(0, len(data), chunk_size):
+        crc.update(memoryview(data)[i : i + chunk_size])
+
+    assert crc.value == gdl90py.utils.gdl90.crc16_table(data)
+    assert crc.digest() == gdl90py.utils.gdl90.compute_crc(data)
+
+
+def test_crc16_incremental_initial_data():
+    data = b"\x00\x81\x41\xdb\xd0\x08\x02"
+    assert gdl90py.utils.gdl90.Crc16(data).digest() == b"\xb3\x8b"
+
+
 def test_check_crc_valid():
     data = b"\x00\x81\x41\xdb\xd0\x08\x02"
     crc = b"\xb3\x8b"
@@ -57,6 +102,18 @@ def test_escape_empty_data():
     assert gdl90py.utils.gdl90.escape(data) == expected
 
 
+def test_escape_no_escape_chars_not_copied():
+    data = b"\x01\x02\x03\x04\x05"
+    assert gdl90py.utils.gdl90.escape(data) is data
+
+
+def test_escape_unescape_round_trip():
+    data = bytes(range(256)) * 2
+    escaped = gdl90py.utils.gdl90.escape(data)
+    assert gdl90py.utils.gdl90.FLAG_BYTE not in escaped
+    assert gdl90py.utils.gdl90.unescape(escaped) == bytearray(data)
+
+
 def test_unescape_no_escape_chars():
     data = b"\x01\x02\x03\x04\x05"
     expected = bytearray(data)
@@ -81,6 +138,39 @@ def test_unescape_empty_data():
     assert gdl90py.utils.gdl90.unescape(data) == expected
 
 
+def test_unescape_memoryview():
+    data = memoryview(b"\x00\x01\x7d\x5e\x02\x7d\x5d\x03")[1:]
+    assert gdl90py.utils.gdl90.unescape(data) == bytearray(b"\x01\x7e\x02\x7d\x03")
+
+
+def test_unescape_escaped_escape_byte():
+    data = b"\x01\x7d\x7d\x02"
+    assert gdl90py.utils.gdl90.unescape(data) == bytearray(b"\x01\x5d\x02")
+
+
+def test_unescape_many_other_escapes():
+    # not a flag or control escape byte, so the bulk path can not be used
+    data = b"\x7d\x21\x02" * 20
+    assert gdl90py.utils.gdl90.unescape(data) == bytearray(b"\x01\x02" * 20)
+
+
+def test_unescape_reuses_output():
+    out = bytearray(b"\xff" * 10)
+    result = gdl90py.utils.gdl90.unescape(b"\x01\x7d\x5e", out)
+    assert result is out
+    assert out == bytearray(b"\x01\x7e")
+
+
+def test_unescape_trailing_escape():
+    with pytest.raises(MalformedEscape):
+        gdl90py.utils.gdl90.unescape(b"\x01\x02\x7d")
+
+
+def test_unescape_many_escapes():
+    data = b"\x7d\x5e\x7d\x5d" * 10000
+    assert gdl90py.utils.gdl90.unescape(data) == bytearray(b"\x7e\x7d" * 10000)
+
+
 def test_build_outgoing_lsb():
     message_ids = (0x00,)
     data = b"\x01\x02\x03\x04\x05"
@@ -96,6 +186,32 @@ def test_build_outgoing_lsb():
     )
 
 
+def test_build_bytes_outgoing_lsb():
+    message_ids = (0x00,)
+    data = b"\x01\x02\x03\x04\x05"
+    expected_forwards = b"\x7e\x00\x01\x02\x03\x04\x05\x34\x65\x7e"
+    expected_backwards = b"\x7e\x00\x80\x40\xc0\x20\xa0\x2c\xa6\x7e"
+    assert (
+        gdl90py.utils.gdl90.build_bytes(message_ids, data, outgoing_lsb=False)
+        == expected_forwards
+    )
+    assert (
+        gdl90py.utils.gdl90.build_bytes(message_ids, data, outgoing_lsb=True)
+        == expected_backwards
+    )
+
+
+def test_build_bytes_multiple_message_ids():
+    message_ids = (0x65, 0x00)
+    data = b"\x7e"
+    frame = gdl90py.utils.gdl90.build_bytes(message_ids, data, outgoing_lsb=False)
+    assert frame[:5] == b"\x7e\x65\x00\x7d\x5e"
+    assert gdl90py.utils.gdl90.deconstruct_bytes(frame, incoming_msb=True) == (
+        message_ids,
+        bytearray(data),
+    )
+
+
 def test_deconstruct_missing_flag_bytes():
     data = b"\x01\x02\x03\x04\x05"
     with pytest.raises(MissingFlagBytes):
@@ -112,3 +228,40 @@ def test_deconstruct_invalid_crc():
     data = b"\x7e\x40\x82\x80\xc2\x87\x7e"
     with pytest.raises(InvalidCRC):
         gdl90py.utils.gdl90.deconstruct(data, incoming_msb=False)
+
+
+@pytest.mark.parametrize(
+    "message_id_data",
+    [
+        # nothing but the CRC
+        b"",
+        # ForeFlight message without a sub ID
+        b"\x65",
+    ],
+)
+def test_deconstruct_bytes_missing_message_id(message_id_data: bytes):
+    crc = gdl90py.utils.gdl90.compute_crc(message_id_data)
+    data = b"\x7e" + message_id_data + crc + b"\x7e"
+    with pytest.raises(InvalidMessageID):
+        gdl90py.utils.gdl90.deconstruct_bytes(data, incoming_msb=True)
+    with pytest.raises(InvalidMessageID):
+        gdl90py.utils.gdl90.deconstruct_bytes(memoryview(data), incoming_msb=True)
+
+
+def test_deconstruct_bytes_memoryview():
+    buffer = bytearray(b"\x7e\x00\x81\x41\xdb\xd0\x08\x02\xb3\x8b\x7e")
+    message_ids, data = gdl90py.utils.gdl90.deconstruct_bytes(memoryview(buffer), True)
+
+    assert message_ids == (0,)
+    # not copied
+    assert isinstance(data, memoryview)
+    assert data.obj is buffer
+    assert data == b"\x81\x41\xdb\xd0\x08\x02"
+
+
+def test_deconstruct_bytes_memoryview_escaped():
+    frame = gdl90py.utils.gdl90.build_bytes((0,), b"\x7e\x7d\x01", False)
+    message_ids, data = gdl90py.utils.gdl90.deconstruct_bytes(memoryview(frame), True)
+
+    assert message_ids == (0,)
+    assert data == b"\x7e\x7d\x01"
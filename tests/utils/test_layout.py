@@ -0,0 +1,186 @@
+import enum
+
+import pytest
+
+from gdl90py.enums import EmitterCategory
+from gdl90py.exceptions import (
+    BadIntegerSize,
+    DataTooLong,
+    DataTooShort,
+    UnexpectedNegative,
+)
+from gdl90py.utils.layout import Field, Layout
+
+
+class Color(enum.IntEnum):
+    red = 0
+    green = 1
+
+
+class Example:
+    @classmethod
+    def _decode_hooked(cls, raw: int) -> int:
+        return raw * 2
+
+
+LAYOUT = Layout(
+    (
+        Field("flag", 0, 1, kind=bool),
+        Field("color", 1, 1, enum=Color),
+        Field(None, 2, 6),
+        Field("signed", 8, 8, signed=True, resolution=0.5, kind=float),
+        Field("offset", 16, 8, resolution=2, value_offset=10, invalid=0xFF),
+        Field("little", 24, 16, byteorder="little"),
+        Field("hooked", 40, 8),
+        Field("name", 48, 16, kind=str),
+    ),
+    Example,
+)
+
+
+def test_layout_size():
+    assert LAYOUT.bits == 64
+    assert LAYOUT.size == 8
+
+
+def test_layout_unpack():
+    assert LAYOUT.unpack(b"\xc0\xfe\x0a\x34\x12\x05A ") == {
+        "flag": True,
+        "color": Color.green,
+        "signed": -1.0,
+        "offset": 10,
+        "little": 0x1234,
+        "hooked": 10,
+        "name": "A",
+    }
+
+
+def test_layout_unpack_invalid():
+    assert LAYOUT.unpack(b"\x00\x00\xff\x00\x00\x00AB")["offset"] is None
+
+
+def test_layout_unpack_unknown_enum():
+    layout = Layout((Field("color", 0, 8, enum=Color),), Example)
+    with pytest.raises(ValueError):
+        layout.unpack(b"\x02")
+
+
+def test_layout_unpack_too_long():
+    with pytest.raises(DataTooLong):
+        LAYOUT.unpack(bytes(9))
+
+
+def test_layout_unpack_too_short():
+    with pytest.raises(DataTooShort):
+        LAYOUT.unpack(bytes(7))
+
+
+def test_field_decoder():
+    field = Field("value", 0, 16, signed=True, invalid=0x8000, byteorder="little")
+    decoder = field.decoder()
+    assert decoder(0xFFFF) == -1
+    assert decoder(0x0100) == 1
+    assert decoder(0x0080) is None
+
+
+class Encoded:
+    LAYOUT = (
+        Field("flag", 0, 1, kind=bool),
+        Field("color", 1, 1, enum=Color),
+        Field(None, 2, 6),
+        Field(
+            "angle",
+            8,
+            8,
+            signed=True,
+            resolution=0.5,
+            invalid=0x7F,
+            valid=(-10, 10),
+        ),
+        Field("speed", 16, 8, maximum=100),
+        Field("little", 24, 16, byteorder="little"),
+        Field("name", 40, 16, kind=str),
+        Field("word_high", 56, 8),
+        Field("word_low", 56, 8),
+    )
+
+    def __init__(self, **kwargs) -> None:
+        self.__dict__.update(kwargs)
+
+    def _encode_word_high(self, word_high: int) -> int:
+        return word_high << 4
+
+    def _encode_word_low(self, word_low: int) -> int:
+        return word_low & 0xF
+
+
+ENCODED_LAYOUT = Layout(Encoded.LAYOUT, Encoded)
+
+
+def encoded(**kwargs) -> Encoded:
+    values = {
+        "flag": True,
+        "color": Color.green,
+        "angle": -1,
+        "speed": 20,
+        "little": 0x1234,
+        "name": "A",
+        "word_high": 0x5,
+        "word_low": 0xA,
+    }
+    values.update(kwargs)
+    return Encoded(**values)
+
+
+def test_layout_pack():
+    assert ENCODED_LAYOUT.pack(encoded()) == b"\xc0\xfe\x14\x34\x12A \x5a"
+
+
+@pytest.mark.parametrize("angle", [None, 10.5, -11])
+def test_layout_pack_invalid(angle: float | None):
+    assert ENCODED_LAYOUT.pack(encoded(angle=angle))[1] == 0x7F
+
+
+def test_layout_pack_maximum():
+    assert ENCODED_LAYOUT.pack(encoded(speed=200))[2] == 100
+
+
+def test_layout_pack_name_truncated():
+    assert ENCODED_LAYOUT.pack(encoded(name="ABC"))[5:7] == b"AB"
+
+
+def test_layout_pack_unpack_round_trip():
+    values = ENCODED_LAYOUT.unpack(ENCODED_LAYOUT.pack(encoded()))
+    assert values["angle"] == -1
+    assert values["little"] == 0x1234
+
+
+def test_field_encoder_constrain():
+    field = Field("value", 0, 8, signed=True)
+    encoder = field.encoder()
+    assert encoder(None, 1000) == 0x7F
+    assert encoder(None, -1000) == 0x80
+
+
+def test_field_encoder_float_limits():
+    field = Field("value", 0, 8, minimum=10.0, maximum=20.0)
+    encoder = field.encoder()
+    assert encoder(None, 5) == 10
+    assert encoder(None, 25) == 20
+
+
+def test_field_encoder_no_constrain():
+    field = Field("value", 0, 8, constrain=False)
+    with pytest.raises(BadIntegerSize):
+        field.encoder()(None, 256)
+
+
+def test_field_encoder_negative():
+    field = Field("value", 0, 8)
+    with pytest.raises(UnexpectedNegative):
+        field.encoder()(None, -1)
+
+
+def test_layout_enum_too_wide():
+    with pytest.raises(ValueError):
+        Layout((Field("color", 0, 1, enum=EmitterCategory),), Encoded)
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from gdl90py.utils.ring_buffer import RingBuffer
+
+
+def write(ring: RingBuffer, data: bytes) -> None:
+    view = ring.writable()
+    view[: len(data)] = data
+    ring.commit(len(data))
+
+
+def test_ring_buffer_write_read():
+    ring = RingBuffer(8)
+    write(ring, b"abcde")
+    assert len(ring) == 5
+    assert ring.readable() == b"abcde"
+
+    ring.release(3)
+    assert ring.readable() == b"de"
+    # only the free space up to the end of the buffer
+    assert len(ring.writable()) == 3
+
+
+def test_ring_buffer_wraps():
+    ring = RingBuffer(8)
+    write(ring, b"abcdef")
+    ring.release(6)
+    write(ring, b"gh")
+    write(ring, b"ijk")
+    assert ring.readable() == b"gh"
+    ring.release(2)
+    assert ring.readable() == b"ijk"
+
+
+def test_ring_buffer_spare_mirrors_wrapped_data():
+    ring = RingBuffer(8, spare=2)
+    write(ring, b"abcdef")
+    ring.release(6)
+    write(ring, b"gh")
+    write(ring, b"ijk")
+    assert ring.readable() == b"ghij"
+    ring.release(3)
+    assert ring.readable() == b"jk"
+
+
+def test_ring_buffer_overrun():
+    ring = RingBuffer(4)
+    assert ring.write(b"abcdef") == 4
+    assert ring.overruns == 1
+    assert ring.overrun_bytes == 2
+
+    # full, so this is discarded
+    write(ring, b"gh")
+    assert ring.overruns == 2
+    assert ring.overrun_bytes == 4
+    assert ring.readable() == b"abcd"
+
+
+def test_ring_buffer_release_too_much():
+    ring = RingBuffer(4)
+    ring.write(b"ab")
+    with pytest.raises(ValueError):
+        ring.release(3)
+
+
+def test_ring_buffer_wait():
+    ring = RingBuffer(4)
+    assert not ring.wait(timeout=0)
+
+    threading.Timer(0.01, ring.write, [b"ab"]).start()
+    assert ring.wait(timeout=2)
+    assert not ring.wait(2, timeout=0)
+
+    ring.close()
+    assert not ring.wait(2)